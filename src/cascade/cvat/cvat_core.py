@@ -1,7 +1,9 @@
+import dataclasses
 import time
-from typing import Optional, Any
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Optional, Any
 from pathlib import Path
-import tempfile
 import zipfile
 
 import requests
@@ -10,7 +12,14 @@ import pandas as pd
 import json
 from dataclasses import dataclass
 
-from src.cascade.tables.table import TableEditor
+from src.cascade.cvat.export_cache import ExportCache
+from src.cascade.cvat.job_journal import JobJournal, JOURNAL_FILE_NAME
+from src.cascade.cvat.session_pool import CvatSessionPool, DEFAULT_TOKEN_CACHE_PATH
+from src.cascade.cvat.task_catalog import ProjectTaskCatalog
+from src.cascade.tables.table import BufferedRowWriter, TableEditor
+from src.cascade.tools.polling import BackoffPolicy, poll_until
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
 
 
 @dataclass
@@ -22,6 +31,27 @@ class DownloadResult:
     error_message: Optional[str] = None
 
 
+@dataclass
+class UploadJob:
+    """State of directory upload."""
+    QUEUED = "queued"
+    CREATED = "created"
+    DATA_ATTACHED = "data_attached"
+    FINISHED = "finished"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+    dir_name: str
+    task_id: Optional[int] = None
+    state: str = QUEUED
+    error: Optional[str] = None
+    started_at: float = 0.0
+
+    def fail(self, error: str):
+        self.state = UploadJob.FAILED
+        self.error = error
+
+
 class CvatCore:
     def __init__(self, credentials_path: str):
         """
@@ -33,11 +63,23 @@ class CvatCore:
             Path to YAML file with CVAT credentials
         """
         self.read_cvat_data(credentials_path)
+        self.poll_policy = BackoffPolicy()
+        self.session_pool = CvatSessionPool(
+            base_url=self.base_url,
+            username=self.username,
+            password=self.password,
+            pool_size=self.pool_size,
+            token_cache_path=self.token_cache_path,
+            token_ttl=self.token_ttl
+        )
 
     def read_cvat_data(self, path_to_yml: str) -> tuple[str, str, str]:
         """
         Download credentials data from YAML file.
 
+        Besides credentials file may set connection settings:
+        pool_size, token_cache_path (empty value disables cache) and token_ttl.
+
         Parameters
         ----------
         path_to_yml : str
@@ -57,33 +99,29 @@ class CvatCore:
         self.base_url = args["base_url"]
         self.username = args["username"]
         self.password = args["password"]
+        self.pool_size = args.get("pool_size", 10)
+        self.token_cache_path = args.get("token_cache_path", DEFAULT_TOKEN_CACHE_PATH)
+        self.token_ttl = args.get("token_ttl", 12 * 60 * 60)
 
         return self.base_url, self.username, self.password
 
     def _create_session(self) -> requests.Session:
         """
-        Create authenticated session with CVAT.
+        Get authenticated session with CVAT.
+
+        Session is shared between all calls of this object, so connections
+        and auth token are reused. Use close() to release it.
 
         Returns
         -------
         requests.Session
             Authenticated session
         """
-        session = requests.Session()
-        
-        login_response = session.post(
-            f"{self.base_url}/api/auth/login",
-            json={"username": self.username, "password": self.password},
-            timeout=30,
-        )
-
-        if login_response.status_code != 200:
-            raise Exception(f"Login failed: {login_response.text}")
+        return self.session_pool.get_session()
 
-        auth_data = login_response.json()
-        session.headers.update({"Authorization": f"Token {auth_data['key']}"})
-        
-        return session
+    def close(self):
+        """Close shared CVAT session."""
+        self.session_pool.close()
 
     def _get_share_directories(self, share_path: str) -> list[str]:
         """
@@ -124,16 +162,92 @@ class CvatCore:
         except Exception as e:
             print(f"❌ Error getting directory list: {e}")
             return []
+
+    def _get_all_tasks(self, session: requests.Session, project_id: int) -> list[dict]:
+        """
+        Get all tasks from project with pagination.
         
-        finally:
-            session.close()
+        Parameters
+        ----------
+        session : requests.Session
+            Authenticated session
+        project_id : int
+            ID of the project
+        
+        Returns
+        -------
+        list[dict]
+            List of all task dictionaries
+
+        Raises
+        ------
+        RuntimeError
+            If some page can't be loaded, partial list would make
+            existing tasks look missing
+        """
+        all_tasks = []
+        page = 1
+        
+        while True:
+            response = session.get(
+                f"{self.base_url}/api/tasks",
+                params={"project_id": project_id, "page": page, "page_size": 100}
+            )
+            
+            if response.status_code != 200:
+                raise RuntimeError(
+                    f"Can't load page {page} of tasks of project {project_id}: status {response.status_code}"
+                )
+                
+            data = response.json()
+            
+            if isinstance(data, dict) and 'results' in data:
+                tasks = data['results']
+                all_tasks.extend(tasks)
+                
+                if not data.get('next'):
+                    break
+            elif isinstance(data, list):
+                all_tasks.extend(data)
+                break
+            else:
+                raise RuntimeError(f"Unexpected response for page {page} of tasks of project {project_id}")
+                
+            page += 1
+            
+        return all_tasks
+
+    def load_task_catalog(self, session: requests.Session, project_id: int) -> ProjectTaskCatalog:
+        """
+        Load all project tasks into indexed catalog.
+
+        Parameters
+        ----------
+        session : requests.Session
+            Authenticated session
+        project_id : int
+            ID of the project
+
+        Returns
+        -------
+        ProjectTaskCatalog
+            Catalog with name and ID indexes
+
+        Raises
+        ------
+        RuntimeError
+            If tasks list can't be fully loaded
+        """
+        catalog = ProjectTaskCatalog(project_id, self._get_all_tasks(session, project_id))
+        print(f"Loaded {len(catalog)} tasks of project {project_id}")
+        return catalog
 
     def wait_for_load_completion(
         self, 
         session: requests.Session, 
         task_id: int, 
         max_wait: int = 300,
-        wait_interval: int = 5
+        poll_policy: Optional[BackoffPolicy] = None
     ) -> str:
         """
         Wait for download/upload data to task to complete.
@@ -146,42 +260,67 @@ class CvatCore:
             ID for target task
         max_wait : int, optional
             Max time in seconds for waiting download, by default 300
-        wait_interval : int, optional
-            Interval between status checks in seconds, by default 5
+        poll_policy : Optional[BackoffPolicy], optional
+            Intervals between status checks, by default self.poll_policy
 
         Returns
         -------
         str
             Status of loading process
         """
-        elapsed_time = 0
-        
-        while elapsed_time < max_wait:
-            try:
-                status_response = session.get(
-                    f"{self.base_url}/api/tasks/{task_id}/status", 
-                    timeout=10
-                )
-
-                if status_response.status_code == 200:
-                    status_data = status_response.json()
-                    state = status_data.get("state", "")
-                    message = status_data.get("message", "")
-
-                    if state == "Finished":
-                        return "Finished"
-                    elif state == "Failed":
-                        print(f"   ❌ Download error: {message}")
-                        return f"Failed: {message}"
+        policy = dataclasses.replace(poll_policy or self.poll_policy, max_wait=max_wait)
 
+        def check_status() -> Optional[str]:
+            try:
+                return self._get_load_status(session, task_id)
             except Exception as e:
                 print(f"   ⚠ Check status error: {e}")
+                return None
 
-            time.sleep(wait_interval)
-            elapsed_time += wait_interval
+        def report_check(attempt: int, elapsed: float, status: Optional[str]):
+            if status is None:
+                print(f"   Status check {attempt} ({elapsed:.1f}s): data is loading...")
 
+        poll_result = poll_until(check_status, policy, on_attempt=report_check)
+
+        if poll_result.done:
+            return poll_result.value
         return "Timeout"
 
+    def _get_load_status(self, session: requests.Session, task_id: int) -> Optional[str]:
+        """
+        Check data loading status of task once.
+
+        Parameters
+        ----------
+        session : requests.Session
+            Active session
+        task_id : int
+            ID for target task
+
+        Returns
+        -------
+        Optional[str]
+            "Finished", "Failed: <message>" or None if loading is in progress
+        """
+        status_response = session.get(
+            f"{self.base_url}/api/tasks/{task_id}/status", 
+            timeout=10
+        )
+
+        if status_response.status_code == 200:
+            status_data = status_response.json()
+            state = status_data.get("state", "")
+            message = status_data.get("message", "")
+
+            if state == "Finished":
+                return "Finished"
+            elif state == "Failed":
+                print(f"   ❌ Download error: {message}")
+                return f"Failed: {message}"
+
+        return None
+
 
 class CvatUploader(CvatCore):
     def __init__(self, cvat_credentials_path: str, table_url: str | None = None, table_credentials_path: str | None = None):
@@ -211,11 +350,19 @@ class CvatUploader(CvatCore):
         share_path: str,
         directory_names: list[str] | None = None,
         column_names: list[str] | None = None,
-        sheet_id: int | None = None
-    ):
+        sheet_id: int | None = None,
+        max_in_flight: int = 4,
+        max_wait: int = 300,
+        journal_path: str | None = None,
+        table_flush_size: int = 100
+    ) -> list[UploadJob]:
         """
         Upload data from share to CVAT.
 
+        Directories are processed as a pipeline: up to max_in_flight tasks
+        load data on the server at once, their statuses are checked together
+        and new tasks are started as soon as old ones finish.
+
         Parameters
         ----------
         project_id : int
@@ -228,8 +375,28 @@ class CvatUploader(CvatCore):
             Names of target columns in table
         sheet_id: int | None
             Id of sheet in target table
+        max_in_flight : int, optional
+            Max number of tasks loading data at the same time, by default 4
+        max_wait : int, optional
+            Max time in seconds for loading data of one task, by default 300
+        journal_path : str | None, optional
+            SQLite journal file. If set, directories uploaded by previous runs
+            are skipped and interrupted uploads are continued, by default None
+        table_flush_size : int, optional
+            Rows are written to table by one request per this number of
+            loaded tasks and at the end of upload, by default 100
+
+        Returns
+        -------
+        list[UploadJob]
+            Final state of every directory upload
         """
         session = self._create_session()
+        journal = JobJournal(journal_path) if journal_path else None
+        table_writer = None
+        if self.table_editor is not None:
+            table_writer = self.table_editor.buffered_writer(sheet_id, flush_size=table_flush_size)
+        jobs = []
 
         print("Start upload data from CVAT share...")
         print("=" * 60)
@@ -239,145 +406,345 @@ class CvatUploader(CvatCore):
                 directories = self._get_share_directories(share_path)
                 if not directories:
                     print("❌ No directories found to upload")
-                    return
+                    return jobs
             else:
                 directories = directory_names
 
             print(f"Processing {len(directories)} directories...")
+            catalog = self.load_task_catalog(session, project_id)
+
+            jobs = [UploadJob(dir_name=dir_name.rstrip('\n')) for dir_name in directories]
+            queue = deque(jobs)
+            in_flight: dict[int, UploadJob] = {}
+
+            while queue or in_flight:
+                while queue and len(in_flight) < max_in_flight:
+                    job = queue.popleft()
+                    self._start_upload_job(session, job, project_id, share_path, catalog, journal)
+                    if job.state == UploadJob.DATA_ATTACHED:
+                        in_flight[job.task_id] = job
+
+                if in_flight:
+                    self._wait_for_upload_jobs(
+                        session=session,
+                        in_flight=in_flight,
+                        catalog=catalog,
+                        max_wait=max_wait,
+                        column_names=column_names,
+                        table_writer=table_writer,
+                        journal=journal
+                    )
 
-            for dir_name in directories:
-                if dir_name[-1] == '\n':
-                    dir_name = dir_name[:-1]
-                print(f"\nStart job with directory: {dir_name}")
-                print("-" * 40)
+        except Exception as e:
+            print(f"❌ Error during upload process: {e}")
 
-                if self._is_task_exists(session, dir_name, project_id):
-                    print(f"⚠ Task '{dir_name}' already exists in project {project_id}. Skipping...")
-                    continue
+        finally:
+            # journal records of loaded tasks are written after their table rows
+            if table_writer is not None:
+                with table_writer:
+                    pass
+            if journal is not None:
+                journal.close()
+
+        finished_count = len([job for job in jobs if job.state == UploadJob.FINISHED])
+        skipped_count = len([job for job in jobs if job.state == UploadJob.SKIPPED])
+        print(f"\nUpload completed: {finished_count}/{len(jobs)} successful, {skipped_count} skipped")
+        return jobs
+
+    def _start_upload_job(
+        self,
+        session: requests.Session,
+        job: UploadJob,
+        project_id: int,
+        share_path: str,
+        catalog: ProjectTaskCatalog,
+        journal: Optional[JobJournal] = None
+    ):
+        """
+        Create task and attach share data to it.
 
-                full_share_path = f"{share_path}/{dir_name}"
+        With journal, steps done by previous runs are not repeated.
 
-                try:
-                    task_payload = {"name": dir_name, "project_id": project_id}
-                    create_response = session.post(
-                        f"{self.base_url}/api/tasks", 
-                        json=task_payload, 
-                        timeout=30
-                    )
+        Parameters
+        ----------
+        session : requests.Session
+            Active session
+        job : UploadJob
+            Upload state, updated in place
+        project_id : int
+            ID of the project
+        share_path : str
+            Path to data on CVAT share
+        catalog : ProjectTaskCatalog
+            Project tasks
+        journal : Optional[JobJournal], optional
+            Journal with upload phases, by default None
+        """
+        dir_name = job.dir_name
+        journal_key = f"{project_id}/{dir_name}"
+        print(f"\nStart job with directory: {dir_name}")
+        print("-" * 40)
+
+        entry = journal.get("upload", journal_key) if journal is not None else None
+        if entry is not None and catalog.get_task(entry.task_id) is None:
+            entry = None
+
+        if entry is not None and entry.phase == JobJournal.LOADED:
+            print(f"⚠ Task '{dir_name}' was uploaded by previous run. Skipping...")
+            job.task_id = entry.task_id
+            job.state = UploadJob.SKIPPED
+            return
 
-                    if create_response.status_code not in [200, 201]:
-                        print(f"❌ Create task error: {create_response.text}")
-                        continue
+        if entry is not None and entry.phase == JobJournal.DATA_ATTACHED:
+            print(f"Resuming data loading of task {entry.task_id}")
+            job.task_id = entry.task_id
+            job.state = UploadJob.DATA_ATTACHED
+            job.started_at = time.monotonic()
+            return
 
-                    task_data = create_response.json()
+        if entry is None and catalog.has_name(dir_name):
+            print(f"⚠ Task '{dir_name}' already exists in project {project_id}. Skipping...")
+            job.state = UploadJob.SKIPPED
+            return
 
-                    task_id = task_data["id"]
+        full_share_path = f"{share_path}/{dir_name}"
 
-                    print(f"Task is created: {dir_name} (ID: {task_id})...✅")
+        try:
+            if entry is not None and entry.phase == JobJournal.CREATED:
+                job.task_id = entry.task_id
+                job.state = UploadJob.CREATED
+                print(f"Task was created by previous run: {dir_name} (ID: {job.task_id})")
+            else:
+                task_payload = {"name": dir_name, "project_id": project_id}
+                create_response = session.post(
+                    f"{self.base_url}/api/tasks", 
+                    json=task_payload, 
+                    timeout=30
+                )
 
-                    share_data = {
-                        "server_files": [f"{full_share_path}/"],
-                        "image_quality": 100,
-                        "use_zip_chunks": False,
-                        "sorting_method": "natural",
-                    }
+                if create_response.status_code not in [200, 201]:
+                    print(f"❌ Create task error: {create_response.text}")
+                    job.fail(f"Create task error: {create_response.status_code}")
+                    return
 
-                    print(f"Download data from: {full_share_path}")
-                    upload_response = session.post(
-                        f"{self.base_url}/api/tasks/{task_id}/data", 
-                        json=share_data, 
-                        timeout=30
-                    )
+                task_data = create_response.json()
+
+                job.task_id = task_data["id"]
+                job.state = UploadJob.CREATED
+                catalog.add(task_data)
+                if journal is not None:
+                    journal.record("upload", journal_key, JobJournal.CREATED, task_id=job.task_id, task_name=dir_name)
 
-                    print(f"   Download status: {upload_response.status_code}")
+                print(f"Task is created: {dir_name} (ID: {job.task_id})...✅")
+
+            share_data = {
+                "server_files": [f"{full_share_path}/"],
+                "image_quality": 100,
+                "use_zip_chunks": False,
+                "sorting_method": "natural",
+            }
 
-                    if upload_response.status_code in [200, 202]:
-                        print("Request is accepted...✅")
+            print(f"Download data from: {full_share_path}")
+            upload_response = session.post(
+                f"{self.base_url}/api/tasks/{job.task_id}/data", 
+                json=share_data, 
+                timeout=30
+            )
 
-                        task_status = self.wait_for_load_completion(session=session, task_id=task_id)
+            print(f"   Download status: {upload_response.status_code}")
 
-                        if task_status == "Finished":
+            if upload_response.status_code in [200, 202]:
+                print("Request is accepted...✅")
+                job.state = UploadJob.DATA_ATTACHED
+                job.started_at = time.monotonic()
+                if journal is not None:
+                    journal.record("upload", journal_key, JobJournal.DATA_ATTACHED, task_id=job.task_id, task_name=dir_name)
+            else:
+                print(f"❌ Download error: {upload_response.text}")
+                self._fail_upload_job(session, job, "Upload request failed", catalog, journal)
 
-                            if self.table_editor is not None:
+        except Exception as e:
+            print(f"❌ Error with directory {dir_name}: {e}")
+            self._fail_upload_job(session, job, f"Exception: {str(e)}", catalog, journal)
 
-                                task_info_response = session.get(f"{self.base_url}/api/tasks/{task_id}")
-                                if task_info_response.status_code == 200:
-                                    task_info = task_info_response.json()
-                                    
-                                    task_url = f"{self.base_url}/tasks/{task_id}"
-                                    image_count = task_info.get("size", 0)
+    def _wait_for_upload_jobs(
+        self,
+        session: requests.Session,
+        in_flight: dict[int, UploadJob],
+        catalog: ProjectTaskCatalog,
+        max_wait: int,
+        column_names: list[str] | None,
+        table_writer: Optional[BufferedRowWriter],
+        journal: Optional[JobJournal] = None
+    ):
+        """
+        Check statuses of all loading tasks until at least one of them is done.
 
-                                    data_dict = dict(zip(column_names, [task_url, image_count]))
-                                    
-                                    print(f"   📊 Task Info:")
-                                    print(f"   URL: {task_url}")
-                                    print(f"   Images: {image_count}")
+        Finished and failed jobs are removed from in_flight.
 
-                                    self.table_editor.write_data_to_table(data_dict=data_dict, worksheet_name=sheet_id)
+        Parameters
+        ----------
+        session : requests.Session
+            Active session
+        in_flight : dict[int, UploadJob]
+            Loading jobs by task ID, updated in place
+        catalog : ProjectTaskCatalog
+            Project tasks
+        max_wait : int
+            Max time in seconds for loading data of one task
+        column_names: list[str] | None
+            Names of target columns in table
+        table_writer : Optional[BufferedRowWriter]
+            Writer of table rows, None if table is not used
+        journal : Optional[JobJournal], optional
+            Journal with upload phases, by default None
+        """
+        policy = dataclasses.replace(self.poll_policy, max_wait=max_wait)
 
-                            print(f"{dir_name} - Success...✅")
-                        else:
-                            self._cleanup_task(session, task_id, f"Upload failed: {task_status}")
-                    else:
-                        print(f"❌ Download error: {upload_response.text}")
-                        self._cleanup_task(session, task_id, "Upload request failed")
+        def check_round() -> Optional[bool]:
+            done_count = 0
 
+            for task_id, job in list(in_flight.items()):
+                try:
+                    task_status = self._get_load_status(session, task_id)
                 except Exception as e:
-                    print(f"❌ Error with directory {dir_name}: {e}")
-                    if 'task_id' in locals():
-                        self._cleanup_task(session, task_id, f"Exception: {str(e)}")
+                    print(f"   ⚠ Check status error: {e}")
+                    task_status = None
 
-        except Exception as e:
-            print(f"❌ Error during upload process: {e}")
-        
-        finally:
-            session.close()
+                if task_status is None and time.monotonic() - job.started_at > max_wait:
+                    task_status = "Timeout"
+
+                if task_status is None:
+                    continue
+
+                self._finish_upload_job(session, job, task_status, catalog, column_names, table_writer, journal)
+                del in_flight[task_id]
+                done_count += 1
+
+            return True if done_count else None
+
+        def report_round(attempt: int, elapsed: float, value: Optional[bool]):
+            if value is None:
+                print(f"   Status check {attempt} ({elapsed:.1f}s): {len(in_flight)} tasks are loading...")
+
+        poll_result = poll_until(check_round, policy, on_attempt=report_round)
+
+        if not poll_result.done:
+            for task_id, job in list(in_flight.items()):
+                self._finish_upload_job(session, job, "Timeout", catalog, column_names, table_writer, journal)
+                del in_flight[task_id]
 
-    def _is_task_exists(self, session: requests.Session, task_name: str, project_id: int) -> bool:
+    def _finish_upload_job(
+        self,
+        session: requests.Session,
+        job: UploadJob,
+        task_status: str,
+        catalog: ProjectTaskCatalog,
+        column_names: list[str] | None,
+        table_writer: Optional[BufferedRowWriter],
+        journal: Optional[JobJournal] = None
+    ):
         """
-        Check if task with given name already exists in the project.
+        Write loaded task to table or delete failed task.
+
+        Table row is buffered, so the task is recorded as loaded in journal
+        only after its row is sent to table.
 
         Parameters
         ----------
         session : requests.Session
             Active session
-        task_name : str
-            Name of the task to check
-        project_id : int
-            ID of the project to check in
-
-        Returns
-        -------
-        bool
-            True if task exists, False otherwise
+        job : UploadJob
+            Upload state, updated in place
+        task_status : str
+            Final loading status
+        catalog : ProjectTaskCatalog
+            Project tasks
+        column_names: list[str] | None
+            Names of target columns in table
+        table_writer : Optional[BufferedRowWriter]
+            Writer of table rows, None if table is not used
+        journal : Optional[JobJournal], optional
+            Journal with upload phases, by default None
         """
+        if task_status != "Finished":
+            self._fail_upload_job(session, job, f"Upload failed: {task_status}", catalog, journal)
+            return
+
+        def record_loaded(task_id: int = job.task_id, dir_name: str = job.dir_name):
+            if journal is not None:
+                journal.record(
+                    "upload", f"{catalog.project_id}/{dir_name}", JobJournal.LOADED,
+                    task_id=task_id, task_name=dir_name
+                )
+
         try:
-            tasks_response = session.get(
-                f"{self.base_url}/api/tasks?project_id={project_id}",
-                timeout=30
-            )
+            is_row_added = False
+            if table_writer is not None:
+                task_info_response = session.get(f"{self.base_url}/api/tasks/{job.task_id}")
+                if task_info_response.status_code == 200:
+                    task_info = task_info_response.json()
+
+                    task_url = f"{self.base_url}/tasks/{job.task_id}"
+                    image_count = task_info.get("size", 0)
+
+                    data_dict = dict(zip(column_names, [task_url, image_count]))
+
+                    print(f"   📊 Task Info:")
+                    print(f"   URL: {task_url}")
+                    print(f"   Images: {image_count}")
+
+                    table_writer.add(data_dict, on_written=record_loaded)
+                    is_row_added = True
+
+            job.state = UploadJob.FINISHED
+            if not is_row_added:
+                record_loaded()
+            print(f"{job.dir_name} - Success...✅")
 
-            if tasks_response.status_code == 200:
-                tasks_data = tasks_response.json()
-                
-                if isinstance(tasks_data, dict) and 'results' in tasks_data:
-                    tasks_list = tasks_data['results']
-                elif isinstance(tasks_data, list):
-                    tasks_list = tasks_data
-                else:
-                    tasks_list = []
-                
-                for task in tasks_list:
-                    if task.get('name') == task_name:
-                        return True
-            
-            return False
-            
         except Exception as e:
-            print(f"⚠ Error checking if task exists: {e}")
-            return False
+            print(f"❌ Error with directory {job.dir_name}: {e}")
+            self._fail_upload_job(session, job, f"Exception: {str(e)}", catalog, journal)
+
+    def _fail_upload_job(
+        self,
+        session: requests.Session,
+        job: UploadJob,
+        error: str,
+        catalog: ProjectTaskCatalog,
+        journal: Optional[JobJournal] = None
+    ):
+        """
+        Mark job as failed, delete its task and forget it in journal.
+
+        Parameters
+        ----------
+        session : requests.Session
+            Active session
+        job : UploadJob
+            Upload state, updated in place
+        error : str
+            Reason of failure
+        catalog : ProjectTaskCatalog
+            Project tasks
+        journal : Optional[JobJournal], optional
+            Journal with upload phases, by default None
+        """
+        job.fail(error)
+
+        if job.task_id is not None:
+            self._cleanup_task(session, job.task_id, error, catalog)
 
-    def _cleanup_task(self, session: requests.Session, task_id: int, reason: str):
+        if journal is not None:
+            journal.remove("upload", f"{catalog.project_id}/{job.dir_name}")
+
+    def _cleanup_task(
+        self,
+        session: requests.Session,
+        task_id: int,
+        reason: str,
+        catalog: Optional[ProjectTaskCatalog] = None
+    ):
         """
         Clean up task in case of error.
 
@@ -389,16 +756,30 @@ class CvatUploader(CvatCore):
             ID of task to delete
         reason : str
             Reason for cleanup
+        catalog : Optional[ProjectTaskCatalog], optional
+            Catalog to remove deleted task from, by default None
         """
         try:
-            session.delete(f"{self.base_url}/api/tasks/{task_id}")
+            response = session.delete(f"{self.base_url}/api/tasks/{task_id}")
+            if not 200 <= response.status_code < 300:
+                print(f"Warning: Could not delete task {task_id}: status {response.status_code}")
+                return
+            if catalog is not None:
+                catalog.remove(task_id)
             print(f"Task {task_id} has been deleted ({reason})")
         except Exception as e:
             print(f"Warning: Could not delete task {task_id}: {e}")
 
 
 class CvatDownloader(CvatCore):
-    def __init__(self, cvat_credentials_path: str, table_url: str | None = None, table_credentials_path: str | None = None):
+    def __init__(
+        self,
+        cvat_credentials_path: str,
+        table_url: str | None = None,
+        table_credentials_path: str | None = None,
+        cache_dir: str | None = None,
+        cache_max_size_gb: float = 20.0
+    ):
         """
             Parameters
         ----------
@@ -408,6 +789,11 @@ class CvatDownloader(CvatCore):
             Url of google table
         table_credentials_path: str | None
             Private data for work with table
+        cache_dir: str | None
+            Directory of local export cache. Tasks not changed in CVAT since
+            previous export are taken from it. If None, cache is disabled
+        cache_max_size_gb: float
+            Max size of export cache in GB
         """
         super().__init__(cvat_credentials_path)
 
@@ -415,13 +801,21 @@ class CvatDownloader(CvatCore):
         if table_url is not None and table_credentials_path is not None:
             self.table_editor = TableEditor(table_url, table_credentials_path)
 
+        self.export_cache = None
+        if cache_dir is not None:
+            self.export_cache = ExportCache(cache_dir, max_size_bytes=int(cache_max_size_gb * 1024 ** 3))
+
     def export_tasks(
     self,
     project_id: int,
     export_format: str,
     task_ids: Optional[list[int]],
     output_dir: str,
-    include_images: bool = True
+    include_images: bool = True,
+    max_workers: int = 1,
+    labels_only: bool = False,
+    resume: bool = False,
+    on_success: Optional[Callable[[int, dict[str, Any]], None]] = None
     ) -> dict[str, Any]:
         """
         Export tasks from CVAT project.
@@ -438,6 +832,17 @@ class CvatDownloader(CvatCore):
             Local directory to save exported files
         include_images : bool, optional
             Whether to include images in export, by default True
+        max_workers : int, optional
+            Number of parallel workers. With more than one worker all exports are
+            started up front, polled together and downloaded in parallel, by default 1
+        labels_only : bool, optional
+            Extract only label .txt files from downloaded archives, by default False
+        resume : bool, optional
+            Keep journal in output_dir: skip tasks downloaded by previous runs
+            and continue exports started by them, by default False
+        on_success : Optional[Callable[[int, dict[str, Any]], None]], optional
+            Called with task ID and its result as soon as files of the task are
+            saved, before other tasks are finished, by default None
 
         Returns
         -------
@@ -450,93 +855,279 @@ class CvatDownloader(CvatCore):
         print("Starting CVAT export...")
         print("=" * 60)
         
-        tasks_to_export = self._get_tasks_for_export(session, project_id, task_ids)
+        try:
+            tasks_to_export = self._get_tasks_for_export(session, project_id, task_ids)
+        except Exception as e:
+            print(f"❌ Error getting tasks of project: {e}")
+            return {}
         
         if not tasks_to_export:
             print("❌ No tasks found to export")
             return {}
 
+        journal = JobJournal(Path(output_dir) / JOURNAL_FILE_NAME) if resume else None
+        all_tasks = tasks_to_export
+        results = {}
+
+        if journal is not None:
+            results = self._get_journaled_exports(
+                journal, tasks_to_export, export_format, include_images, labels_only
+            )
+            tasks_to_export = [task for task in tasks_to_export if task['id'] not in results]
+            self._notify_success(on_success, results)
+            if results:
+                print(f"Resuming: {len(results)} tasks were downloaded by previous run")
+
         self._cleanup_existing_exports(output_dir, tasks_to_export)
         
         print(f"Found {len(tasks_to_export)} tasks to export")
         
-        results = {}
-        
-        for task in tasks_to_export:
-            task_id = task['id']
-            task_name = task['name']
-            
-            print(f"\nExporting: {task_name} (ID: {task_id})")
-            
-            try:
-                local_path = self._start_export(
-                    session=session,
-                    task_id=task_id,
-                    task_name=task_name,
-                    output_dir=output_dir,
-                    export_format=export_format,
-                    include_images=include_images
-                )
-                
-                if local_path:
-                    results[task_id] = {
-                        "status": "success",
-                        "task_name": task_name,
-                        "local_path": local_path
-                    }
-                    print(f"✅ Success: {local_path}")
-                else:
+        if self.export_cache is not None:
+            cached_results = self._get_cached_exports(tasks_to_export, output_dir, export_format, labels_only)
+            results.update(cached_results)
+            self._notify_success(on_success, cached_results)
+            tasks_to_export = [task for task in tasks_to_export if task['id'] not in cached_results]
+
+        if max_workers > 1:
+            results.update(self._export_tasks_concurrently(
+                session=session,
+                tasks=tasks_to_export,
+                output_dir=output_dir,
+                export_format=export_format,
+                include_images=include_images,
+                max_workers=max_workers,
+                labels_only=labels_only,
+                journal=journal,
+                on_success=on_success
+            ))
+        else:
+            for task in tasks_to_export:
+                task_id = task['id']
+                task_name = task['name']
+
+                print(f"\nExporting: {task_name} (ID: {task_id})")
+
+                try:
+                    local_path = self._start_export(
+                        session=session,
+                        task_id=task_id,
+                        task_name=task_name,
+                        output_dir=output_dir,
+                        export_format=export_format,
+                        include_images=include_images,
+                        labels_only=labels_only,
+                        journal=journal,
+                        updated_date=task.get('updated_date')
+                    )
+
+                    if local_path:
+                        results[task_id] = {
+                            "status": "success",
+                            "task_name": task_name,
+                            "local_path": local_path
+                        }
+                        print(f"✅ Success: {local_path}")
+                        self._notify_success(on_success, {task_id: results[task_id]})
+                    else:
+                        results[task_id] = {
+                            "status": "failed", 
+                            "task_name": task_name,
+                            "error": "Export failed"
+                        }
+                        print(f"❌ Export failed for {task_name}")
+
+                except Exception as e:
                     results[task_id] = {
-                        "status": "failed", 
-                        "task_name": task_name,
-                        "error": "Export failed"
+                        "status": "error",
+                        "task_name": task_name, 
+                        "error": str(e)
                     }
-                    print(f"❌ Export failed for {task_name}")
-                    
-            except Exception as e:
-                results[task_id] = {
-                    "status": "error",
-                    "task_name": task_name, 
-                    "error": str(e)
-                }
-                print(f"❌ Error exporting {task_name}: {e}")
-        
-        print(f"\nExport completed: {len([r for r in results.values() if r['status'] == 'success'])}/{len(results)} successful")
-        return results
+                    print(f"❌ Error exporting {task_name}: {e}")
 
-    def _get_tasks_for_export(
-        self,
-        session: requests.Session, 
-        project_id: int, 
-        task_ids: Optional[list[int]] = None
-    ) -> list[dict]:
+        if self.export_cache is not None:
+            for task in tasks_to_export:
+                if results[task['id']]['status'] != "success":
+                    continue
+                try:
+                    self.export_cache.put(
+                        task['id'], export_format, task.get('updated_date'), labels_only,
+                        results[task['id']]['local_path']
+                    )
+                except Exception as e:
+                    print(f"   ⚠ Could not save {task['name']} to cache: {e}")
+
+        results = {task['id']: results[task['id']] for task in all_tasks}
+        print(f"\nExport completed: {len([r for r in results.values() if r['status'] == 'success'])}/{len(results)} successful")
+        if journal is not None:
+            journal.close()
+        return results
+
+    def _export_tasks_concurrently(
+        self,
+        session: requests.Session,
+        tasks: list[dict],
+        output_dir: str,
+        export_format: str,
+        include_images: bool,
+        max_workers: int,
+        labels_only: bool = False,
+        journal: Optional[JobJournal] = None,
+        poll_policy: Optional[BackoffPolicy] = None,
+        on_success: Optional[Callable[[int, dict[str, Any]], None]] = None
+    ) -> dict[int, dict[str, Any]]:
         """
-        Get list of tasks to export.
-        
+        Export several tasks at once.
+
+        All exports are requested up front, then every pending task is checked
+        in one round and finished archives are downloaded in parallel.
+
         Parameters
         ----------
         session : requests.Session
             Authenticated session
-        project_id : int
-            ID of the project
-        task_ids : Optional[list[int]]
-            List of specific task IDs to export
-        
+        tasks : list[dict]
+            Tasks to export
+        output_dir : str
+            Local directory to save exported files
+        export_format : str
+            Export format
+        include_images : bool
+            Whether to include images in export
+        max_workers : int
+            Number of parallel workers
+        labels_only : bool, optional
+            Extract only label .txt files, by default False
+        journal : Optional[JobJournal], optional
+            Journal to record export phases in, by default None
+        poll_policy : Optional[BackoffPolicy], optional
+            Intervals between check rounds and deadline for all exports,
+            by default self.poll_policy
+        on_success : Optional[Callable[[int, dict[str, Any]], None]], optional
+            Called with task ID and its result when task is downloaded, by default None
+
         Returns
         -------
-        list[dict]
-            List of task dictionaries
+        dict[int, dict[str, Any]]
+            Export results in the same order as tasks
         """
-        all_tasks = self._get_all_tasks(session, project_id)
-        
-        if task_ids is None:
-            return all_tasks
-        else:
-            return [task for task in all_tasks if int(task['id']) in task_ids]
+        policy = poll_policy or self.poll_policy
+        results = {}
+        pending = {}
 
-    def _get_all_tasks(self, session: requests.Session, project_id: int) -> list[dict]:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            print(f"Starting {len(tasks)} exports with {max_workers} workers...")
+            start_futures = {
+                executor.submit(
+                    self._resume_or_request_export,
+                    session=session,
+                    task_id=task['id'],
+                    export_format=export_format,
+                    include_images=include_images,
+                    labels_only=labels_only,
+                    journal=journal,
+                    updated_date=task.get('updated_date')
+                ): task
+                for task in tasks
+            }
+
+            for future in as_completed(start_futures):
+                task = start_futures[future]
+                try:
+                    is_started = future.result()
+                except Exception as e:
+                    results[task['id']] = {"status": "error", "task_name": task['name'], "error": str(e)}
+                    print(f"❌ Error exporting {task['name']}: {e}")
+                    continue
+
+                if is_started:
+                    pending[task['id']] = task
+                else:
+                    results[task['id']] = {"status": "failed", "task_name": task['name'], "error": "Export failed"}
+                    print(f"❌ Export failed for {task['name']}")
+
+            print(f"   Waiting for {len(pending)} exports ({policy.max_wait:.0f}s max)...")
+
+            def check_round() -> Optional[bool]:
+                download_futures = {
+                    executor.submit(
+                        self._download_export_file,
+                        session=session,
+                        task_id=task['id'],
+                        task_name=task['name'],
+                        export_format=export_format,
+                        output_dir=output_dir,
+                        labels_only=labels_only
+                    ): task
+                    for task in pending.values()
+                }
+
+                for future in as_completed(download_futures):
+                    task = download_futures[future]
+                    try:
+                        download_result = future.result()
+                    except Exception as e:
+                        results[task['id']] = {"status": "error", "task_name": task['name'], "error": str(e)}
+                        print(f"❌ Error exporting {task['name']}: {e}")
+                        del pending[task['id']]
+                        continue
+
+                    if download_result.success:
+                        results[task['id']] = {
+                            "status": "success",
+                            "task_name": task['name'],
+                            "local_path": download_result.file_path
+                        }
+                        self._journal_download(journal, task['id'], task['name'], export_format,
+                                               include_images, labels_only,
+                                               download_result.file_path, task.get('updated_date'))
+                        print(f"✅ Success: {download_result.file_path}")
+                        del pending[task['id']]
+                        self._notify_success(on_success, {task['id']: results[task['id']]})
+                    elif download_result.is_error:
+                        results[task['id']] = {
+                            "status": "failed",
+                            "task_name": task['name'],
+                            "error": download_result.error_message or "Export failed"
+                        }
+                        print(f"❌ Export failed for {task['name']}")
+                        del pending[task['id']]
+
+                return True if not pending else None
+
+            def report_round(attempt: int, elapsed: float, value: Optional[bool]):
+                print(f"      Check {attempt} after {elapsed:.0f}s: {len(pending)} exports not ready yet")
+
+            if pending:
+                poll_until(check_round, policy, on_attempt=report_round)
+
+        for task in pending.values():
+            results[task['id']] = {"status": "failed", "task_name": task['name'], "error": "Export timeout"}
+            print(f"      ⚠ Export timeout after {policy.max_wait:.0f}s: {task['name']}")
+
+        return {task['id']: results[task['id']] for task in tasks}
+
+    @staticmethod
+    def _notify_success(
+        on_success: Optional[Callable[[int, dict[str, Any]], None]],
+        results: dict[int, dict[str, Any]]
+    ):
+        """Pass finished tasks to callback, errors of callback don't stop export."""
+        if on_success is None:
+            return
+        for task_id, result in results.items():
+            try:
+                on_success(task_id, result)
+            except Exception as e:
+                print(f"⚠ Error in export callback for {result['task_name']}: {e}")
+
+    def _get_tasks_for_export(
+        self,
+        session: requests.Session, 
+        project_id: int, 
+        task_ids: Optional[list[int]] = None
+    ) -> list[dict]:
         """
-        Get all tasks from project with pagination.
+        Get list of tasks to export.
         
         Parameters
         ----------
@@ -544,41 +1135,21 @@ class CvatDownloader(CvatCore):
             Authenticated session
         project_id : int
             ID of the project
+        task_ids : Optional[list[int]]
+            List of specific task IDs to export
         
         Returns
         -------
         list[dict]
-            List of all task dictionaries
+            List of task dictionaries
         """
-        all_tasks = []
-        page = 1
+        catalog = self.load_task_catalog(session, project_id)
         
-        while True:
-            response = session.get(
-                f"{self.base_url}/api/tasks",
-                params={"project_id": project_id, "page": page, "page_size": 100}
-            )
-            
-            if response.status_code != 200:
-                break
-                
-            data = response.json()
-            
-            if isinstance(data, dict) and 'results' in data:
-                tasks = data['results']
-                all_tasks.extend(tasks)
-                
-                if not data.get('next'):
-                    break
-            elif isinstance(data, list):
-                all_tasks.extend(data)
-                break
-            else:
-                break
-                
-            page += 1
-            
-        return all_tasks
+        if task_ids is None:
+            return catalog.tasks
+
+        requested_ids = {int(task_id) for task_id in task_ids}
+        return [task for task in catalog.tasks if int(task['id']) in requested_ids]
 
     def _start_export(
         self,
@@ -587,7 +1158,10 @@ class CvatDownloader(CvatCore):
         task_name: str,
         output_dir: str,
         export_format: str,
-        include_images: bool = True
+        include_images: bool = True,
+        labels_only: bool = False,
+        journal: Optional[JobJournal] = None,
+        updated_date: Optional[str] = None
     ) -> Optional[str]:
         """
         Start export process and download the file.
@@ -606,12 +1180,124 @@ class CvatDownloader(CvatCore):
             Export format
         include_images : bool, optional
             Whether to include images, by default True
+        labels_only : bool, optional
+            Extract only label .txt files, by default False
+        journal : Optional[JobJournal], optional
+            Journal to record export phases in, by default None
+        updated_date : Optional[str], optional
+            CVAT updated_date of task, by default None
         
         Returns
         -------
         Optional[str]
             Local path to downloaded file or None if failed
         """
+        if not self._resume_or_request_export(
+            session=session,
+            task_id=task_id,
+            export_format=export_format,
+            include_images=include_images,
+            labels_only=labels_only,
+            journal=journal,
+            updated_date=updated_date
+        ):
+            return None
+
+        local_path = self._wait_for_export_ready(
+            session=session,
+            task_id=task_id,
+            task_name=task_name,
+            export_format=export_format,
+            output_dir=output_dir,
+            labels_only=labels_only
+        )
+        if local_path:
+            self._journal_download(
+                journal, task_id, task_name, export_format, include_images, labels_only, local_path, updated_date
+            )
+        return local_path
+
+    def _resume_or_request_export(
+        self,
+        session: requests.Session,
+        task_id: int,
+        export_format: str,
+        include_images: bool = True,
+        labels_only: bool = False,
+        journal: Optional[JobJournal] = None,
+        updated_date: Optional[str] = None
+    ) -> bool:
+        """
+        Request export unless journal says it was requested for the same task version.
+
+        Parameters
+        ----------
+        session : requests.Session
+            Authenticated session
+        task_id : int
+            ID of the task to export
+        export_format : str
+            Export format
+        include_images : bool, optional
+            Whether to include images, by default True
+        labels_only : bool, optional
+            Whether only label files are extracted, by default False
+        journal : Optional[JobJournal], optional
+            Journal with export phases, by default None
+        updated_date : Optional[str], optional
+            CVAT updated_date of task, by default None
+
+        Returns
+        -------
+        bool
+            True if export is requested now or earlier
+        """
+        journal_key = self._export_journal_key(task_id, export_format, include_images, labels_only)
+
+        if journal is not None:
+            entry = journal.get("export", journal_key)
+            if entry is not None and entry.phase == JobJournal.EXPORTED and entry.updated_date == updated_date:
+                print(f"   Resuming export requested by previous run (task {task_id})")
+                return True
+
+        is_requested = self._request_export(
+            session=session,
+            task_id=task_id,
+            export_format=export_format,
+            include_images=include_images
+        )
+
+        if is_requested and journal is not None:
+            journal.record("export", journal_key, JobJournal.EXPORTED, task_id=task_id, updated_date=updated_date)
+
+        return is_requested
+
+    def _request_export(
+        self,
+        session: requests.Session,
+        task_id: int,
+        export_format: str,
+        include_images: bool = True
+    ) -> bool:
+        """
+        Ask CVAT to prepare task export.
+
+        Parameters
+        ----------
+        session : requests.Session
+            Authenticated session
+        task_id : int
+            ID of the task to export
+        export_format : str
+            Export format
+        include_images : bool, optional
+            Whether to include images, by default True
+
+        Returns
+        -------
+        bool
+            True if export request is accepted
+        """
         export_params = {
             "format": export_format,
             "filename": f"task_{task_id}_export",
@@ -620,7 +1306,7 @@ class CvatDownloader(CvatCore):
         if not include_images:
             export_params["image_quality"] = 0
             
-        print(f"   Starting export...")
+        print(f"   Starting export (task {task_id})...")
         export_response = session.get(
             f"{self.base_url}/api/tasks/{task_id}/annotations",
             params=export_params
@@ -629,16 +1315,10 @@ class CvatDownloader(CvatCore):
         print(f"   Export init: {export_response.status_code}")
         
         if export_response.status_code in [201, 202]:
-            return self._wait_for_export_ready(
-                session=session,
-                task_id=task_id,
-                task_name=task_name,
-                export_format=export_format,
-                output_dir=output_dir
-            )
-        else:
-            print(f"   ❌ Export init failed: {export_response.text}")
-            return None
+            return True
+
+        print(f"   ❌ Export init failed: {export_response.text}")
+        return False
 
     def _wait_for_export_ready(
     self, 
@@ -647,7 +1327,8 @@ class CvatDownloader(CvatCore):
     task_name: str,
     export_format: str,
     output_dir: str,
-    max_wait: int = 300
+    max_wait: int = 300,
+    labels_only: bool = False
     ) -> Optional[str]:
         """
         Wait for export to be ready and download the file.
@@ -666,6 +1347,8 @@ class CvatDownloader(CvatCore):
             Local directory to save file
         max_wait : int, optional
             Maximum wait time in seconds, by default 300
+        labels_only : bool, optional
+            Extract only label .txt files, by default False
         
         Returns
         -------
@@ -673,28 +1356,37 @@ class CvatDownloader(CvatCore):
             Local path to downloaded file or None if failed
         """
         print(f"   Waiting for export ({max_wait}s max)...")
-        
-        for i in range(max_wait // 10):
-            time.sleep(10)
-            
+        policy = dataclasses.replace(self.poll_policy, max_wait=max_wait)
+
+        def check_download() -> Optional[DownloadResult]:
             download_result = self._download_export_file(
                 session=session,
                 task_id=task_id,
                 task_name=task_name,
                 export_format=export_format,
-                output_dir=output_dir
+                output_dir=output_dir,
+                labels_only=labels_only
             )
-            
-            if download_result.success:
-                print(f"      ✅ Export completed and downloaded!")
-                return download_result.file_path
-            elif download_result.is_error:
-                print(f"      ❌ Download error: {download_result.error_message}")
-                return None
-            else:
-                print(f"      Download check {i+1}: file not ready yet")
-        
-        print(f"      ⚠ Export timeout after {max_wait}s")
+            if download_result.success or download_result.is_error:
+                return download_result
+            return None
+
+        def report_check(attempt: int, elapsed: float, download_result: Optional[DownloadResult]):
+            if download_result is None:
+                print(f"      Download check {attempt} ({elapsed:.1f}s): file not ready yet")
+
+        poll_result = poll_until(check_download, policy, on_attempt=report_check)
+
+        if not poll_result.done:
+            print(f"      ⚠ Export timeout after {max_wait}s")
+            return None
+
+        download_result = poll_result.value
+        if download_result.success:
+            print(f"      ✅ Export completed and downloaded!")
+            return download_result.file_path
+
+        print(f"      ❌ Download error: {download_result.error_message}")
         return None
 
     def _download_export_file(
@@ -704,10 +1396,14 @@ class CvatDownloader(CvatCore):
         task_name: str,
         export_format: str,
         output_dir: str,
-        extract_archive: bool = True
+        extract_archive: bool = True,
+        labels_only: bool = False
     ) -> DownloadResult:
         """
         Download exported file to local directory.
+
+        The archive is streamed to disk by chunks, so memory usage does not
+        depend on the archive size.
         
         Parameters
         ----------
@@ -723,74 +1419,303 @@ class CvatDownloader(CvatCore):
             Local directory to save file
         extract_archive : bool, optional
             Whether to extract ZIP archive after download, by default True
+        labels_only : bool, optional
+            Extract only label .txt files from archive, by default False
         
         Returns
         -------
         DownloadResult
             Result object with status and file path
         """
-        download_response = session.get(
+        with session.get(
             f"{self.base_url}/api/tasks/{task_id}/annotations", 
             params={
                 "format": export_format,
                 "action": "download"
-            }
-        )
-        
-        if download_response.status_code == 200:
+            },
+            stream=True
+        ) as download_response:
+            if download_response.status_code == 202:
+                return DownloadResult(success=False, is_error=False)
+
+            if download_response.status_code != 200:
+                error_msg = f"Download failed with status: {download_response.status_code}"
+                print(f"      ❌ {error_msg}")
+                return DownloadResult(success=False, is_error=True, error_message=error_msg)
+
             content_type = download_response.headers.get('content-type', '')
-            
-            if 'application/zip' in content_type or 'octet-stream' in content_type:
-                safe_task_name = "".join(c for c in task_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                
-                if extract_archive:
-                    extract_dir = Path(output_dir) / safe_task_name
-                    extract_dir.mkdir(parents=True, exist_ok=True)
-                    
-                    with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as tmp_file:
-                        tmp_file.write(download_response.content)
-                        temp_zip_path = tmp_file.name
-                    
-                    try:
-                        with zipfile.ZipFile(temp_zip_path, 'r') as zip_ref:
-                            zip_ref.extractall(extract_dir)
-                        
-                        Path(temp_zip_path).unlink()
-                        
-                        print(f"      ✅ Extracted to directory: {extract_dir}")
-                        return DownloadResult(success=True, file_path=str(extract_dir))
-                        
-                    except Exception as e:
-                        error_msg = f"Extraction failed, saving as ZIP: {e}"
-                        print(f"      ⚠ {error_msg}")
-                        
-                        zip_path = Path(output_dir) / f"{safe_task_name}.zip"
-                        with open(zip_path, 'wb') as f:
-                            f.write(download_response.content)
-                        
-                        file_size = zip_path.stat().st_size
-                        print(f"      ✅ ZIP saved: {zip_path.name} ({file_size / 1024:.1f} KB)")
-                        return DownloadResult(success=True, file_path=str(zip_path))
-                else:
-                    zip_path = Path(output_dir) / f"{safe_task_name}.zip"
-                    with open(zip_path, 'wb') as f:
-                        f.write(download_response.content)
-                    
-                    file_size = zip_path.stat().st_size
-                    print(f"      ✅ ZIP saved: {zip_path.name} ({file_size / 1024:.1f} KB)")
-                    return DownloadResult(success=True, file_path=str(zip_path))
-                    
-            else:
+
+            if 'application/zip' not in content_type and 'octet-stream' not in content_type:
                 error_msg = f"Unexpected content type: {content_type}"
                 print(f"      ❌ {error_msg}")
                 return DownloadResult(success=False, is_error=True, error_message=error_msg)
-        elif download_response.status_code == 202:
-            return DownloadResult(success=False, is_error=False)
-        else:
-            error_msg = f"Download failed with status: {download_response.status_code}"
-            print(f"      ❌ {error_msg}")
-            return DownloadResult(success=False, is_error=True, error_message=error_msg)
 
+            safe_task_name = self._get_safe_task_name(task_name)
+            zip_path = Path(output_dir) / f"{safe_task_name}.zip"
+            part_path = Path(output_dir) / f"{safe_task_name}.zip.part"
+
+            try:
+                self._stream_to_file(download_response, part_path)
+            except Exception as e:
+                part_path.unlink(missing_ok=True)
+                error_msg = f"Streaming download failed: {e}"
+                print(f"      ❌ {error_msg}")
+                return DownloadResult(success=False, is_error=True, error_message=error_msg)
+
+        if extract_archive:
+            extract_dir = Path(output_dir) / safe_task_name
+            extract_dir.mkdir(parents=True, exist_ok=True)
+
+            try:
+                extracted_count = self._extract_archive(part_path, extract_dir, labels_only=labels_only)
+                part_path.unlink()
+
+                print(f"      ✅ Extracted {extracted_count} files to directory: {extract_dir}")
+                return DownloadResult(success=True, file_path=str(extract_dir))
+
+            except Exception as e:
+                error_msg = f"Extraction failed, saving as ZIP: {e}"
+                print(f"      ⚠ {error_msg}")
+
+        part_path.replace(zip_path)
+        file_size = zip_path.stat().st_size
+        print(f"      ✅ ZIP saved: {zip_path.name} ({file_size / 1024:.1f} KB)")
+        return DownloadResult(success=True, file_path=str(zip_path))
+
+    @staticmethod
+    def _stream_to_file(response: requests.Response, file_path: Path) -> int:
+        """
+        Write response body to file by chunks.
+
+        Parameters
+        ----------
+        response : requests.Response
+            Response opened with stream=True
+        file_path : Path
+            Target file
+
+        Returns
+        -------
+        int
+            Number of written bytes
+
+        Raises
+        ------
+        IOError
+            If written size differs from Content-Length
+        """
+        bytes_written = 0
+
+        with open(file_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                bytes_written += len(chunk)
+
+        content_length = response.headers.get('content-length')
+        is_encoded = response.headers.get('content-encoding', 'identity') != 'identity'
+
+        if content_length is not None and not is_encoded and int(content_length) != bytes_written:
+            raise IOError(f"Incomplete download: {bytes_written} of {content_length} bytes")
+
+        return bytes_written
+
+    @staticmethod
+    def _extract_archive(zip_path: Path, extract_dir: Path, labels_only: bool = False) -> int:
+        """
+        Extract ZIP archive member by member.
+
+        Parameters
+        ----------
+        zip_path : Path
+            Path to archive
+        extract_dir : Path
+            Target directory
+        labels_only : bool, optional
+            Extract only .txt files, by default False
+
+        Returns
+        -------
+        int
+            Number of extracted files
+        """
+        extracted_count = 0
+
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            for member in zip_ref.infolist():
+                if member.is_dir():
+                    continue
+                if labels_only and not member.filename.endswith('.txt'):
+                    continue
+
+                zip_ref.extract(member, extract_dir)
+                extracted_count += 1
+
+        return extracted_count
+
+
+    def _get_cached_exports(
+        self,
+        tasks: list[dict],
+        output_dir: str,
+        export_format: str,
+        labels_only: bool
+    ) -> dict[int, dict[str, Any]]:
+        """
+        Copy exports of unchanged tasks from local cache to output directory.
+
+        Parameters
+        ----------
+        tasks : list[dict]
+            Tasks to export
+        output_dir : str
+            Local directory to save exported files
+        export_format : str
+            Export format
+        labels_only : bool
+            Whether only label files are needed
+
+        Returns
+        -------
+        dict[int, dict[str, Any]]
+            Success results of tasks found in cache
+        """
+        results = {}
+
+        for task in tasks:
+            cached_path = self.export_cache.get(task['id'], export_format, task.get('updated_date'), labels_only)
+            if cached_path is None:
+                continue
+
+            safe_task_name = self._get_safe_task_name(task['name'])
+            local_path = Path(output_dir) / (safe_task_name + cached_path.suffix)
+
+            try:
+                self.export_cache.copy_to(cached_path, local_path)
+            except Exception as e:
+                print(f"   ⚠ Could not take {task['name']} from cache: {e}")
+                continue
+
+            results[task['id']] = {
+                "status": "success",
+                "task_name": task['name'],
+                "local_path": str(local_path)
+            }
+            print(f"   ✓ Not changed since last export, taken from cache: {task['name']}")
+
+        if results:
+            print(f"Export cache: {len(results)}/{len(tasks)} tasks are not changed")
+
+        return results
+
+    @staticmethod
+    def _get_safe_task_name(task_name: str) -> str:
+        return "".join(c for c in task_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+
+    @staticmethod
+    def _export_journal_key(task_id: int, export_format: str, include_images: bool, labels_only: bool) -> str:
+        return f"{task_id}/{export_format}/images={int(include_images)}/labels_only={int(labels_only)}"
+
+    def _journal_download(
+        self,
+        journal: Optional[JobJournal],
+        task_id: int,
+        task_name: str,
+        export_format: str,
+        include_images: bool,
+        labels_only: bool,
+        local_path: str,
+        updated_date: Optional[str]
+    ):
+        """
+        Record downloaded or extracted export in journal.
+
+        Parameters
+        ----------
+        journal : Optional[JobJournal]
+            Journal, nothing is recorded if None
+        task_id : int
+            ID of the task
+        task_name : str
+            Name of the task
+        export_format : str
+            Export format
+        include_images : bool
+            Whether images are exported
+        labels_only : bool
+            Whether only label files are extracted
+        local_path : str
+            Path to extracted directory or ZIP file
+        updated_date : Optional[str]
+            CVAT updated_date of task
+        """
+        if journal is None:
+            return
+
+        phase = JobJournal.EXTRACTED if Path(local_path).is_dir() else JobJournal.DOWNLOADED
+        journal.record(
+            "export",
+            self._export_journal_key(task_id, export_format, include_images, labels_only),
+            phase,
+            task_id=task_id,
+            task_name=task_name,
+            local_path=local_path,
+            updated_date=updated_date
+        )
+
+    def _get_journaled_exports(
+        self,
+        journal: JobJournal,
+        tasks: list[dict],
+        export_format: str,
+        include_images: bool,
+        labels_only: bool
+    ) -> dict[int, dict[str, Any]]:
+        """
+        Get results of tasks already downloaded by previous runs.
+
+        Task is counted as done if its files still exist and it was not
+        changed in CVAT after download.
+
+        Parameters
+        ----------
+        journal : JobJournal
+            Journal in output directory
+        tasks : list[dict]
+            Tasks to export
+        export_format : str
+            Export format
+        include_images : bool
+            Whether images are exported
+        labels_only : bool
+            Whether only label files are extracted
+
+        Returns
+        -------
+        dict[int, dict[str, Any]]
+            Success results of completed tasks
+        """
+        results = {}
+
+        for task in tasks:
+            entry = journal.get(
+                "export", self._export_journal_key(task['id'], export_format, include_images, labels_only)
+            )
+
+            if (
+                entry is not None
+                and entry.phase in (JobJournal.DOWNLOADED, JobJournal.EXTRACTED)
+                and entry.updated_date == task.get('updated_date')
+                and entry.local_path
+                and Path(entry.local_path).exists()
+            ):
+                results[task['id']] = {
+                    "status": "success",
+                    "task_name": task['name'],
+                    "local_path": entry.local_path
+                }
+                print(f"   ✓ Already downloaded: {task['name']}")
+
+        return results
 
     def _cleanup_existing_exports(self, output_dir: str, tasks: list[dict]):
         """
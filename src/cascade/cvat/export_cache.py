@@ -0,0 +1,211 @@
+import hashlib
+import json
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+INDEX_FILE_NAME = "index.json"
+
+
+class ExportCache:
+    def __init__(self, cache_dir: str | Path, max_size_bytes: int = 20 * 1024 ** 3, max_entries: Optional[int] = None):
+        """
+        Local cache of downloaded CVAT exports.
+
+        Entry is identified by task ID, export format, labels_only flag and
+        task updated_date, so any change of annotations in CVAT gives
+        a cache miss. Least recently used entries are evicted when cache
+        grows over max_size_bytes or max_entries.
+
+        Parameters
+        ----------
+        cache_dir : str | Path
+            Directory for cached exports
+        max_size_bytes : int, optional
+            Max total size of cached files, by default 20 GB
+        max_entries : Optional[int], optional
+            Max number of cached exports, by default not limited
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = max_size_bytes
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+
+    @staticmethod
+    def make_key(task_id: int, export_format: str, updated_date: Optional[str], labels_only: bool) -> str:
+        raw_key = f"{task_id}|{export_format}|{updated_date}|{int(labels_only)}"
+        return hashlib.sha1(raw_key.encode("utf-8")).hexdigest()
+
+    def get(self, task_id: int, export_format: str, updated_date: Optional[str], labels_only: bool) -> Optional[Path]:
+        """
+        Find cached export of task version.
+
+        Parameters
+        ----------
+        task_id : int
+            ID of the task
+        export_format : str
+            Export format
+        updated_date : Optional[str]
+            CVAT updated_date of task
+        labels_only : bool
+            Whether export contains only label files
+
+        Returns
+        -------
+        Optional[Path]
+            Cached directory or ZIP file, None if there is no entry
+        """
+        if updated_date is None:
+            return None
+
+        key = self.make_key(task_id, export_format, updated_date, labels_only)
+
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+
+            cached_path = self.cache_dir / entry["path"]
+            if not cached_path.exists():
+                del self._index[key]
+                self._save_index()
+                return None
+
+            entry["last_access"] = time.time()
+            self._save_index()
+
+        return cached_path
+
+    def put(
+        self,
+        task_id: int,
+        export_format: str,
+        updated_date: Optional[str],
+        labels_only: bool,
+        source_path: str | Path
+    ):
+        """
+        Copy downloaded export to cache.
+
+        Older versions of the same task are removed.
+
+        Parameters
+        ----------
+        task_id : int
+            ID of the task
+        export_format : str
+            Export format
+        updated_date : Optional[str]
+            CVAT updated_date of task
+        labels_only : bool
+            Whether export contains only label files
+        source_path : str | Path
+            Extracted directory or ZIP file
+
+        Raises
+        ------
+        OSError
+            If export can't be copied, partly copied files are removed
+        """
+        if updated_date is None:
+            return
+
+        source_path = Path(source_path)
+        key = self.make_key(task_id, export_format, updated_date, labels_only)
+        entry_name = key + (".zip" if source_path.is_file() else "")
+        target_path = self.cache_dir / entry_name
+
+        self._remove_path(target_path)
+        try:
+            if source_path.is_dir():
+                shutil.copytree(source_path, target_path)
+            else:
+                shutil.copy2(source_path, target_path)
+        except Exception:
+            # Partly copied entry is not in index, so nothing else would remove it
+            self._remove_path(target_path)
+            raise
+
+        with self._lock:
+            for old_key, old_entry in list(self._index.items()):
+                if (
+                    old_entry["task_id"] == task_id
+                    and old_entry["export_format"] == export_format
+                    and old_entry["labels_only"] == labels_only
+                    and old_key != key
+                ):
+                    self._remove_entry(old_key)
+
+            self._index[key] = {
+                "path": entry_name,
+                "task_id": task_id,
+                "export_format": export_format,
+                "labels_only": labels_only,
+                "updated_date": updated_date,
+                "size": self._get_size(target_path),
+                "last_access": time.time()
+            }
+            self._evict()
+            self._save_index()
+
+    @staticmethod
+    def copy_to(cached_path: Path, target_path: str | Path):
+        """Copy cached directory or file to target path."""
+        if cached_path.is_dir():
+            shutil.copytree(cached_path, target_path, dirs_exist_ok=True)
+        else:
+            shutil.copy2(cached_path, target_path)
+
+    def _evict(self):
+        """Remove least recently used entries over size and count limits."""
+        entries = sorted(self._index.items(), key=lambda item: item[1]["last_access"])
+        total_size = sum(entry["size"] for _, entry in entries)
+
+        while entries and (
+            total_size > self.max_size_bytes
+            or (self.max_entries is not None and len(entries) > self.max_entries)
+        ):
+            key, entry = entries.pop(0)
+            total_size -= entry["size"]
+            self._remove_entry(key)
+
+    def _remove_entry(self, key: str):
+        entry = self._index.pop(key)
+        self._remove_path(self.cache_dir / entry["path"])
+
+    @staticmethod
+    def _remove_path(path: Path):
+        if path.is_dir():
+            shutil.rmtree(path, ignore_errors=True)
+        elif path.exists():
+            path.unlink()
+
+    @staticmethod
+    def _get_size(path: Path) -> int:
+        if path.is_file():
+            return path.stat().st_size
+        return sum(file.stat().st_size for file in path.rglob("*") if file.is_file())
+
+    def _load_index(self) -> dict:
+        index_path = self.cache_dir / INDEX_FILE_NAME
+        if not index_path.exists():
+            return {}
+        try:
+            with open(index_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, json.JSONDecodeError):
+            print("⚠ Export cache index is broken, starting with empty cache")
+            return {}
+
+    def _save_index(self):
+        index_path = self.cache_dir / INDEX_FILE_NAME
+        tmp_path = index_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self._index, file)
+        tmp_path.replace(index_path)
@@ -0,0 +1,147 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+JOURNAL_FILE_NAME = ".cascade_journal.sqlite"
+
+
+@dataclass
+class JournalEntry:
+    """Last recorded phase of CVAT job."""
+    kind: str
+    key: str
+    phase: str
+    task_id: Optional[int] = None
+    task_name: Optional[str] = None
+    local_path: Optional[str] = None
+    updated_date: Optional[str] = None
+    updated_at: float = 0.0
+
+
+class JobJournal:
+    CREATED = "created"
+    DATA_ATTACHED = "data_attached"
+    LOADED = "loaded"
+    EXPORTED = "exported"
+    DOWNLOADED = "downloaded"
+    EXTRACTED = "extracted"
+
+    def __init__(self, path: str | Path):
+        """
+        Durable journal of upload/export phases in SQLite file.
+
+        Every record is committed at once, so after crash the next run
+        knows which work is done and which CVAT jobs are still running.
+
+        Parameters
+        ----------
+        path : str | Path
+            Path to SQLite file, parent directories are created
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                phase TEXT NOT NULL,
+                task_id INTEGER,
+                task_name TEXT,
+                local_path TEXT,
+                updated_date TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (kind, key)
+            )
+            """
+        )
+        self._connection.commit()
+
+    def get(self, kind: str, key: str) -> Optional[JournalEntry]:
+        """
+        Get last recorded phase of job.
+
+        Parameters
+        ----------
+        kind : str
+            Job kind, e.g. "upload" or "export"
+        key : str
+            Job key inside kind
+
+        Returns
+        -------
+        Optional[JournalEntry]
+            Entry or None if job was never recorded
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT kind, key, phase, task_id, task_name, local_path, updated_date, updated_at "
+                "FROM jobs WHERE kind = ? AND key = ?",
+                (kind, key)
+            ).fetchone()
+
+        return JournalEntry(*row) if row else None
+
+    def record(
+        self,
+        kind: str,
+        key: str,
+        phase: str,
+        task_id: Optional[int] = None,
+        task_name: Optional[str] = None,
+        local_path: Optional[str] = None,
+        updated_date: Optional[str] = None
+    ):
+        """
+        Save new phase of job.
+
+        Parameters
+        ----------
+        kind : str
+            Job kind
+        key : str
+            Job key inside kind
+        phase : str
+            New phase
+        task_id : Optional[int], optional
+            ID of CVAT task, by default None
+        task_name : Optional[str], optional
+            Name of CVAT task, by default None
+        local_path : Optional[str], optional
+            Path to local result, by default None
+        updated_date : Optional[str], optional
+            CVAT updated_date of task at the moment of record, by default None
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO jobs "
+                "(kind, key, phase, task_id, task_name, local_path, updated_date, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (kind, key, phase, task_id, task_name, local_path, updated_date, time.time())
+            )
+            self._connection.commit()
+
+    def remove(self, kind: str, key: str):
+        """
+        Forget job, so the next run starts it from scratch.
+
+        Parameters
+        ----------
+        kind : str
+            Job kind
+        key : str
+            Job key inside kind
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM jobs WHERE kind = ? AND key = ?", (kind, key))
+            self._connection.commit()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
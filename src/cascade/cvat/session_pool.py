@@ -0,0 +1,215 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TOKEN_CACHE_PATH = Path.home() / ".cache" / "cascade" / "cvat_tokens.json"
+LOGIN_ENDPOINT = "/api/auth/login"
+
+
+class CvatSessionPool:
+    def __init__(
+        self,
+        base_url: str,
+        username: str,
+        password: str,
+        pool_size: int = 10,
+        token_cache_path: str | Path | None = DEFAULT_TOKEN_CACHE_PATH,
+        token_ttl: int = 12 * 60 * 60
+    ):
+        """
+        Shared authenticated session for CVAT API.
+
+        One keep-alive session is created on first use and reused by all
+        callers. Auth token is cached on disk and session logs in again
+        when server answers 401.
+
+        Parameters
+        ----------
+        base_url : str
+            CVAT server URL
+        username : str
+            CVAT username
+        password : str
+            CVAT password
+        pool_size : int, optional
+            Max number of kept-alive connections, by default 10
+        token_cache_path : str | Path | None, optional
+            JSON file with cached tokens, None disables cache,
+            by default ~/.cache/cascade/cvat_tokens.json
+        token_ttl : int, optional
+            Lifetime of cached token in seconds, by default 12 hours
+        """
+        self.base_url = base_url
+        self.username = username
+        self.password = password
+        self.pool_size = pool_size
+        self.token_cache_path = Path(token_cache_path) if token_cache_path else None
+        self.token_ttl = token_ttl
+
+        self._session: Optional[requests.Session] = None
+        self._lock = threading.Lock()
+
+    def get_session(self) -> requests.Session:
+        """
+        Get shared authenticated session.
+
+        Returns
+        -------
+        requests.Session
+            Authenticated session
+        """
+        with self._lock:
+            if self._session is None:
+                self._session = self._build_session()
+            return self._session
+
+    def close(self):
+        """Close shared session and its connections."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _build_session(self) -> requests.Session:
+        """
+        Create session with connection pool and auth header.
+
+        Returns
+        -------
+        requests.Session
+            Authenticated session
+        """
+        session = requests.Session()
+
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        token = self._load_cached_token()
+        if token is None:
+            token = self._login(session)
+
+        session.headers.update({"Authorization": f"Token {token}"})
+        session.hooks["response"].append(self._relogin_on_unauthorized)
+
+        return session
+
+    def _login(self, session: requests.Session) -> str:
+        """
+        Log in to CVAT and cache received token.
+
+        Parameters
+        ----------
+        session : requests.Session
+            Session used for login request
+
+        Returns
+        -------
+        str
+            Auth token
+        """
+        login_response = session.post(
+            f"{self.base_url}{LOGIN_ENDPOINT}",
+            json={"username": self.username, "password": self.password},
+            headers={"Authorization": None},
+            timeout=30,
+        )
+
+        if login_response.status_code != 200:
+            raise Exception(f"Login failed: {login_response.text}")
+
+        token = login_response.json()["key"]
+        self._save_token(token)
+
+        return token
+
+    def _relogin_on_unauthorized(self, response: requests.Response, *args, **kwargs) -> requests.Response:
+        """
+        Response hook: log in again and repeat request once on 401.
+
+        Parameters
+        ----------
+        response : requests.Response
+            Server response
+
+        Returns
+        -------
+        requests.Response
+            Original response or response of repeated request
+        """
+        request = response.request
+
+        if (
+            response.status_code != 401
+            or request.url.split("?")[0].endswith(LOGIN_ENDPOINT)
+            or getattr(request, "_cascade_retried", False)
+        ):
+            return response
+
+        print("⚠ CVAT token is rejected, logging in again...")
+        session = self._session
+        with self._lock:
+            if request.headers.get("Authorization") == session.headers.get("Authorization"):
+                self._drop_cached_token()
+                token = self._login(session)
+                session.headers.update({"Authorization": f"Token {token}"})
+
+        retry_request = request.copy()
+        retry_request.headers["Authorization"] = session.headers["Authorization"]
+        retry_request._cascade_retried = True
+        response.close()
+
+        return session.send(retry_request, **kwargs)
+
+    def _cache_key(self) -> str:
+        return f"{self.base_url}|{self.username}"
+
+    def _read_cache(self) -> dict:
+        if self.token_cache_path is None or not self.token_cache_path.exists():
+            return {}
+        try:
+            with open(self.token_cache_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _write_cache(self, cache: dict):
+        if self.token_cache_path is None:
+            return
+        try:
+            self.token_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.token_cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(cache, file)
+        except OSError as e:
+            print(f"⚠ Could not save CVAT token cache: {e}")
+
+    def _load_cached_token(self) -> Optional[str]:
+        """
+        Get not expired token from disk cache.
+
+        Returns
+        -------
+        Optional[str]
+            Token or None if there is no valid cached token
+        """
+        entry = self._read_cache().get(self._cache_key())
+        if entry and entry.get("expires_at", 0) > time.time():
+            return entry.get("key")
+        return None
+
+    def _save_token(self, token: str):
+        cache = self._read_cache()
+        cache[self._cache_key()] = {"key": token, "expires_at": time.time() + self.token_ttl}
+        self._write_cache(cache)
+
+    def _drop_cached_token(self):
+        cache = self._read_cache()
+        if cache.pop(self._cache_key(), None) is not None:
+            self._write_cache(cache)
@@ -0,0 +1,113 @@
+from typing import Optional
+
+
+class ProjectTaskCatalog:
+    def __init__(self, project_id: int, tasks: list[dict]):
+        """
+        In-memory index of CVAT project tasks.
+
+        Tasks are loaded once and then updated as tasks are created
+        or deleted, so lookups do not need network calls.
+
+        Parameters
+        ----------
+        project_id : int
+            ID of the project
+        tasks : list[dict]
+            Task dictionaries from CVAT API (all pages)
+        """
+        self.project_id = project_id
+        self._tasks_by_id: dict[int, dict] = {}
+        self._ids_by_name: dict[str, int] = {}
+
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self) -> int:
+        return len(self._tasks_by_id)
+
+    @property
+    def tasks(self) -> list[dict]:
+        """Tasks in loading order."""
+        return list(self._tasks_by_id.values())
+
+    def has_name(self, task_name: str) -> bool:
+        """
+        Check if task with given name exists in the project.
+
+        Parameters
+        ----------
+        task_name : str
+            Name of the task
+
+        Returns
+        -------
+        bool
+            True if task exists
+        """
+        return task_name in self._ids_by_name
+
+    def get_id(self, task_name: str) -> Optional[int]:
+        """
+        Get task ID by name.
+
+        Parameters
+        ----------
+        task_name : str
+            Name of the task
+
+        Returns
+        -------
+        Optional[int]
+            ID of the task or None if there is no such task
+        """
+        return self._ids_by_name.get(task_name)
+
+    def get_task(self, task_id: int) -> Optional[dict]:
+        """
+        Get task dictionary by ID.
+
+        Parameters
+        ----------
+        task_id : int
+            ID of the task
+
+        Returns
+        -------
+        Optional[dict]
+            Task dictionary or None if there is no such task
+        """
+        return self._tasks_by_id.get(int(task_id))
+
+    def add(self, task: dict):
+        """
+        Add created task to index.
+
+        Parameters
+        ----------
+        task : dict
+            Task dictionary with at least 'id' and 'name'
+        """
+        task_id = int(task['id'])
+        self._tasks_by_id[task_id] = task
+        self._ids_by_name[task.get('name', '')] = task_id
+
+    def remove(self, task_id: int):
+        """
+        Remove deleted task from index.
+
+        Parameters
+        ----------
+        task_id : int
+            ID of deleted task
+        """
+        task = self._tasks_by_id.pop(int(task_id), None)
+        if task is None:
+            return
+
+        task_name = task.get('name', '')
+        if self._ids_by_name.get(task_name) == int(task_id):
+            del self._ids_by_name[task_name]
+            for other_id, other_task in self._tasks_by_id.items():
+                if other_task.get('name', '') == task_name:
+                    self._ids_by_name[task_name] = other_id
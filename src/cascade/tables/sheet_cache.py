@@ -0,0 +1,201 @@
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    try:
+        import fastparquet  # noqa: F401
+        PARQUET_AVAILABLE = True
+    except ImportError:
+        PARQUET_AVAILABLE = False
+
+INDEX_FILE_NAME = "index.json"
+# Changed when format of cached tables changes, entries of other versions are not found
+CACHE_VERSION = 2
+
+
+class SheetCache:
+    def __init__(self, cache_dir: str | Path, ttl_seconds: float = 24 * 3600):
+        """
+        Local cache of Google Sheets worksheet tables.
+
+        Entry is identified by spreadsheet ID, worksheet index and range and
+        stores Drive modifiedTime of the spreadsheet, so any edit of the table
+        gives a cache miss. Entries older than ttl_seconds are removed.
+        Tables are stored in Parquet if pyarrow or fastparquet is installed
+        and in pickle otherwise or if table can't be written to Parquet
+        (e.g. duplicated column names).
+
+        Parameters
+        ----------
+        cache_dir : str | Path
+            Directory for cached tables
+        ttl_seconds : float, optional
+            Max age of entry, by default one day
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+        with self._lock:
+            self._evict()
+            self._save_index()
+
+    @staticmethod
+    def make_key(spreadsheet_id: str, worksheet_name: int, range_name: Optional[str] = None) -> str:
+        raw_key = f"{CACHE_VERSION}|{spreadsheet_id}|{worksheet_name}|{range_name or ''}"
+        return hashlib.sha1(raw_key.encode("utf-8")).hexdigest()
+
+    def get(
+        self,
+        spreadsheet_id: str,
+        worksheet_name: int,
+        modified_time: Optional[str],
+        range_name: Optional[str] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Find cached table of worksheet version.
+
+        Parameters
+        ----------
+        spreadsheet_id : str
+            ID of the spreadsheet
+        worksheet_name : int
+            Sheet id in spreadsheet
+        modified_time : Optional[str]
+            Drive modifiedTime of spreadsheet
+        range_name : Optional[str], optional
+            A1 range that was read, by default whole sheet
+
+        Returns
+        -------
+        Optional[pd.DataFrame]
+            Cached table, None if there is no fresh entry
+        """
+        if modified_time is None:
+            return None
+
+        key = self.make_key(spreadsheet_id, worksheet_name, range_name)
+
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+
+            if entry["modified_time"] != modified_time or time.time() - entry["saved_at"] > self.ttl_seconds:
+                self._remove_entry(key)
+                self._save_index()
+                return None
+
+            try:
+                return self._read_table(self.cache_dir / entry["path"], entry["format"])
+            except Exception as e:
+                print(f"⚠ Cached table is broken, reading from table: {e}")
+                self._remove_entry(key)
+                self._save_index()
+                return None
+
+    def put(
+        self,
+        spreadsheet_id: str,
+        worksheet_name: int,
+        modified_time: Optional[str],
+        table: pd.DataFrame,
+        range_name: Optional[str] = None
+    ):
+        """
+        Save worksheet table to cache.
+
+        Parameters
+        ----------
+        spreadsheet_id : str
+            ID of the spreadsheet
+        worksheet_name : int
+            Sheet id in spreadsheet
+        modified_time : Optional[str]
+            Drive modifiedTime of spreadsheet before table was read
+        table : pd.DataFrame
+            Worksheet table
+        range_name : Optional[str], optional
+            A1 range that was read, by default whole sheet
+        """
+        if modified_time is None:
+            return
+
+        key = self.make_key(spreadsheet_id, worksheet_name, range_name)
+
+        with self._lock:
+            self._remove_entry(key)
+            entry_name, table_format = self._write_table(key, table)
+
+            self._index[key] = {
+                "path": entry_name,
+                "format": table_format,
+                "spreadsheet_id": spreadsheet_id,
+                "worksheet_name": worksheet_name,
+                "range_name": range_name,
+                "modified_time": modified_time,
+                "saved_at": time.time()
+            }
+            self._evict()
+            self._save_index()
+
+    def _write_table(self, key: str, table: pd.DataFrame) -> tuple[str, str]:
+        if PARQUET_AVAILABLE:
+            entry_name = key + ".parquet"
+            try:
+                # Index keeps row numbers of sheet
+                table.to_parquet(self.cache_dir / entry_name)
+                return entry_name, "parquet"
+            except Exception:
+                (self.cache_dir / entry_name).unlink(missing_ok=True)
+
+        entry_name = key + ".pkl"
+        table.to_pickle(self.cache_dir / entry_name)
+        return entry_name, "pickle"
+
+    @staticmethod
+    def _read_table(path: Path, table_format: str) -> pd.DataFrame:
+        if table_format == "parquet":
+            return pd.read_parquet(path)
+        return pd.read_pickle(path)
+
+    def _evict(self):
+        """Remove entries older than TTL."""
+        now = time.time()
+        for key, entry in list(self._index.items()):
+            if now - entry["saved_at"] > self.ttl_seconds:
+                self._remove_entry(key)
+
+    def _remove_entry(self, key: str):
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            (self.cache_dir / entry["path"]).unlink(missing_ok=True)
+
+    def _load_index(self) -> dict:
+        index_path = self.cache_dir / INDEX_FILE_NAME
+        if not index_path.exists():
+            return {}
+        try:
+            with open(index_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, json.JSONDecodeError):
+            print("⚠ Sheet cache index is broken, starting with empty cache")
+            return {}
+
+    def _save_index(self):
+        index_path = self.cache_dir / INDEX_FILE_NAME
+        tmp_path = index_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self._index, file)
+        tmp_path.replace(index_path)
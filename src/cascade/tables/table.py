@@ -1,52 +1,419 @@
 import json
 import os
-from typing import Any
+import time
+from typing import Any, Callable, Optional, TypeVar
 from typing import cast
 
 import pandas as pd
 import gspread
 from google.oauth2.service_account import Credentials
+from gspread.utils import a1_range_to_grid_range, absolute_range_name, fill_gaps
+
+from src.cascade.tables.sheet_cache import SheetCache
+from src.cascade.tools.polling import BackoffPolicy
+
+T = TypeVar("T")
 
 SCOPES = [
     'https://www.googleapis.com/auth/spreadsheets',
     'https://www.googleapis.com/auth/drive.readonly'
 ]
 
+# Quota exceeded and temporary server errors, request can be repeated
+RETRY_STATUS_CODES = (429, 500, 502, 503)
+# Appends are repeated only when rejected by quota: after a server error
+# rows may be already written and repeat would duplicate them
+APPEND_RETRY_STATUS_CODES = (429,)
+
+# Format of dates in tables, e.g. 10.10.2025
+DATE_FORMAT = "%d.%m.%Y"
+INTEGER_PATTERN = r'[+-]?\d+'
+
+
+def is_retryable_error(error: Exception, retry_codes: tuple[int, ...] = RETRY_STATUS_CODES) -> bool:
+    """Check that Sheets API error is caused by quota or temporary server failure."""
+    return isinstance(error, gspread.exceptions.APIError) and error.code in retry_codes
+
+
+def apply_schema(df: pd.DataFrame, schema: dict[str, str]) -> pd.DataFrame:
+    """
+    Convert string columns of table to given types.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Table with string values
+    schema : dict[str, str]
+        Column name to type:
+        "category" - categorical strings,
+        "int" - nullable Int64, only whole numbers as for int() are valid,
+        "float" - Float64,
+        "date" - datetime64 parsed by DATE_FORMAT, "date:<format>" for other format.
+        Missing columns are skipped, empty and invalid values become NA
+
+    Returns
+    -------
+    pd.DataFrame
+        Table with converted columns
+    """
+    df = df.copy()
+
+    for column_name, column_type in schema.items():
+        if column_name not in df.columns:
+            continue
+
+        if column_type == "category":
+            df[column_name] = df[column_name].astype("category")
+            continue
+
+        values = df[column_name].astype(str).str.strip()
+        is_filled = values != ""
+
+        if column_type == "int":
+            converted = pd.to_numeric(values.where(values.str.fullmatch(INTEGER_PATTERN)), errors="coerce")
+            converted = converted.astype("Int64")
+        elif column_type == "float":
+            converted = pd.to_numeric(values.where(is_filled), errors="coerce").astype("Float64")
+        elif column_type.startswith("date"):
+            date_format = column_type.partition(":")[2] or DATE_FORMAT
+            converted = pd.to_datetime(values.where(is_filled), format=date_format, errors="coerce")
+        else:
+            raise ValueError(f"Unknown type '{column_type}' of column '{column_name}'")
+
+        invalid_count = int((is_filled & converted.isna()).sum())
+        if invalid_count:
+            print(f"⚠️ Column '{column_name}': {invalid_count} values are not {column_type}")
+        df[column_name] = converted
+
+    return df
+
 
 class TableEditor():
-    def __init__(self, url: str, credentials_file: str):
+    def __init__(
+        self,
+        url: str,
+        credentials_file: str,
+        retry_policy: Optional[BackoffPolicy] = None,
+        cache: Optional[SheetCache] = None
+    ):
+        """
+        Parameters
+        ----------
+        url : str
+            URL of the Google Sheets table
+        credentials_file : str
+            Path to service account credentials
+        retry_policy : Optional[BackoffPolicy], optional
+            Pauses between repeats of requests rejected by quota,
+            by default from 1 to 64 seconds during 5 minutes
+        cache : Optional[SheetCache], optional
+            Local cache of read tables, by default tables are always requested
+        """
         self.creds = Credentials.from_service_account_file(credentials_file, scopes=SCOPES)
         self.gc = gspread.authorize(self.creds)
         self.sheet = self.gc.open_by_url(url)
-    
+        self.retry_policy = retry_policy or BackoffPolicy(initial_interval=1.0, max_interval=64.0, max_wait=300.0)
+        self.cache = cache
+
+        self._worksheets: dict[int, gspread.Worksheet] = {}
+        self._headers: dict[int, list[str]] = {}
+
+    def call_with_retry(self, request: Callable[[], T], retry_codes: tuple[int, ...] = RETRY_STATUS_CODES) -> T:
+        """
+        Call Sheets API request, repeat it with growing pauses while quota is exceeded.
+
+        Parameters
+        ----------
+        request : Callable[[], T]
+            Function that sends request
+        retry_codes : tuple[int, ...], optional
+            HTTP codes of errors that are repeated, by default RETRY_STATUS_CODES,
+            APPEND_RETRY_STATUS_CODES for requests that are not idempotent
+
+        Returns
+        -------
+        T
+            Result of request
+
+        Raises
+        ------
+        gspread.exceptions.APIError
+            If error is not retryable or retry_policy.max_wait is over
+        """
+        start_time = time.monotonic()
+
+        for interval in self.retry_policy.intervals():
+            try:
+                return request()
+            except gspread.exceptions.APIError as e:
+                remaining = self.retry_policy.max_wait - (time.monotonic() - start_time)
+                if not is_retryable_error(e, retry_codes) or remaining <= 0:
+                    raise
+                print(f"⚠ Sheets API error {e.code}, retry in {min(interval, remaining):.1f}s")
+                time.sleep(min(interval, remaining))
+
+    def get_worksheet(self, worksheet_name: int = 0) -> Optional[gspread.Worksheet]:
+        """Get worksheet by index, worksheet metadata is requested only once."""
+        if worksheet_name not in self._worksheets:
+            worksheet = self.sheet.get_worksheet(worksheet_name)
+            if worksheet is None:
+                return None
+            self._worksheets[worksheet_name] = worksheet
+        return self._worksheets[worksheet_name]
+
+    def get_headers(self, worksheet_name: int = 0, refresh: bool = False) -> list[str]:
+        """
+        Get header row of worksheet.
+
+        Only the first row is requested, result is cached per worksheet.
+
+        Parameters
+        ----------
+        worksheet_name : int
+            Sheet id in target table
+        refresh : bool
+            Request header row again, e.g. after columns were changed
+
+        Returns
+        -------
+        list[str]
+            Column names
+        """
+        if refresh or worksheet_name not in self._headers:
+            worksheet = self.get_worksheet(worksheet_name)
+            if worksheet is None:
+                raise ValueError(f"Worksheet {worksheet_name} does not exist")
+            headers = self.call_with_retry(lambda: worksheet.row_values(1))
+            if not headers:
+                raise ValueError("Table is empty!")
+            self._headers[worksheet_name] = headers
+        return self._headers[worksheet_name]
+
+    def make_row(self, data_dict: dict, worksheet_name: int = 0) -> list[str]:
+        """
+        Place values to their columns.
+
+        Parameters
+        ----------
+        data_dict : dict
+            Example: {'column name': 'value', ...}
+        worksheet_name : int
+            Sheet id in target table
+
+        Returns
+        -------
+        list[str]
+            Row with the length of header, missing columns are empty
+        """
+        headers = self.get_headers(worksheet_name)
+        new_row = [""] * len(headers)
+
+        for column_name, value in data_dict.items():
+            if column_name in headers:
+                column_index = headers.index(column_name)
+                new_row[column_index] = str(value) if value is not None else ""
+            else:
+                print(f"⚠️ Column'{column_name}' does not find! Excists columns: {headers}")
+
+        return new_row
+
+    def buffered_writer(self, worksheet_name: int = 0, flush_size: int = 100) -> "BufferedRowWriter":
+        """
+        Create writer that sends rows to worksheet in batches.
+
+        Parameters
+        ----------
+        worksheet_name : int
+            Sheet id in target table
+        flush_size : int
+            Number of rows that triggers sending
+
+        Returns
+        -------
+        BufferedRowWriter
+            Writer, use it as context manager to send the rest of rows
+        """
+        return BufferedRowWriter(self, worksheet_name, flush_size)
+
 
     def get_sheet_count(self) -> int:
         return len(self.sheet.worksheets())
 
 
-    def get_named_table(self, worksheet_name: int = 0) -> pd.DataFrame:
-        worksheet = self.sheet.get_worksheet(worksheet_name)
+    @staticmethod
+    def _values_to_table(all_data: list[list[str]], header_row: int = 1) -> pd.DataFrame:
+        """
+        Make DataFrame from sheet values, the first row is header, empty rows are dropped.
+
+        Index of table is 1-based number of row in sheet, header is in row header_row.
+        """
+        if not all_data or len(all_data) < 2:
+            print("⚠️ На листе недостаточно данных для таблицы")
+            return pd.DataFrame()
+
+        headers = all_data[0]
+        rows = all_data[1:]
+
+        non_empty_rows = []
+        row_numbers = []
+        for row_idx, row in enumerate(rows):
+            if any(cell.strip() for cell in row):
+                non_empty_rows.append(row)
+                row_numbers.append(header_row + 1 + row_idx)
+
+        df = pd.DataFrame(non_empty_rows, columns=headers, index=row_numbers)
+        print(f"✅ Загружено данных: {len(df)} строк, {len(df.columns)} столбцов")
+        return df
+
+    def get_modified_time(self) -> Optional[str]:
+        """Get Drive modifiedTime of spreadsheet, None if it can't be requested."""
+        try:
+            return self.call_with_retry(self.sheet.get_lastUpdateTime)
+        except Exception as e:
+            print(f"⚠ Can't get modification time of table, cache is not used: {e}")
+            return None
+
+    def _get_cached_table(
+        self,
+        worksheet_name: int,
+        modified_time: Optional[str],
+        range_name: Optional[str] = None
+    ) -> Optional[pd.DataFrame]:
+        """Get table from cache, None if there is no entry or cache fails."""
+        if self.cache is None or modified_time is None:
+            return None
+        try:
+            return self.cache.get(self.sheet.id, worksheet_name, modified_time, range_name)
+        except Exception as e:
+            print(f"⚠ Can't read table from cache: {e}")
+            return None
+
+    def _put_cached_table(
+        self,
+        worksheet_name: int,
+        modified_time: Optional[str],
+        table: pd.DataFrame,
+        range_name: Optional[str] = None
+    ):
+        """Save table to cache, errors of cache don't break reading."""
+        if self.cache is None or modified_time is None:
+            return
+        try:
+            self.cache.put(self.sheet.id, worksheet_name, modified_time, table, range_name)
+        except Exception as e:
+            print(f"⚠ Can't save table to cache: {e}")
+
+    def get_named_table(self, worksheet_name: int = 0, schema: Optional[dict[str, str]] = None) -> pd.DataFrame:
+        """
+        Read worksheet to DataFrame, the first row is header.
+
+        Parameters
+        ----------
+        worksheet_name : int
+            Sheet id in target table
+        schema : Optional[dict[str, str]]
+            Types of columns, see apply_schema, by default all values are strings
+
+        Returns
+        -------
+        pd.DataFrame
+            Table without empty rows indexed by row numbers in sheet,
+            empty if sheet can't be read
+        """
+        modified_time = self.get_modified_time() if self.cache is not None else None
+        cached_table = self._get_cached_table(worksheet_name, modified_time)
+        if cached_table is not None:
+            return apply_schema(cached_table, schema) if schema else cached_table
+
+        worksheet = self.get_worksheet(worksheet_name)
     
         try:
             all_data = worksheet.get_all_values()
-            
-            if not all_data or len(all_data) < 2:
-                print("⚠️ На листе недостаточно данных для таблицы")
-                return pd.DataFrame()
-            
-            headers = all_data[0]
-            rows = all_data[1:]
-            
-            non_empty_rows = [row for row in rows if any(cell.strip() for cell in row)]
-            
-            df = pd.DataFrame(non_empty_rows, columns=headers)
-            print(f"✅ Загружено данных: {len(df)} строк, {len(df.columns)} столбцов")
-            return df
+            df = self._values_to_table(all_data)
             
         except Exception as e:
             print(f"❌ Ошибка загрузки данных: {e}")
             return pd.DataFrame()
 
+        self._put_cached_table(worksheet_name, modified_time, df)
+        return apply_schema(df, schema) if schema else df
+
+    @staticmethod
+    def _first_row_number(range_name: Optional[str]) -> int:
+        """1-based number of the first row of A1 range returned by API, e.g. 'Sheet1'!A5:M100 -> 5."""
+        # Range without cells is the whole sheet
+        if not range_name or "!" not in range_name:
+            return 1
+        try:
+            grid_range = a1_range_to_grid_range(range_name.rpartition("!")[2])
+        except Exception:
+            return 1
+        return grid_range.get("startRowIndex", 0) + 1
+
+    def get_named_tables(
+        self,
+        worksheet_names: Optional[list[int]] = None,
+        range_name: Optional[str] = None,
+        schema: Optional[dict[str, str]] = None
+    ) -> dict[int, pd.DataFrame]:
+        """
+        Read several worksheets by one values_batch_get request.
+
+        If cache is set and spreadsheet was not modified, cached tables
+        are used and only missing ones are requested.
+
+        Parameters
+        ----------
+        worksheet_names : Optional[list[int]]
+            Sheet ids to read, by default all sheets
+        range_name : Optional[str]
+            A1 range to read from every sheet, e.g. "A1:M1000", by default whole sheet
+        schema : Optional[dict[str, str]]
+            Types of columns of every sheet, see apply_schema, by default all values are strings
+
+        Returns
+        -------
+        dict[int, pd.DataFrame]
+            Table of every sheet in the order of worksheet_names, indexed by row numbers in sheet
+
+        Raises
+        ------
+        gspread.exceptions.APIError
+            If request fails after retries
+        """
+        modified_time = self.get_modified_time() if self.cache is not None else None
+
+        worksheets = self.call_with_retry(self.sheet.worksheets)
+        for worksheet_name, worksheet in enumerate(worksheets):
+            self._worksheets.setdefault(worksheet_name, worksheet)
+
+        if worksheet_names is None:
+            worksheet_names = list(range(len(worksheets)))
+        worksheet_names = [name for name in worksheet_names if 0 <= name < len(worksheets)]
+
+        tables = {}
+        for worksheet_name in worksheet_names:
+            cached_table = self._get_cached_table(worksheet_name, modified_time, range_name)
+            if cached_table is not None:
+                tables[worksheet_name] = cached_table
+
+        missing_names = [name for name in worksheet_names if name not in tables]
+        if missing_names:
+            ranges = [absolute_range_name(worksheets[name].title, range_name) for name in missing_names]
+            response = self.call_with_retry(lambda: self.sheet.values_batch_get(ranges))
+
+            for worksheet_name, value_range in zip(missing_names, response.get("valueRanges", [])):
+                # Trailing empty cells are not returned, rows are padded as in get_all_values
+                tables[worksheet_name] = self._values_to_table(
+                    fill_gaps(value_range.get("values", [])), self._first_row_number(value_range.get("range"))
+                )
+                self._put_cached_table(worksheet_name, modified_time, tables[worksheet_name], range_name)
+
+        return {
+            name: apply_schema(tables[name], schema) if schema else tables[name]
+            for name in worksheet_names if name in tables
+        }
+
 
     def append_to_end(self, data: pd.DataFrame | list, worksheet_name: int=0):
         """Append data into the end of table.
@@ -58,14 +425,14 @@ class TableEditor():
         worksheet_name: int
             Index of sheet
         """
-        worksheet = self.sheet.get_worksheet(worksheet_name)
+        worksheet = self.get_worksheet(worksheet_name)
         
         if isinstance(data, pd.DataFrame):
             values = data.values.tolist()
         else:
             values = data
         
-        worksheet.append_rows(values)
+        self.call_with_retry(lambda: worksheet.append_rows(values), APPEND_RETRY_STATUS_CODES)
         print(f"✅ Добавлено {len(values)} строк в конец листа '{worksheet.title}'")
 
     def write_data_to_table(self, data_dict: dict, worksheet_name: int = 0):
@@ -79,26 +446,12 @@ class TableEditor():
         worksheet_name : int
             Sheet id in target table
         """
-        worksheet = self.sheet.get_worksheet(worksheet_name)
-        
         try:
-            all_data = worksheet.get_all_values()
-            
-            if not all_data:
-                raise ValueError("Table is empty!")
-            
-            headers = all_data[0]
-            
-            new_row = [""] * len(headers)
-            
-            for column_name, value in data_dict.items():
-                if column_name in headers:
-                    column_index = headers.index(column_name)
-                    new_row[column_index] = str(value) if value is not None else ""
-                else:
-                    print(f"⚠️ Column'{column_name}' does not find! Excists columns: {headers}")
-            
-            worksheet.append_row(new_row)
+            worksheet = self.get_worksheet(worksheet_name)
+            new_row = self.make_row(data_dict, worksheet_name)
+            headers = self.get_headers(worksheet_name)
+
+            self.call_with_retry(lambda: worksheet.append_row(new_row), APPEND_RETRY_STATUS_CODES)
             
             print(f"✅ Succes added data:")
             for column_name, value in data_dict.items():
@@ -106,4 +459,101 @@ class TableEditor():
                     print(f"   📌 {column_name}: {value}")
             
         except Exception as e:
-            print(f"❌ Add data error: {e}")
\ No newline at end of file
+            print(f"❌ Add data error: {e}")
+
+
+class BufferedRowWriter():
+    def __init__(self, table_editor: TableEditor, worksheet_name: int = 0, flush_size: int = 100):
+        """
+        Rows for one worksheet gathered in memory and sent by one append_rows call.
+
+        Rows are sent when flush_size rows are gathered, on flush()
+        and on exit from context manager. Requests rejected by quota
+        are repeated by retry policy of table_editor. After failed
+        sending the next try is made when flush_size more rows are gathered.
+
+        Parameters
+        ----------
+        table_editor : TableEditor
+            Editor of target table
+        worksheet_name : int
+            Sheet id in target table
+        flush_size : int
+            Number of rows that triggers sending
+        """
+        self.table_editor = table_editor
+        self.worksheet_name = worksheet_name
+        self.flush_size = max(1, flush_size)
+
+        self._rows: list[dict | list] = []
+        self._callbacks: list[Callable[[], None]] = []
+        self._flush_at = self.flush_size
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __enter__(self) -> "BufferedRowWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+        if self._rows:
+            print(f"❌ {len(self._rows)} rows were not written to table")
+
+    def add(self, data_dict: dict | list, on_written: Optional[Callable[[], None]] = None):
+        """
+        Add row to buffer.
+
+        Parameters
+        ----------
+        data_dict : dict | list
+            Example: {'column name': 'value', ...}, list is written as is from the first column
+        on_written : Optional[Callable[[], None]]
+            Called after row is written to table
+        """
+        self._rows.append(data_dict)
+        if on_written is not None:
+            self._callbacks.append(on_written)
+
+        if len(self._rows) >= self._flush_at:
+            self.flush()
+
+    def flush(self) -> bool:
+        """
+        Send gathered rows.
+
+        If sending fails, rows stay in buffer for the next flush.
+
+        Returns
+        -------
+        bool
+            True if buffer is empty after flush
+        """
+        if not self._rows:
+            return True
+
+        try:
+            worksheet = self.table_editor.get_worksheet(self.worksheet_name)
+            rows = [
+                data_dict if isinstance(data_dict, list) else self.table_editor.make_row(data_dict, self.worksheet_name)
+                for data_dict in self._rows
+            ]
+            self.table_editor.call_with_retry(lambda: worksheet.append_rows(rows), APPEND_RETRY_STATUS_CODES)
+        except Exception as e:
+            print(f"❌ Add data error: {e}")
+            self._flush_at = len(self._rows) + self.flush_size
+            return False
+
+        print(f"✅ Added {len(self._rows)} rows to sheet '{worksheet.title}'")
+        callbacks = self._callbacks
+        self._rows = []
+        self._callbacks = []
+        self._flush_at = self.flush_size
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"⚠ Callback after table write failed: {e}")
+
+        return True
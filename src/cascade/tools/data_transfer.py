@@ -1,13 +1,290 @@
+import hashlib
+import heapq
+import shlex
+import shutil
 import subprocess
 import getpass
 import json
-from pathlib import Path
-from typing import Dict
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Callable, Dict, Optional
+
+from src.cascade.tools.ssh_transport import SshTransport
+
+# Cost of one file in bytes for balancing shards, small files are limited by latency, not bandwidth
+FILE_COST_BYTES = 64 * 1024
+# Max number of files in one scp command line
+MAX_FILES_PER_COMMAND = 256
+# Timeout of one scp command in seconds
+COMMAND_TIMEOUT = 300000
+# Directory of sync manifests, one file per local tree and target, kept out of synced trees
+DEFAULT_MANIFEST_DIR = "./transfer_manifests"
+# Commands of stream compression: compress, decompress
+COMPRESSORS = {
+    "gzip": (["gzip", "-1", "-c"], "gzip -dc"),
+    "zstd": (["zstd", "-3", "-T0", "-q", "-c"], "zstd -dcq"),
+}
+
+
+@dataclass
+class TransferFile:
+    relative_path: str
+    size: int
+    mtime: int = 0
+
+
+@dataclass
+class TransferProgress:
+    files_done: int
+    files_total: int
+    size_done: int
+    size_total: int
+    elapsed: float
+
+
+@dataclass
+class TransferResult:
+    source: str
+    target: str
+    files: int = 0
+    size: int = 0
+    elapsed: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def throughput(self) -> float:
+        """Megabytes per second."""
+        return self.size / 1024 ** 2 / max(self.elapsed, 1e-9)
+
+
+def list_local_files(root: str | Path) -> list[TransferFile]:
+    """List files of local tree with paths relative to root."""
+    root = Path(root)
+    files = []
+    for path in sorted(root.rglob("*")):
+        if path.is_file():
+            stat = path.stat()
+            files.append(TransferFile(path.relative_to(root).as_posix(), stat.st_size, int(stat.st_mtime)))
+    return files
+
+
+def file_hash(path: str | Path) -> str:
+    """SHA-1 of file content, the same as sha1sum gives."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def split_to_shards(files: list[TransferFile], shards_count: int) -> list[list[TransferFile]]:
+    """
+    Split files to shards with close total cost.
+
+    The largest files are placed first, every file goes to the shard
+    with the lowest cost, cost of file is its size plus FILE_COST_BYTES.
+
+    Parameters
+    ----------
+    files : list[TransferFile]
+        Files to transfer
+    shards_count : int
+        Number of shards
+
+    Returns
+    -------
+    list[list[TransferFile]]
+        Non-empty shards, files of every shard are sorted by path
+    """
+    shards = [[] for _ in range(max(1, min(shards_count, len(files))))]
+    heap = [(0, shard_idx) for shard_idx in range(len(shards))]
+
+    for file in sorted(files, key=lambda file: file.size, reverse=True):
+        cost, shard_idx = heapq.heappop(heap)
+        shards[shard_idx].append(file)
+        heapq.heappush(heap, (cost + file.size + FILE_COST_BYTES, shard_idx))
+
+    return [sorted(shard, key=lambda file: file.relative_path) for shard in shards if shard]
+
+
+def group_by_directory(files: list[TransferFile], max_files: int = MAX_FILES_PER_COMMAND) -> list[tuple[str, list[str]]]:
+    """Group sorted files by parent directory to batches of at most max_files."""
+    groups = {}
+    for file in files:
+        parent = PurePosixPath(file.relative_path).parent.as_posix()
+        groups.setdefault(parent, []).append(file.relative_path)
+
+    return [
+        (directory, paths[start:start + max_files])
+        for directory, paths in groups.items()
+        for start in range(0, len(paths), max_files)
+    ]
+
+
+def run_pipeline(commands: list[list[str]], timeout: float = COMMAND_TIMEOUT) -> list[str]:
+    """
+    Run commands connected by pipes like cmd1 | cmd2 | cmd3.
+
+    Parameters
+    ----------
+    commands : list[list[str]]
+        Commands in order of data flow
+    timeout : float
+        Timeout of the whole pipeline in seconds
+
+    Returns
+    -------
+    list[str]
+        Errors of commands with non-zero exit code
+    """
+    processes = []
+    stderr_files = []
+    previous_stdout = subprocess.DEVNULL
+    errors = []
+
+    try:
+        for command_idx, command in enumerate(commands):
+            stderr_file = tempfile.TemporaryFile()
+            stderr_files.append(stderr_file)
+            is_last = command_idx == len(commands) - 1
+
+            process = subprocess.Popen(
+                command,
+                stdin=previous_stdout,
+                stdout=subprocess.DEVNULL if is_last else subprocess.PIPE,
+                stderr=stderr_file
+            )
+            # Only the next process keeps the pipe, so it gets SIGPIPE/EOF correctly
+            if previous_stdout is not subprocess.DEVNULL:
+                previous_stdout.close()
+            previous_stdout = process.stdout
+            processes.append(process)
+
+        deadline = time.monotonic() + timeout
+        for process in processes:
+            process.wait(timeout=max(0.0, deadline - time.monotonic()))
+
+        for command, process, stderr_file in zip(commands, processes, stderr_files):
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors="replace").strip()
+            if process.returncode != 0:
+                errors.append(f"{command[0]}: {stderr or f'код {process.returncode}'}")
+    except subprocess.TimeoutExpired:
+        errors = ["таймаут при передаче потока"]
+    finally:
+        # Also reached when a command can not be started, started ones must not be left running
+        for process in processes:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+        if previous_stdout not in (subprocess.DEVNULL, None):
+            previous_stdout.close()
+        for stderr_file in stderr_files:
+            stderr_file.close()
+
+    return errors
+
+
+def run_sharded_transfer(
+    files: list[TransferFile],
+    make_command: Callable[[str, list[str]], list[str]],
+    workers: int,
+    on_progress: Optional[Callable[[TransferProgress], None]] = None
+) -> TransferResult:
+    """
+    Transfer files by several concurrent streams.
+
+    Files are split to workers shards, every shard is copied by its own
+    sequence of commands, one command per directory batch.
+
+    Parameters
+    ----------
+    files : list[TransferFile]
+        Files to transfer
+    make_command : Callable[[str, list[str]], list[str]]
+        Makes command that copies files (relative paths) to relative directory
+    workers : int
+        Number of concurrent commands
+    on_progress : Optional[Callable[[TransferProgress], None]], optional
+        Called after every command, by default None
+
+    Returns
+    -------
+    TransferResult
+        Transferred files, size, time and errors of failed commands,
+        source and target are empty
+    """
+    shards = split_to_shards(files, workers)
+    result = TransferResult(source="", target="", files=len(files), size=sum(file.size for file in files))
+    progress = TransferProgress(0, len(files), 0, result.size, 0.0)
+    progress_lock = threading.Lock()
+    start_time = time.perf_counter()
+
+    def transfer_shard(shard: list[TransferFile]) -> list[str]:
+        errors = []
+        sizes = {file.relative_path: file.size for file in shard}
+
+        for directory, paths in group_by_directory(shard):
+            try:
+                subprocess.run(
+                    make_command(directory, paths),
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                    timeout=COMMAND_TIMEOUT
+                )
+            except subprocess.TimeoutExpired:
+                errors.append(f"{directory}: таймаут при копировании {len(paths)} файлов")
+            except subprocess.CalledProcessError as e:
+                errors.append(f"{directory}: {e.stderr.strip() if e.stderr else str(e)}")
+
+            with progress_lock:
+                progress.files_done += len(paths)
+                progress.size_done += sum(sizes[path] for path in paths)
+                progress.elapsed = time.perf_counter() - start_time
+                if on_progress is not None:
+                    on_progress(TransferProgress(**vars(progress)))
+        return errors
+
+    with ThreadPoolExecutor(max_workers=max(1, len(shards))) as executor:
+        result.errors = [error for shard_errors in executor.map(transfer_shard, shards) for error in shard_errors]
+
+    result.elapsed = time.perf_counter() - start_time
+    return result
+
 
 class DataTransfer:
-    def __init__(self, config_file: str):
+    def __init__(
+        self,
+        config_file: str,
+        control_persist: int = 600,
+        manifest_dir: str | Path = DEFAULT_MANIFEST_DIR
+    ):
+        """
+        Parameters
+        ----------
+        config_file : str
+            Path to servers configuration, e.g. configs/servers.json
+        control_persist : int, optional
+            Seconds to keep idle SSH connection to server, by default 600
+        manifest_dir : str | Path, optional
+            Directory of sync manifests, by default DEFAULT_MANIFEST_DIR
+        """
         self.config_file = config_file
         self.servers_config = self._load_config()
+        self.control_persist = control_persist
+        self.manifest_dir = Path(manifest_dir)
+
+        self._transports: dict[tuple[str, str], SshTransport] = {}
+        self._transports_lock = threading.Lock()
     
     def _load_config(self) -> Dict:
         """Load servers configurations."""
@@ -21,10 +298,70 @@ class DataTransfer:
                 return json.load(f)
         except json.JSONDecodeError as e:
             raise ValueError(f"Ошибка парсинга JSON: {e}")
+
+    def get_transport(self, server_name: str, username: str) -> SshTransport:
+        """
+        Get shared SSH connection to server, it is created on the first call.
+
+        Parameters
+        ----------
+        server_name : str
+            Server name from configs/servers.json
+        username : str
+            User on remote server
+
+        Returns
+        -------
+        SshTransport
+            Connection used by all transfers to this server and user
+        """
+        server_info = self.servers_config.get(server_name)
+        if not server_info:
+            raise ValueError(f"Сервер '{server_name}' не найден в конфигурации")
+
+        server_ip = server_info.get('ip')
+        if not server_ip:
+            raise ValueError(f"Для сервера '{server_name}' не указан IP-адрес")
+
+        with self._transports_lock:
+            key = (server_name, username)
+            if key not in self._transports:
+                self._transports[key] = SshTransport(
+                    server_ip, server_info.get('port', 22), username, control_persist=self.control_persist
+                )
+            return self._transports[key]
+
+    def close(self):
+        """Close all SSH connections."""
+        with self._transports_lock:
+            for transport in self._transports.values():
+                transport.close()
+            self._transports = {}
+
+    def __enter__(self) -> "DataTransfer":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
-    def transfer_data(self, local_path: str | Path, remote_path: str | Path, server_name: str, username: str, mode: str = "copy"):
+    def transfer_data(
+        self,
+        local_path: str | Path,
+        remote_path: str | Path,
+        server_name: str,
+        username: str,
+        mode: str = "copy",
+        workers: int = 1,
+        checksum: bool = False,
+        method: str = "scp",
+        compression: Optional[str] = None,
+        on_progress: Optional[Callable[[TransferProgress], None]] = None
+    ) -> TransferResult:
         """Copy data with scp.
         
+        All transfers to the same server and user share one SSH connection,
+        call close() or use DataTransfer as context manager to close it.
+
         Parameters
         ----------
         local_path: str
@@ -34,57 +371,417 @@ class DataTransfer:
         server_name: str
             Server name from configs/servers.json
         mode: str
-            Copy or download
+            Copy, download or sync - send only new and changed files of local directory
         username: str
             User on remote server
+        workers: int
+            Number of concurrent scp processes, 1 - one scp -r for whole tree.
+            With several workers or sync mode directory tree is placed into
+            existing remote_path (local_path for download) as scp -r does
+        checksum: bool
+            In sync mode compare content hashes of files with the same size
+            and different mtime, by default such files are sent
+        method: str
+            scp - copy file by file, tar - stream whole tree as one tar archive
+            over one SSH channel, it is faster for many small files
+        compression: Optional[str]
+            Compression of tar stream: gzip or zstd (both sides need zstd binary),
+            by default not compressed
+        on_progress: Optional[Callable[[TransferProgress], None]]
+            Called when part of files is transferred, by default None
+
+        Returns
+        -------
+        TransferResult
+            Number and size of transferred files (0 if unknown), time and errors
         """
+        if mode == 'download':
+            source, target = f"{server_name}:{remote_path}", str(local_path)
+        else:
+            source, target = str(local_path), f"{server_name}:{remote_path}"
+
         try:
             if not Path(local_path).exists():
                 raise FileNotFoundError(f"Локальный путь не существует: {local_path}")
-            
-            server_info = self.servers_config.get(server_name)
-            if not server_info:
-                raise ValueError(f"Сервер '{server_name}' не найден в конфигурации")
-            
-            server_ip = server_info.get('ip')
-            server_port = server_info.get('port', 22)
-            
-            if not server_ip:
-                raise ValueError(f"Для сервера '{server_name}' не указан IP-адрес")
-
-            if mode == 'copy':
-                scp_command = [
-                    'scp',
-                    '-r',
-                    '-P', str(server_port),
-                    local_path,
-                    f"{username}@{server_ip}:{remote_path}"
-                ]
-            elif mode == 'download':
-                scp_command = [
-                    'scp',
-                    '-r',
-                    '-P', str(server_port),
-                    f"{username}@{server_ip}:{remote_path}",
-                    local_path
-                ]
-            
-            print(f"Копирование {local_path} -> {server_name}:{remote_path}")
-            result = subprocess.run(
-                scp_command, 
-                check=True, 
-                capture_output=True, 
-                text=True,
-                timeout=300000
-            )
-            
-            print("✓ Копирование завершено успешно")
-            if result.stdout:
-                print(f"Output: {result.stdout}")
-            
+            if mode not in ('copy', 'download', 'sync'):
+                raise ValueError(f"Неизвестный режим: {mode}")
+
+            transport = self.get_transport(server_name, username)
+            transport.connect()
+
+            if mode == 'sync':
+                result = self._sync(local_path, remote_path, transport, max(1, workers), checksum, on_progress)
+            elif method != 'tar' and workers > 1 and (mode == 'download' or Path(local_path).is_dir()):
+                result = self._transfer_sharded(local_path, remote_path, transport, mode, workers, on_progress)
+            else:
+                if method == 'tar':
+                    result = self._transfer_tar_stream(local_path, remote_path, transport, mode, compression)
+                else:
+                    result = self._transfer_recursive(local_path, remote_path, transport, mode)
+
+                # One command copies everything, so progress is known only at the end
+                if on_progress is not None and result.ok:
+                    on_progress(TransferProgress(result.files, result.files, result.size, result.size, result.elapsed))
+
         except subprocess.TimeoutExpired:
-            print("✗ Таймаут при выполнении SCP команды")
+            result = TransferResult(source, target, errors=["Таймаут при выполнении SCP команды"])
         except subprocess.CalledProcessError as e:
-            print(f"✗ Ошибка SCP: {e.stderr if e.stderr else str(e)}")
+            result = TransferResult(source, target, errors=[f"Ошибка SCP: {e.stderr if e.stderr else str(e)}"])
         except Exception as e:
-            print(f"✗ Произошла ошибка: {e}")
+            result = TransferResult(source, target, errors=[f"Произошла ошибка: {e}"])
+
+        result.source, result.target = source, target
+        if result.ok:
+            print(
+                f"✓ Копирование завершено успешно: {result.files} файлов, {result.size / 1024 ** 2:.1f} MB "
+                f"за {result.elapsed:.1f}s ({result.throughput:.1f} MB/s)"
+            )
+        else:
+            for error in result.errors:
+                print(f"✗ {error}")
+        return result
+
+    def _transfer_recursive(
+        self,
+        local_path: str | Path,
+        remote_path: str | Path,
+        transport: SshTransport,
+        mode: str
+    ) -> TransferResult:
+        """Copy file or directory tree by one scp -r."""
+        if mode == 'copy':
+            local_source = Path(local_path)
+            if local_source.is_file():
+                files = [TransferFile(local_source.name, local_source.stat().st_size)]
+            else:
+                files = list_local_files(local_source)
+            scp_command = transport.scp_command([str(local_path)], transport.remote_path(str(remote_path)), recursive=True)
+        else:
+            files = self._list_remote_files(transport, PurePosixPath(str(remote_path)))
+            scp_command = transport.scp_command([transport.remote_path(str(remote_path))], str(local_path), recursive=True)
+
+        print(f"Копирование {local_path} -> {transport.remote}:{remote_path}" if mode == 'copy'
+              else f"Копирование {transport.remote}:{remote_path} -> {local_path}")
+
+        start_time = time.perf_counter()
+        subprocess.run(scp_command, check=True, capture_output=True, text=True, timeout=COMMAND_TIMEOUT)
+
+        return TransferResult(
+            "", "",
+            files=len(files),
+            size=sum(file.size for file in files),
+            elapsed=time.perf_counter() - start_time
+        )
+
+    def _transfer_sharded(
+        self,
+        local_path: str | Path,
+        remote_path: str | Path,
+        transport: SshTransport,
+        mode: str,
+        workers: int,
+        on_progress: Optional[Callable[[TransferProgress], None]] = None
+    ) -> TransferResult:
+        """Copy directory tree by several scp processes, each copies its shard of files."""
+        if mode == 'copy':
+            local_root = Path(local_path)
+            remote_root = PurePosixPath(str(remote_path)) / local_root.name
+            files = list_local_files(local_root)
+
+            self._make_remote_dirs(transport, remote_root, files)
+            make_command = self._upload_command_factory(transport, local_root, remote_root)
+
+            print(f"Копирование {local_path} -> {transport.remote}:{remote_root} ({workers} потоков)")
+        else:
+            remote_root = PurePosixPath(str(remote_path))
+            remote_kind = self._get_remote_kind(transport, remote_root)
+            if remote_kind == "file":
+                # Single file is not split, it is copied by one scp
+                return self._transfer_recursive(local_path, remote_path, transport, mode)
+            if remote_kind != "dir":
+                raise FileNotFoundError(f"Удаленный путь не существует: {transport.remote}:{remote_root}")
+
+            local_root = Path(local_path) / remote_root.name
+            files = self._list_remote_files(transport, remote_root)
+
+            for file in files:
+                (local_root / file.relative_path).parent.mkdir(parents=True, exist_ok=True)
+
+            def make_command(directory: str, paths: list[str]) -> list[str]:
+                return transport.scp_command(
+                    [transport.remote_path((remote_root / path).as_posix()) for path in paths],
+                    str(local_root / directory)
+                )
+
+            print(f"Копирование {transport.remote}:{remote_root} -> {local_root} ({workers} потоков)")
+
+        return run_sharded_transfer(files, make_command, workers, on_progress)
+
+    def _transfer_tar_stream(
+        self,
+        local_path: str | Path,
+        remote_path: str | Path,
+        transport: SshTransport,
+        mode: str,
+        compression: Optional[str]
+    ) -> TransferResult:
+        """
+        Copy file or directory as one tar stream: tar | compress | ssh "decompress | tar -x".
+
+        Result is placed into existing remote_path (local_path for download) as scp -r does.
+        """
+        if compression is not None and compression not in COMPRESSORS:
+            raise ValueError(f"Неизвестное сжатие: {compression}, доступны {list(COMPRESSORS)}")
+        if compression is not None and shutil.which(COMPRESSORS[compression][0][0]) is None:
+            print(f"⚠ {compression} не найден, поток передается без сжатия")
+            compression = None
+
+        compress_command, decompress_command = COMPRESSORS[compression] if compression else (None, None)
+
+        if mode == 'copy':
+            local_source = Path(local_path)
+            remote_root = PurePosixPath(str(remote_path))
+            if local_source.is_file():
+                files = [TransferFile(local_source.name, local_source.stat().st_size)]
+            else:
+                files = list_local_files(local_source)
+
+            remote_command = f"mkdir -p {shlex.quote(remote_root.as_posix())} && "
+            if decompress_command:
+                remote_command += f"{decompress_command} | "
+            remote_command += f"tar -xf - -C {shlex.quote(remote_root.as_posix())}"
+
+            commands = [
+                ['tar', '-cf', '-', '-C', str(local_source.parent), local_source.name],
+                *([compress_command] if compress_command else []),
+                transport.ssh_command(remote_command)
+            ]
+            print(f"Копирование {local_path} -> {transport.remote}:{remote_root} (tar, сжатие: {compression or 'нет'})")
+        else:
+            remote_source = PurePosixPath(str(remote_path))
+            files = self._list_remote_files(transport, remote_source)
+
+            remote_command = (
+                f"tar -cf - -C {shlex.quote(remote_source.parent.as_posix())} {shlex.quote(remote_source.name)}"
+            )
+            if compress_command:
+                remote_command += " | " + " ".join(shlex.quote(part) for part in compress_command)
+
+            commands = [
+                transport.ssh_command(remote_command),
+                *([shlex.split(decompress_command)] if decompress_command else []),
+                ['tar', '-xf', '-', '-C', str(local_path)]
+            ]
+            print(f"Копирование {transport.remote}:{remote_source} -> {local_path} (tar, сжатие: {compression or 'нет'})")
+
+        start_time = time.perf_counter()
+        errors = run_pipeline(commands)
+
+        return TransferResult(
+            "", "",
+            files=len(files),
+            size=sum(file.size for file in files),
+            elapsed=time.perf_counter() - start_time,
+            errors=[f"Ошибка передачи: {error}" for error in errors]
+        )
+
+    def _sync(
+        self,
+        local_path: str | Path,
+        remote_path: str | Path,
+        transport: SshTransport,
+        workers: int,
+        checksum: bool,
+        on_progress: Optional[Callable[[TransferProgress], None]] = None
+    ) -> TransferResult:
+        """
+        Send only new and changed files of local tree.
+
+        Remote tree is listed by one find call, file is sent if it is missing
+        on server or its size or mtime differ. Files are sent with scp -p, so
+        mtime of sent files is the same on both sides. If checksum is set,
+        files of the same size with different mtime are compared by SHA-1,
+        hashes are kept in manifest and calculated again only for changed files.
+        Files removed from local tree are not removed on server.
+        """
+        local_root = Path(local_path)
+        if not local_root.is_dir():
+            raise ValueError(f"Синхронизировать можно только директорию: {local_path}")
+
+        remote_root = PurePosixPath(str(remote_path)) / local_root.name
+        target = f"{transport.remote}:{transport.port}:{remote_root}"
+        manifest_path = self._get_manifest_path(local_root, target)
+        manifest = self._load_manifest(manifest_path, target)
+
+        local_files = list_local_files(local_root)
+        remote_files = {file.relative_path: file for file in self._list_remote_files(transport, remote_root)}
+
+        changed_files = []
+        hash_candidates = []
+        for file in local_files:
+            remote_file = remote_files.get(file.relative_path)
+            if remote_file is None or remote_file.size != file.size:
+                changed_files.append(file)
+            elif remote_file.mtime != file.mtime:
+                (hash_candidates if checksum else changed_files).append(file)
+
+        if hash_candidates:
+            remote_hashes = self._get_remote_hashes(
+                transport, remote_root,
+                [remote_files[file.relative_path] for file in hash_candidates],
+                manifest["remote"]
+            )
+            for file in hash_candidates:
+                local_hash = self._get_cached_hash(manifest["local"], file, lambda: file_hash(local_root / file.relative_path))
+                if local_hash != remote_hashes.get(file.relative_path):
+                    changed_files.append(file)
+
+        print(
+            f"Синхронизация {local_path} -> {transport.remote}:{remote_root}: "
+            f"изменено {len(changed_files)} из {len(local_files)} файлов"
+        )
+
+        result = TransferResult("", "")
+        if changed_files:
+            self._make_remote_dirs(transport, remote_root, changed_files)
+            make_command = self._upload_command_factory(transport, local_root, remote_root, preserve_times=True)
+            result = run_sharded_transfer(changed_files, make_command, workers, on_progress)
+
+        # Manifest of local tree: size, mtime and hash if it was calculated for this version of file
+        local_manifest = {}
+        for file in local_files:
+            entry = manifest["local"].get(file.relative_path)
+            is_same_version = entry is not None and entry[:2] == [file.size, file.mtime]
+            local_manifest[file.relative_path] = [file.size, file.mtime, entry[2] if is_same_version else None]
+        manifest["local"] = local_manifest
+
+        if result.ok:
+            for file in changed_files:
+                manifest["remote"][file.relative_path] = local_manifest[file.relative_path]
+        self._save_manifest(manifest_path, manifest)
+
+        return result
+
+    @staticmethod
+    def _upload_command_factory(
+        transport: SshTransport,
+        local_root: Path,
+        remote_root: PurePosixPath,
+        preserve_times: bool = False
+    ) -> Callable[[str, list[str]], list[str]]:
+        """Make function that builds scp command for files of one directory."""
+        def make_command(directory: str, paths: list[str]) -> list[str]:
+            return transport.scp_command(
+                [str(local_root / path) for path in paths],
+                transport.remote_path(f"{(remote_root / directory).as_posix()}/"),
+                preserve_times=preserve_times
+            )
+
+        return make_command
+
+    @staticmethod
+    def _make_remote_dirs(transport: SshTransport, remote_root: PurePosixPath, files: list[TransferFile]):
+        """Create remote root and parent directories of files."""
+        directories = {remote_root.as_posix()}
+        directories.update((remote_root / PurePosixPath(file.relative_path).parent).as_posix() for file in files)
+        directories = sorted(directories)
+
+        for start in range(0, len(directories), MAX_FILES_PER_COMMAND):
+            transport.run(
+                "mkdir -p " + " ".join(shlex.quote(directory) for directory in directories[start:start + MAX_FILES_PER_COMMAND])
+            )
+
+    @staticmethod
+    def _get_remote_kind(transport: SshTransport, remote_root: PurePosixPath) -> str:
+        """Get "dir" or "file" for existing remote path, empty string if it does not exist."""
+        quoted_root = shlex.quote(remote_root.as_posix())
+        return transport.run(
+            f"if [ -d {quoted_root} ]; then echo dir; elif [ -e {quoted_root} ]; then echo file; fi"
+        ).strip()
+
+    @staticmethod
+    def _list_remote_files(transport: SshTransport, remote_root: PurePosixPath) -> list[TransferFile]:
+        """List files of remote tree with paths relative to remote_root, empty if there is no such directory."""
+        quoted_root = shlex.quote(remote_root.as_posix())
+        output = transport.run(
+            f"if [ -d {quoted_root} ]; then find {quoted_root} -type f -printf '%s\\t%T@\\t%P\\n'; fi"
+        )
+
+        files = []
+        for line in output.splitlines():
+            size, mtime, relative_path = (line.split("\t", 2) + ["", ""])[:3]
+            if relative_path:
+                files.append(TransferFile(relative_path, int(size), int(float(mtime))))
+        return sorted(files, key=lambda file: file.relative_path)
+
+    @staticmethod
+    def _get_remote_hashes(
+        transport: SshTransport,
+        remote_root: PurePosixPath,
+        files: list[TransferFile],
+        cache: dict
+    ) -> dict[str, str]:
+        """Get SHA-1 of remote files by sha1sum, hashes of files not changed since last run are taken from cache."""
+        hashes = {}
+        missing_files = []
+        for file in files:
+            entry = cache.get(file.relative_path)
+            if entry is not None and entry[:2] == [file.size, file.mtime] and entry[2]:
+                hashes[file.relative_path] = entry[2]
+            else:
+                missing_files.append(file)
+
+        for start in range(0, len(missing_files), MAX_FILES_PER_COMMAND):
+            batch = missing_files[start:start + MAX_FILES_PER_COMMAND]
+            output = transport.run(
+                f"cd {shlex.quote(remote_root.as_posix())} && sha1sum -- "
+                + " ".join(shlex.quote(file.relative_path) for file in batch)
+            )
+            batch_hashes = {
+                relative_path: hash_value
+                for hash_value, _, relative_path in (line.partition("  ") for line in output.splitlines())
+            }
+            for file in batch:
+                if file.relative_path in batch_hashes:
+                    hashes[file.relative_path] = batch_hashes[file.relative_path]
+                    cache[file.relative_path] = [file.size, file.mtime, batch_hashes[file.relative_path]]
+
+        return hashes
+
+    @staticmethod
+    def _get_cached_hash(cache: dict, file: TransferFile, calculate: Callable[[], str]) -> str:
+        """Get hash of file from cache if its size and mtime are the same, otherwise calculate and cache it."""
+        entry = cache.get(file.relative_path)
+        if entry is not None and entry[:2] == [file.size, file.mtime] and entry[2]:
+            return entry[2]
+
+        value = calculate()
+        cache[file.relative_path] = [file.size, file.mtime, value]
+        return value
+
+    def _get_manifest_path(self, local_root: Path, target: str) -> Path:
+        """Path of manifest in manifest_dir, name is hash of local tree and target."""
+        raw_key = f"{local_root.resolve()}|{target}"
+        return self.manifest_dir / f"{hashlib.sha1(raw_key.encode('utf-8')).hexdigest()}.json"
+
+    @staticmethod
+    def _load_manifest(manifest_path: Path, target: str) -> dict:
+        """Load manifest of the last sync to the same target, empty one otherwise."""
+        empty_manifest = {"target": target, "local": {}, "remote": {}}
+        if not manifest_path.exists():
+            return empty_manifest
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as file:
+                manifest = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            print("⚠ Манифест синхронизации поврежден, создается заново")
+            return empty_manifest
+        return manifest if manifest.get("target") == target else empty_manifest
+
+    @staticmethod
+    def _save_manifest(manifest_path: Path, manifest: dict):
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(manifest, file)
+        tmp_path.replace(manifest_path)
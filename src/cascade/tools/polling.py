@@ -0,0 +1,91 @@
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Generic, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class BackoffPolicy:
+    """Exponential backoff settings for status polling."""
+
+    initial_interval: float = 0.5
+    max_interval: float = 15.0
+    multiplier: float = 2.0
+    jitter: float = 0.1
+    max_wait: float = 300.0
+
+    def intervals(self) -> Iterator[float]:
+        """
+        Generate sleep intervals between attempts.
+
+        Yields
+        ------
+        float
+            Next interval in seconds, grown exponentially up to max_interval
+            and spread by +-jitter share of its value
+        """
+        interval = self.initial_interval
+
+        while True:
+            spread = interval * self.jitter
+            yield max(0.0, interval + random.uniform(-spread, spread))
+            interval = min(interval * self.multiplier, self.max_interval)
+
+
+@dataclass
+class PollResult(Generic[T]):
+    """Result of polling."""
+
+    done: bool
+    value: Optional[T] = None
+    attempts: int = 0
+    elapsed: float = 0.0
+
+
+def poll_until(
+    check: Callable[[], Optional[T]],
+    policy: BackoffPolicy,
+    on_attempt: Optional[Callable[[int, float, Optional[T]], None]] = None,
+) -> PollResult[T]:
+    """
+    Call check with growing pauses until it returns a value or time is over.
+
+    Parameters
+    ----------
+    check : Callable[[], Optional[T]]
+        Function that returns None while the target is not ready
+        and any other value (result or error) to stop polling
+    policy : BackoffPolicy
+        Intervals and global deadline
+    on_attempt : Optional[Callable[[int, float, Optional[T]], None]], optional
+        Called after every attempt with attempt number, elapsed seconds
+        and check value, by default None
+
+    Returns
+    -------
+    PollResult[T]
+        done is False if deadline was reached
+    """
+    start_time = time.monotonic()
+    attempt = 0
+
+    for interval in policy.intervals():
+        remaining = policy.max_wait - (time.monotonic() - start_time)
+        if remaining <= 0:
+            break
+
+        time.sleep(min(interval, remaining))
+        attempt += 1
+
+        value = check()
+        elapsed = time.monotonic() - start_time
+
+        if on_attempt is not None:
+            on_attempt(attempt, elapsed, value)
+
+        if value is not None:
+            return PollResult(done=True, value=value, attempts=attempt, elapsed=elapsed)
+
+    return PollResult(done=False, attempts=attempt, elapsed=time.monotonic() - start_time)
@@ -0,0 +1,185 @@
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+IMAGE_SUFFIX = ".jpg"
+LABEL_SUFFIX = ".txt"
+
+
+@dataclass
+class LabelDirectory:
+    path: Path
+    images: list[Path]
+    labels: list[Path]
+
+
+class ShareIndex:
+    def __init__(self, index_path: str | Path):
+        """
+        Persistent index of task directories on share.
+
+        For every task directory index keeps its deepest directory (the one
+        with labels) and sorted lists of image and label files in it. Entry
+        stores mtime of every directory of the tree, so adding, removing or
+        renaming of files or directories gives a miss. Checking entry takes
+        one stat per directory instead of listing the whole tree.
+        Changed index is written by save() or on exit from context manager.
+
+        Parameters
+        ----------
+        index_path : str | Path
+            JSON file of index, created if it does not exist
+        """
+        self.index_path = Path(index_path)
+
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+        self._is_changed = False
+        self.hits = 0
+        self.misses = 0
+
+    def get_label_directory(self, task_path: str | Path) -> LabelDirectory:
+        """
+        Find directory with labels of task and its files.
+
+        Directory is chosen as get_valid_path_to_labels does: the deepest
+        directory without subdirectories, the first one if there are several.
+
+        Parameters
+        ----------
+        task_path : str | Path
+            Task directory on share
+
+        Returns
+        -------
+        LabelDirectory
+            Directory with labels and sorted lists of its .jpg and .txt files
+
+        Raises
+        ------
+        ValueError
+            If task_path does not exist or is not a directory
+        """
+        task_path = Path(task_path)
+        key = str(task_path)
+
+        with self._lock:
+            entry = self._index.get(key)
+
+        if entry is not None and self._is_fresh(entry):
+            with self._lock:
+                self.hits += 1
+            return self._to_label_directory(entry)
+
+        if not task_path.is_dir():
+            raise ValueError(f"Path '{task_path}' does not exist or is not a directory")
+
+        entry, is_complete = self._scan(task_path)
+        with self._lock:
+            self.misses += 1
+            # Tree with unreadable directories is not indexed, it is walked again next time
+            if is_complete:
+                self._index[key] = entry
+                self._is_changed = True
+            elif self._index.pop(key, None) is not None:
+                self._is_changed = True
+
+        return self._to_label_directory(entry)
+
+    @staticmethod
+    def _to_label_directory(entry: dict) -> LabelDirectory:
+        label_dir = Path(entry["label_dir"])
+        return LabelDirectory(
+            label_dir,
+            [label_dir / name for name in entry["images"]],
+            [label_dir / name for name in entry["labels"]]
+        )
+
+    @staticmethod
+    def _is_fresh(entry: dict) -> bool:
+        """Check that no directory of entry was changed."""
+        for directory, mtime_ns in entry["directories"].items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    @staticmethod
+    def _scan(task_path: Path) -> tuple[dict, bool]:
+        """
+        Walk task tree once like _find_deepest_directory of salary_count.
+
+        Unreadable directories are skipped, in this case the second
+        returned value is False.
+        """
+        directories = {}
+        deepest_dir, deepest_depth = task_path, len(task_path.parts)
+        deepest_names = None
+
+        def walk(path: Path) -> bool:
+            nonlocal deepest_dir, deepest_depth, deepest_names
+            try:
+                directories[str(path)] = os.stat(path).st_mtime_ns
+                with os.scandir(path) as entries:
+                    entries = list(entries)
+                subdirs = [Path(entry.path) for entry in entries if entry.is_dir()]
+            except PermissionError:
+                return False
+
+            if not subdirs:
+                depth = len(path.parts)
+                if depth > deepest_depth:
+                    deepest_dir, deepest_depth = path, depth
+                    deepest_names = [entry.name for entry in entries]
+                return True
+
+            return all([walk(subdir) for subdir in subdirs])
+
+        is_complete = walk(task_path)
+
+        if deepest_names is None:
+            # No directory is deeper than task directory
+            try:
+                deepest_names = os.listdir(deepest_dir)
+            except PermissionError:
+                deepest_names, is_complete = [], False
+
+        entry = {
+            "directories": directories,
+            "label_dir": str(deepest_dir),
+            "images": sorted(name for name in deepest_names if name.endswith(IMAGE_SUFFIX)),
+            "labels": sorted(name for name in deepest_names if name.endswith(LABEL_SUFFIX)),
+        }
+        return entry, is_complete
+
+    def save(self):
+        """Write index if it was changed."""
+        with self._lock:
+            if not self._is_changed:
+                return
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(self._index, file)
+            tmp_path.replace(self.index_path)
+            self._is_changed = False
+
+    def _load_index(self) -> dict:
+        if not self.index_path.exists():
+            return {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, json.JSONDecodeError):
+            print("⚠ Share index is broken, starting with empty index")
+            return {}
+
+    def __enter__(self) -> "ShareIndex":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.save()
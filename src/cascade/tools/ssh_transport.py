@@ -0,0 +1,155 @@
+import shutil
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+
+# Timeout of one command in seconds
+COMMAND_TIMEOUT = 300000
+
+
+class SshTransport:
+    def __init__(self, host: str, port: int, username: str, control_persist: int = 600):
+        """
+        SSH connection to one server shared by all ssh and scp commands.
+
+        Commands use OpenSSH ControlMaster multiplexing: the first command
+        opens master connection, next ones go through its socket without
+        new handshake. Master stays alive control_persist seconds after
+        the last command or until close().
+
+        Parameters
+        ----------
+        host : str
+            Server address
+        port : int
+            SSH port
+        username : str
+            User on server
+        control_persist : int, optional
+            Seconds to keep idle master connection, by default 600
+        """
+        self.host = host
+        self.port = port
+        self.username = username
+        self.control_persist = control_persist
+
+        # Unix socket path is limited to ~100 chars, so short temporary directory is used
+        self._control_dir = Path(tempfile.mkdtemp(prefix="ssh-"))
+        self._lock = threading.Lock()
+        self._is_connected = False
+
+    @property
+    def remote(self) -> str:
+        return f"{self.username}@{self.host}"
+
+    @property
+    def control_options(self) -> list[str]:
+        return [
+            '-o', 'ControlMaster=auto',
+            '-o', f'ControlPath={self._control_dir}/%C',
+            '-o', f'ControlPersist={self.control_persist}',
+        ]
+
+    def remote_path(self, path: str) -> str:
+        """Path on server in scp notation."""
+        return f"{self.remote}:{path}"
+
+    def ssh_command(self, command: str) -> list[str]:
+        """Make ssh command that runs shell command on server."""
+        return ['ssh', *self.control_options, '-p', str(self.port), self.remote, command]
+
+    def scp_command(
+        self,
+        sources: list[str],
+        target: str,
+        recursive: bool = False,
+        preserve_times: bool = False
+    ) -> list[str]:
+        """
+        Make scp command through shared connection.
+
+        Parameters
+        ----------
+        sources : list[str]
+            Local paths or remote paths made by remote_path
+        target : str
+            Local path or remote path made by remote_path
+        recursive : bool, optional
+            Copy directories, by default False
+        preserve_times : bool, optional
+            Keep modification times, by default False
+        """
+        return [
+            'scp',
+            *self.control_options,
+            *(['-r'] if recursive else []),
+            *(['-p'] if preserve_times else []),
+            '-P', str(self.port),
+            *sources,
+            target
+        ]
+
+    def control_command(self, operation: str) -> list[str]:
+        """Make ssh -O command for master connection, e.g. check or exit."""
+        return ['ssh', '-o', f'ControlPath={self._control_dir}/%C', '-p', str(self.port), '-O', operation, self.remote]
+
+    def connect(self):
+        """
+        Open master connection if it is not opened or is not alive.
+
+        Called before concurrent commands, otherwise each of them could
+        open its own connection. Master exits after control_persist idle
+        seconds or on network failure, so opened master is checked by
+        ssh -O check, which does not go to server.
+
+        Raises
+        ------
+        subprocess.CalledProcessError
+            If server is not reachable or authentication fails
+        """
+        with self._lock:
+            if self._is_connected:
+                check = subprocess.run(self.control_command("check"), capture_output=True, timeout=60)
+                self._is_connected = check.returncode == 0
+            if not self._is_connected:
+                subprocess.run(self.ssh_command("true"), check=True, capture_output=True, text=True, timeout=60)
+                self._is_connected = True
+
+    def run(self, command: str) -> str:
+        """
+        Run shell command on server.
+
+        Returns
+        -------
+        str
+            Standard output of command
+
+        Raises
+        ------
+        subprocess.CalledProcessError
+            If command fails
+        """
+        self.connect()
+        result = subprocess.run(
+            self.ssh_command(command),
+            check=True,
+            capture_output=True,
+            text=True,
+            timeout=COMMAND_TIMEOUT
+        )
+        return result.stdout
+
+    def close(self):
+        """Close master connection and remove its socket directory."""
+        with self._lock:
+            if self._is_connected:
+                subprocess.run(self.control_command("exit"), capture_output=True, timeout=60)
+                self._is_connected = False
+            shutil.rmtree(self._control_dir, ignore_errors=True)
+
+    def __enter__(self) -> "SshTransport":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
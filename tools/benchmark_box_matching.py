@@ -0,0 +1,148 @@
+"""Benchmark box matchers on frames of growing box density."""
+
+import random
+import time
+
+from jsonargparse import CLI
+
+from salary_for_annotation import GREEDY_MATCHERS, MATCHERS
+from yolo_labels import FrameBoxes
+
+
+def _format_box(obj_class: int, x_center: float, y_center: float, width: float, height: float) -> str:
+    return f"{obj_class} {x_center:.6f} {y_center:.6f} {width:.6f} {height:.6f}\n"
+
+
+def make_frame(rng: random.Random, boxes_count: int, layout: str) -> tuple[list[str], list[str]]:
+    """
+    Make initial and final labels of one frame.
+
+    Parameters
+    ----------
+    rng: random.Random
+        Random generator
+    boxes_count: int
+        Number of initial boxes
+    layout: str
+        "scattered" - boxes all over the frame,
+        "rows" - boxes of similar size in few horizontal rows (bricks, windows, scaffolding),
+        "crowded_row" - one row where boxes on the right are kept and the same number
+        of new boxes is added on the left, worst case of reference matcher
+
+    Returns
+    -------
+    tuple[list[str], list[str]]
+        Initial and final label lines
+    """
+
+    size = min(0.2, 0.5 / boxes_count ** 0.5)
+    rows = [rng.uniform(0.1, 0.9) for _ in range(3)]
+
+    def random_box() -> list[float]:
+        if layout == "rows":
+            return [
+                rng.randint(0, 3),
+                rng.uniform(0.02, 0.98),
+                rng.choice(rows) + rng.uniform(-0.01, 0.01) * size,
+                size * rng.uniform(0.97, 1.03),
+                size * rng.uniform(0.97, 1.03),
+            ]
+        return [
+            rng.randint(0, 3),
+            rng.uniform(0.02, 0.98),
+            rng.uniform(0.02, 0.98),
+            size * rng.uniform(0.5, 1.5),
+            size * rng.uniform(0.5, 1.5),
+        ]
+
+    if layout == "crowded_row":
+        row = rng.uniform(0.1, 0.9)
+        initial_boxes = [[0, rng.uniform(0.5, 0.98), row, size, size] for _ in range(boxes_count)]
+        final_boxes = [box[:] for box in initial_boxes]
+        final_boxes.extend([0, rng.uniform(0.02, 0.48), row, size, size] for _ in range(boxes_count))
+
+        return [_format_box(*box) for box in initial_boxes], [_format_box(*box) for box in final_boxes]
+
+    initial_boxes = [random_box() for _ in range(boxes_count)]
+    final_boxes = []
+    for box in initial_boxes:
+        edit = rng.random()
+        if edit < 0.6:
+            final_boxes.append(box[:])
+        elif edit < 0.8:
+            final_boxes.append(box[:3] + [value * (1 + rng.uniform(-0.3, 0.3)) for value in box[3:]])
+    final_boxes.extend(random_box() for _ in range(boxes_count // 5))
+
+    return [_format_box(*box) for box in initial_boxes], [_format_box(*box) for box in final_boxes]
+
+
+def main(
+    densities: list[int] | None = None,
+    layouts: list[str] | None = None,
+    frames: int = 20,
+    seed: int = 0,
+    box_change_low_threshold: float = 0.1,
+    box_change_high_threshold: float = 0.7,
+):
+    """
+    Print time per frame of every matcher for growing number of boxes.
+
+    Results of greedy matchers are compared with the reference loop,
+    optimal matcher gives other counts by design and is only timed.
+
+    Parameters
+    ----------
+    densities: list[int] | None
+        Numbers of boxes per frame, by default 50, 100, 200, 400, 800
+    layouts: list[str] | None
+        Layouts of boxes, by default scattered, rows and crowded_row
+    frames: int
+        Frames per density
+    seed: int
+        Random seed
+    box_change_low_threshold: float
+        If change is lower than this threshold, box counted as unchanged
+    box_change_high_threshold: float
+        If change is higher than this threshold, box counted as deleted
+    """
+
+    densities = densities or [50, 100, 200, 400, 800]
+    layouts = layouts or ["scattered", "rows", "crowded_row"]
+
+    is_ok = True
+    for layout in layouts:
+        print(f"Layout: {layout}")
+        print("boxes " + " ".join(f"{name:>12}" for name in MATCHERS) + "  speedup of grid")
+
+        for boxes_count in densities:
+            rng = random.Random(seed)
+            frames_boxes = [
+                tuple(FrameBoxes.from_lines(lines) for lines in make_frame(rng, boxes_count, layout))
+                for _ in range(frames)
+            ]
+
+            timings = {}
+            results = {}
+            for name, match_frames in MATCHERS.items():
+                start_time = time.perf_counter()
+                results[name] = [
+                    match_frames(initial_boxes, final_boxes, box_change_low_threshold, box_change_high_threshold)
+                    for initial_boxes, final_boxes in frames_boxes
+                ]
+                timings[name] = (time.perf_counter() - start_time) / frames * 1000
+
+            is_same = all(results[name] == results["loop"] for name in GREEDY_MATCHERS)
+            is_ok = is_ok and is_same
+            print(
+                f"{boxes_count:>5} "
+                + " ".join(f"{timings[name]:>10.2f}ms" for name in MATCHERS)
+                + f"  x{timings['loop'] / timings['grid']:.1f}"
+                + ("" if is_same else "  ❌ results differ")
+            )
+
+    if not is_ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    CLI(main, as_positional=False)
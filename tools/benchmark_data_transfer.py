@@ -0,0 +1,201 @@
+"""Benchmark per-file scp and tar stream transfers on datasets of different file mixes."""
+
+import contextlib
+import io
+import random
+import shlex
+import tempfile
+import time
+from pathlib import Path
+
+from jsonargparse import CLI
+
+from src.cascade.tools.data_transfer import COMPRESSORS, DataTransfer, list_local_files, run_pipeline, run_sharded_transfer
+
+# Mix name: (number of label files, number of image files)
+MIXES = {
+    "labels": (5000, 0),
+    "images": (0, 200),
+    "mixed": (2000, 100),
+}
+METHODS = ["scp", "scp_x4", "tar", "tar_gzip", "tar_zstd"]
+
+
+def make_dataset(root: Path, labels_count: int, images_count: int, seed: int) -> Path:
+    """
+    Write YOLO-like dataset: small text labels and incompressible images of 100-500 KB.
+
+    Parameters
+    ----------
+    root: Path
+        Directory for dataset
+    labels_count: int
+        Number of label files
+    images_count: int
+        Number of image files
+    seed: int
+        Random seed
+
+    Returns
+    -------
+    Path
+        Root of dataset
+    """
+
+    rng = random.Random(seed)
+    dataset_root = root / "dataset"
+    (dataset_root / "labels").mkdir(parents=True, exist_ok=True)
+    (dataset_root / "images").mkdir(parents=True, exist_ok=True)
+
+    for file_num in range(labels_count):
+        lines = [
+            f"{rng.randint(0, 3)} {rng.random():.6f} {rng.random():.6f} {rng.random() / 5:.6f} {rng.random() / 5:.6f}\n"
+            for _ in range(rng.randint(1, 10))
+        ]
+        (dataset_root / "labels" / f"frame_{file_num:06d}.txt").write_text("".join(lines))
+
+    for file_num in range(images_count):
+        (dataset_root / "images" / f"frame_{file_num:06d}.jpg").write_bytes(rng.randbytes(rng.randint(100, 500) * 1024))
+
+    return dataset_root
+
+
+def run_local_stand_in(source_root: Path, target_root: Path, method: str, latency: float, file_latency: float):
+    """
+    Copy dataset locally, network is replaced by delays.
+
+    Per-file methods wait latency per command and file_latency per file,
+    tar stream waits latency once, compression is real.
+    """
+
+    if method.startswith("scp"):
+        def make_command(directory: str, paths: list[str]) -> list[str]:
+            target_dir = shlex.quote(str(target_root / directory))
+            sources = " ".join(shlex.quote(str(source_root / path)) for path in paths)
+            delay = latency + file_latency * len(paths)
+            return ["sh", "-c", f"sleep {delay:.4f}; mkdir -p {target_dir} && cp {sources} {target_dir}/"]
+
+        workers = 4 if method == "scp_x4" else 1
+        errors = run_sharded_transfer(list_local_files(source_root), make_command, workers).errors
+    else:
+        compression = method.partition("_")[2] or None
+        compress_command, decompress_command = COMPRESSORS[compression] if compression else (None, None)
+        target_dir = shlex.quote(str(target_root))
+
+        receive_command = f"sleep {latency}; mkdir -p {target_dir} && "
+        if decompress_command:
+            receive_command += f"{decompress_command} | "
+        receive_command += f"tar -xf - -C {target_dir}"
+
+        errors = run_pipeline([
+            ["tar", "-cf", "-", "-C", str(source_root.parent), source_root.name],
+            *([compress_command] if compress_command else []),
+            ["sh", "-c", receive_command],
+        ])
+
+    if errors:
+        raise RuntimeError(f"{method}: {errors[:3]}")
+
+
+def run_server(
+    data_transfer: DataTransfer,
+    source_root: Path,
+    server_name: str,
+    username: str,
+    remote_dir: str,
+    method: str
+):
+    """Copy dataset to server by DataTransfer."""
+
+    if method.startswith("scp"):
+        workers = 4 if method == "scp_x4" else 1
+        result = data_transfer.transfer_data(source_root, remote_dir, server_name, username, "copy", workers)
+    else:
+        compression = method.partition("_")[2] or None
+        result = data_transfer.transfer_data(
+            source_root, remote_dir, server_name, username, "copy", method="tar", compression=compression
+        )
+
+    if not result.ok:
+        raise RuntimeError(f"{method}: {result.errors[:3]}")
+
+
+def main(
+    mixes: list[str] | None = None,
+    methods: list[str] | None = None,
+    seed: int = 0,
+    latency: float = 0.05,
+    file_latency: float = 0.002,
+    server_conf: str = "configs/servers.json",
+    server_name: str | None = None,
+    username: str | None = None,
+    remote_path: str | None = None,
+):
+    """
+    Print transfer time of every method for every mix of files.
+
+    Without server_name transfers are local, network is replaced by delays:
+    latency per connection and file_latency per file of per-file copy
+    (acknowledgement of every file by scp). With server_name datasets are
+    copied to remote_path by DataTransfer and removed after run.
+
+    Parameters
+    ----------
+    mixes: list[str] | None
+        Mixes of files: labels, images, mixed, by default all
+    methods: list[str] | None
+        Methods: scp, scp_x4 (4 streams), tar, tar_gzip, tar_zstd, by default all
+    seed: int
+        Random seed
+    latency: float
+        Seconds of delay of every connection of local stand-in
+    file_latency: float
+        Seconds of delay of every file of per-file copy of local stand-in
+    server_conf: str
+        Servers configuration
+    server_name: str | None
+        Server for real transfers, by default local stand-in is used
+    username: str | None
+        User on server
+    remote_path: str | None
+        Existing directory on server for benchmark data
+    """
+
+    mixes = mixes or list(MIXES)
+    methods = methods or METHODS
+    data_transfer = DataTransfer(server_conf) if server_name is not None else None
+
+    print(f"{'mix':>8} {'files':>6} {'MB':>7} " + " ".join(f"{method:>10}" for method in methods))
+
+    for mix in mixes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_dir = Path(tmp_dir)
+            source_root = make_dataset(tmp_dir / "source", *MIXES[mix], seed)
+            files = list_local_files(source_root)
+            total_size = sum(file.size for file in files)
+
+            timings = []
+            for method in methods:
+                start_time = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    if data_transfer is None:
+                        run_local_stand_in(source_root, tmp_dir / method / source_root.name, method, latency, file_latency)
+                    else:
+                        remote_dir = f"{remote_path}/benchmark_{mix}_{method}"
+                        run_server(data_transfer, source_root, server_name, username, remote_dir, method)
+                timings.append(time.perf_counter() - start_time)
+
+                if data_transfer is not None:
+                    data_transfer.get_transport(server_name, username).run(f"rm -rf {shlex.quote(remote_dir)}")
+
+            print(
+                f"{mix:>8} {len(files):>6} {total_size / 1024 ** 2:>7.1f} "
+                + " ".join(f"{timing:>9.2f}s" for timing in timings)
+            )
+
+    if data_transfer is not None:
+        data_transfer.close()
+
+
+if __name__ == "__main__":
+    CLI(main, as_positional=False)
@@ -0,0 +1,795 @@
+"""Fast matching of initial and final boxes for salary count."""
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+from yolo_labels import CLASS, HEIGHT, WIDTH, X_CENTER, Y_CENTER
+
+# Bit flags of pair match codes
+UNCHANGED, CHANGED, DELETED = 1, 2, 4
+
+# Size of blocks of pairwise matrices
+ROWS_BLOCK = 64
+COLUMNS_BLOCK = 64
+
+# Final boxes checked one by one before spatial index is used for initial box
+GRID_SCAN_LIMIT = 8
+
+
+@dataclass
+class FrameMatch:
+    """Result of matching boxes of one frame."""
+
+    count_only_class_dif: int = 0
+    count_changed_boxes: int = 0
+    count_deleted_box: int = 0
+    count_all_deleted: int = 0
+    count_new_boxes: int = 0
+
+
+def _percentage_diff_matrix(initial_values: np.ndarray, final_values: np.ndarray) -> np.ndarray:
+    """Pairwise percentage_diff for all initial/final value pairs."""
+
+    initial_values = initial_values[:, None]
+    final_values = final_values[None, :]
+
+    return np.abs((initial_values - final_values) / ((initial_values + final_values) / 2))
+
+
+def pairwise_match_codes(
+    initial_boxes: np.ndarray,
+    final_boxes: np.ndarray,
+    box_change_low_threshold: float,
+    box_change_high_threshold: float,
+) -> Optional[np.ndarray]:
+    """
+    Compute is_box_unchanged, is_box_changed and is_deleted_box for all pairs at once.
+
+    Reference matcher raises ZeroDivisionError on zero-size or opposite-sign
+    boxes, numpy gives inf or nan there instead, so such pairs are reported
+    with None.
+
+    Parameters
+    ----------
+    initial_boxes: np.ndarray
+        (N, 5) array of initial boxes.
+    final_boxes: np.ndarray
+        (M, 5) array of final boxes.
+    box_change_low_threshold: float
+        If change is lower than this threshold, box counted as unchanged.
+    box_change_high_threshold: float
+        If change is higher than this threshold, box counted as deleted.
+
+    Returns
+    -------
+    Optional[np.ndarray]
+        (N, M) int8 matrix of bit flags UNCHANGED | CHANGED | DELETED,
+        None if any pair divides by zero.
+
+    """
+
+    low = box_change_low_threshold
+    high = box_change_high_threshold
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        width_diff = _percentage_diff_matrix(initial_boxes[:, WIDTH], final_boxes[:, WIDTH])
+        height_diff = _percentage_diff_matrix(initial_boxes[:, HEIGHT], final_boxes[:, HEIGHT])
+        x_center_diff = _percentage_diff_matrix(initial_boxes[:, X_CENTER], final_boxes[:, X_CENTER])
+        y_center_diff = _percentage_diff_matrix(initial_boxes[:, Y_CENTER], final_boxes[:, Y_CENTER])
+
+        x_shift = np.abs(initial_boxes[:, X_CENTER][:, None] - final_boxes[:, X_CENTER][None, :]) / initial_boxes[:, WIDTH][:, None]
+        y_shift = np.abs(initial_boxes[:, Y_CENTER][:, None] - final_boxes[:, Y_CENTER][None, :]) / initial_boxes[:, HEIGHT][:, None]
+
+    for matrix in (width_diff, height_diff, x_center_diff, y_center_diff, x_shift, y_shift):
+        if not np.isfinite(matrix).all():
+            return None
+
+    unchanged = (width_diff < low) & (height_diff < low) & (x_center_diff < low) & (y_center_diff < low)
+    changed = (
+        ((low < width_diff) & (width_diff < high))
+        | ((low < height_diff) & (height_diff < high))
+        | ((low < y_shift) & (y_shift < high))
+        | ((low < x_shift) & (x_shift < high))
+    )
+    # is_deleted_box checks vertical shift twice and never horizontal one, kept as is
+    deleted = (width_diff > high) | (height_diff > high) | (y_shift > high)
+
+    codes = unchanged.astype(np.int8) * UNCHANGED
+    codes |= changed.astype(np.int8) * CHANGED
+    codes |= deleted.astype(np.int8) * DELETED
+
+    return codes
+
+
+def match_boxes_vectorized(
+    initial_boxes: np.ndarray,
+    final_boxes: np.ndarray,
+    box_change_low_threshold: float,
+    box_change_high_threshold: float,
+) -> Optional[FrameMatch]:
+    """
+    Match boxes of one frame with pairwise matrices computed by numpy.
+
+    Greedy assignment is the same as in match_boxes: every initial box takes
+    the first remaining final box that is unchanged, changed or deleted.
+    Matrices are computed for blocks of ROWS_BLOCK initial boxes against
+    COLUMNS_BLOCK first remaining final boxes, where almost every initial
+    box finds its pair. Only initial boxes without a pair there are compared
+    with the rest of final boxes.
+
+    Parameters
+    ----------
+    initial_boxes: np.ndarray
+        (N, 5) sorted array of initial boxes.
+    final_boxes: np.ndarray
+        (M, 5) sorted array of final boxes.
+    box_change_low_threshold: float
+        If change is lower than this threshold, box counted as unchanged.
+    box_change_high_threshold: float
+        If change is higher than this threshold, box counted as deleted.
+
+    Returns
+    -------
+    Optional[FrameMatch]
+        Frame counts, None if frame has boxes that need reference matcher.
+
+    """
+
+    frame_match = FrameMatch()
+    initial_count = len(initial_boxes)
+    final_count = len(final_boxes)
+
+    if initial_count == 0:
+        frame_match.count_new_boxes = final_count
+        return frame_match
+
+    if final_count == 0:
+        frame_match.count_all_deleted = initial_count
+        return frame_match
+
+    thresholds = (box_change_low_threshold, box_change_high_threshold)
+    initial_classes = initial_boxes[:, CLASS].tolist()
+    final_classes = final_boxes[:, CLASS].tolist()
+
+    alive = [True] * final_count
+    alive_mask = np.ones(final_count, dtype=bool)
+    alive_count = final_count
+    head = 0
+
+    for block_start in range(0, initial_count, ROWS_BLOCK):
+        while not alive[head]:
+            head += 1
+        block_end = min(head + COLUMNS_BLOCK, final_count)
+
+        block_codes = pairwise_match_codes(
+            initial_boxes[block_start : block_start + ROWS_BLOCK], final_boxes[head:block_end], *thresholds
+        )
+        if block_codes is None:
+            return None
+
+        for row_num, row_codes in enumerate(block_codes.tolist()):
+            initial_idx = block_start + row_num
+
+            if alive_count == 0:
+                frame_match.count_all_deleted = initial_count
+                frame_match.count_new_boxes = 0
+                return frame_match
+
+            final_idx = -1
+            code = 0
+            for column_num, column_code in enumerate(row_codes):
+                if column_code and alive[head + column_num]:
+                    final_idx = head + column_num
+                    code = column_code
+                    break
+
+            if final_idx == -1 and block_end < final_count:
+                rest_codes = pairwise_match_codes(
+                    initial_boxes[initial_idx : initial_idx + 1], final_boxes[block_end:], *thresholds
+                )
+                if rest_codes is None:
+                    return None
+                rest_codes = rest_codes[0]
+                candidates = (rest_codes != 0) & alive_mask[block_end:]
+                rest_idx = int(candidates.argmax())
+                if candidates[rest_idx]:
+                    final_idx = block_end + rest_idx
+                    code = int(rest_codes[rest_idx])
+
+            if final_idx == -1:
+                continue
+
+            if code & UNCHANGED:
+                if initial_classes[initial_idx] != final_classes[final_idx]:
+                    frame_match.count_only_class_dif += 1
+            elif code & CHANGED:
+                frame_match.count_changed_boxes += 1
+            else:
+                frame_match.count_deleted_box += 1
+                continue
+
+            alive[final_idx] = False
+            alive_mask[final_idx] = False
+            alive_count -= 1
+
+        if alive_count == 0 and block_start + ROWS_BLOCK < initial_count:
+            frame_match.count_all_deleted = initial_count
+            break
+
+    frame_match.count_new_boxes = alive_count
+
+    return frame_match
+
+
+def pair_match_code(
+    initial_box: tuple[float, ...],
+    final_box: tuple[float, ...],
+    box_change_low_threshold: float,
+    box_change_high_threshold: float,
+) -> int:
+    """
+    Check one pair of boxes the same way as is_box_unchanged, is_box_changed and is_deleted_box.
+
+    Parameters
+    ----------
+    initial_box: tuple[float, ...]
+        Initial box values class, x_center, y_center, width, height.
+    final_box: tuple[float, ...]
+        Final box values.
+    box_change_low_threshold: float
+        If change is lower than this threshold, box counted as unchanged.
+    box_change_high_threshold: float
+        If change is higher than this threshold, box counted as deleted.
+
+    Returns
+    -------
+    int
+        UNCHANGED, CHANGED, DELETED or 0 if boxes do not match.
+
+    """
+
+    low = box_change_low_threshold
+    high = box_change_high_threshold
+    _, initial_x, initial_y, initial_width, initial_height = initial_box
+    _, final_x, final_y, final_width, final_height = final_box
+
+    width_diff = abs((initial_width - final_width) / ((initial_width + final_width) / 2))
+    height_diff = abs((initial_height - final_height) / ((initial_height + final_height) / 2))
+    x_center_diff = abs((initial_x - final_x) / ((initial_x + final_x) / 2))
+    y_center_diff = abs((initial_y - final_y) / ((initial_y + final_y) / 2))
+
+    if width_diff < low and height_diff < low and x_center_diff < low and y_center_diff < low:
+        return UNCHANGED
+
+    y_shift = abs(initial_y - final_y) / initial_height
+    x_shift = abs(initial_x - final_x) / initial_width
+
+    if low < width_diff < high or low < height_diff < high or low < y_shift < high or low < x_shift < high:
+        return CHANGED
+
+    if width_diff > high or height_diff > high or y_shift > high:
+        return DELETED
+
+    return 0
+
+
+def _first_match_in_rest(
+    initial_boxes: np.ndarray,
+    final_boxes: np.ndarray,
+    candidates: np.ndarray,
+    box_change_low_threshold: float,
+    box_change_high_threshold: float,
+) -> Optional[tuple[int, int]]:
+    """
+    Find first matching final box among sorted candidate indices of one initial box.
+
+    Returns
+    -------
+    Optional[tuple[int, int]]
+        Final box index and its bit flags, (-1, 0) if nothing matches,
+        None if some pair divides by zero.
+
+    """
+
+    if len(candidates) == 0:
+        return -1, 0
+
+    codes = pairwise_match_codes(
+        initial_boxes, final_boxes[candidates], box_change_low_threshold, box_change_high_threshold
+    )
+    if codes is None:
+        return None
+
+    matched = codes[0] != 0
+    first = int(matched.argmax())
+    if not matched[first]:
+        return -1, 0
+
+    return int(candidates[first]), int(codes[0, first])
+
+
+def match_boxes_grid(
+    initial_boxes: np.ndarray,
+    final_boxes: np.ndarray,
+    box_change_low_threshold: float,
+    box_change_high_threshold: float,
+) -> Optional[FrameMatch]:
+    """
+    Match boxes of one frame with spatial index on y_center of final boxes.
+
+    Greedy assignment is the same as in match_boxes. Every initial box checks
+    GRID_SCAN_LIMIT first remaining final boxes one by one, that is enough for
+    most boxes. If none of them matches, remaining final boxes are split by
+    the index: boxes outside of the band |dy| <= low * height of initial box
+    are shifted vertically and match as changed or deleted, so only the first
+    of them is checked. Boxes inside the band (a row of similar objects) are
+    checked with numpy in one call.
+
+    Matching by x is not indexed: is_deleted_box ignores horizontal shift,
+    so a final box far to the side still matches if its size differs.
+
+    Parameters
+    ----------
+    initial_boxes: np.ndarray
+        (N, 5) sorted array of initial boxes.
+    final_boxes: np.ndarray
+        (M, 5) sorted array of final boxes.
+    box_change_low_threshold: float
+        If change is lower than this threshold, box counted as unchanged.
+    box_change_high_threshold: float
+        If change is higher than this threshold, box counted as deleted.
+
+    Returns
+    -------
+    Optional[FrameMatch]
+        Frame counts, None if frame has boxes that need reference matcher.
+
+    """
+
+    frame_match = FrameMatch()
+    initial_count = len(initial_boxes)
+    final_count = len(final_boxes)
+
+    if initial_count == 0:
+        frame_match.count_new_boxes = final_count
+        return frame_match
+
+    if final_count == 0:
+        frame_match.count_all_deleted = initial_count
+        return frame_match
+
+    low = box_change_low_threshold
+    high = box_change_high_threshold
+    initial_list = initial_boxes.tolist()
+    final_list = final_boxes.tolist()
+
+    y_order = np.argsort(final_boxes[:, Y_CENTER], kind="stable")
+    sorted_y = final_boxes[y_order, Y_CENTER]
+
+    alive = [True] * final_count
+    alive_mask = np.ones(final_count, dtype=bool)
+    alive_count = final_count
+    head = 0
+
+    for initial_idx, initial_box in enumerate(initial_list):
+        if alive_count == 0:
+            frame_match.count_all_deleted = initial_count
+            frame_match.count_new_boxes = 0
+            return frame_match
+
+        while not alive[head]:
+            head += 1
+
+        final_idx = -1
+        code = 0
+        checked = 0
+        scan_end = head
+        try:
+            while scan_end < final_count and checked < GRID_SCAN_LIMIT:
+                if alive[scan_end]:
+                    code = pair_match_code(initial_box, final_list[scan_end], low, high)
+                    checked += 1
+                    if code:
+                        final_idx = scan_end
+                        break
+                scan_end += 1
+
+            if final_idx == -1 and scan_end < final_count:
+                initial_row = initial_boxes[initial_idx : initial_idx + 1]
+                band_radius = low * abs(initial_box[HEIGHT])
+                band = y_order[
+                    np.searchsorted(sorted_y, initial_box[Y_CENTER] - band_radius, side="left") : np.searchsorted(
+                        sorted_y, initial_box[Y_CENTER] + band_radius, side="right"
+                    )
+                ]
+
+                outside = alive_mask.copy()
+                outside[:scan_end] = False
+                outside[band] = False
+                outside_idx = int(outside.argmax())
+                if outside[outside_idx]:
+                    outside_code = pair_match_code(initial_box, final_list[outside_idx], low, high)
+                else:
+                    outside_idx, outside_code = final_count, 0
+
+                # all remaining boxes before the first box outside of the band are inside the band
+                band_candidates = np.flatnonzero(alive_mask[scan_end:outside_idx]) + scan_end
+                band_match = _first_match_in_rest(initial_row, final_boxes, band_candidates, low, high)
+                if band_match is None:
+                    return None
+                final_idx, code = band_match
+
+                if final_idx == -1 and outside_code:
+                    final_idx, code = outside_idx, outside_code
+                elif final_idx == -1 and outside_idx < final_count:
+                    # first box outside of the band is on threshold border, check all the rest
+                    rest_candidates = np.flatnonzero(alive_mask[outside_idx + 1 :]) + outside_idx + 1
+                    rest_match = _first_match_in_rest(initial_row, final_boxes, rest_candidates, low, high)
+                    if rest_match is None:
+                        return None
+                    final_idx, code = rest_match
+        except ZeroDivisionError:
+            return None
+
+        if final_idx == -1:
+            continue
+
+        if code & UNCHANGED:
+            if initial_box[CLASS] != final_list[final_idx][CLASS]:
+                frame_match.count_only_class_dif += 1
+        elif code & CHANGED:
+            frame_match.count_changed_boxes += 1
+        else:
+            frame_match.count_deleted_box += 1
+            continue
+
+        alive[final_idx] = False
+        alive_mask[final_idx] = False
+        alive_count -= 1
+
+    frame_match.count_new_boxes = alive_count
+
+    return frame_match
+
+
+def linear_assignment(cost: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Solve rectangular assignment problem with Hungarian algorithm.
+
+    Shortest augmenting path version, every step updates all columns with numpy.
+    Ties are resolved by the lowest column index, so result does not depend
+    on environment.
+
+    Parameters
+    ----------
+    cost: np.ndarray
+        (N, M) matrix of finite costs.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Row and column indices of min(N, M) assigned pairs, sorted by rows.
+
+    """
+
+    if cost.shape[0] > cost.shape[1]:
+        columns, rows = linear_assignment(cost.T)
+        order = np.argsort(rows)
+        return rows[order], columns[order]
+
+    rows_count, columns_count = cost.shape
+    # potentials and matching use 1-based indices, column 0 is a virtual start
+    row_potential = np.zeros(rows_count + 1)
+    column_potential = np.zeros(columns_count + 1)
+    column_row = np.zeros(columns_count + 1, dtype=np.int64)
+    way = np.zeros(columns_count + 1, dtype=np.int64)
+
+    for row in range(1, rows_count + 1):
+        column_row[0] = row
+        current_column = 0
+        min_slack = np.full(columns_count + 1, np.inf)
+        used = np.zeros(columns_count + 1, dtype=bool)
+
+        while True:
+            used[current_column] = True
+            current_row = column_row[current_column]
+
+            free = ~used[1:]
+            slack = cost[current_row - 1] - row_potential[current_row] - column_potential[1:]
+            improved = free & (slack < min_slack[1:])
+            min_slack[1:][improved] = slack[improved]
+            way[1:][improved] = current_column
+
+            free_slack = np.where(free, min_slack[1:], np.inf)
+            next_column = int(free_slack.argmin()) + 1
+            delta = free_slack[next_column - 1]
+
+            row_potential[column_row[used]] += delta
+            column_potential[used] -= delta
+            min_slack[1:][free] -= delta
+
+            current_column = next_column
+            if column_row[current_column] == 0:
+                break
+
+        while current_column:
+            previous_column = way[current_column]
+            column_row[current_column] = column_row[previous_column]
+            current_column = previous_column
+
+    columns = np.flatnonzero(column_row[1:])
+    rows = column_row[1:][columns] - 1
+    order = np.argsort(rows)
+
+    return rows[order], columns[order]
+
+
+def linear_assignment_small(cost: list[list[float]]) -> tuple[list[int], list[int]]:
+    """
+    Pure Python version of linear_assignment for small matrices.
+
+    Steps and float operations are the same as in linear_assignment, so the
+    result is the same, ties included, without overhead of numpy calls.
+
+    Parameters
+    ----------
+    cost: list[list[float]]
+        (N, M) matrix of finite costs.
+
+    Returns
+    -------
+    tuple[list[int], list[int]]
+        Row and column indices of min(N, M) assigned pairs, sorted by rows.
+
+    """
+
+    if len(cost) > len(cost[0]):
+        columns, rows = linear_assignment_small([list(column) for column in zip(*cost)])
+        pairs = sorted(zip(rows, columns))
+        return [row for row, _ in pairs], [column for _, column in pairs]
+
+    rows_count, columns_count = len(cost), len(cost[0])
+    inf = float("inf")
+    row_potential = [0.0] * (rows_count + 1)
+    column_potential = [0.0] * (columns_count + 1)
+    column_row = [0] * (columns_count + 1)
+    way = [0] * (columns_count + 1)
+
+    for row in range(1, rows_count + 1):
+        column_row[0] = row
+        current_column = 0
+        min_slack = [inf] * (columns_count + 1)
+        used = [False] * (columns_count + 1)
+
+        while True:
+            used[current_column] = True
+            current_row = column_row[current_column]
+            cost_row = cost[current_row - 1]
+            current_potential = row_potential[current_row]
+
+            next_column, delta = 0, inf
+            for column in range(1, columns_count + 1):
+                if used[column]:
+                    continue
+                slack = cost_row[column - 1] - current_potential - column_potential[column]
+                if slack < min_slack[column]:
+                    min_slack[column] = slack
+                    way[column] = current_column
+                if min_slack[column] < delta:
+                    next_column, delta = column, min_slack[column]
+
+            for column in range(columns_count + 1):
+                if used[column]:
+                    row_potential[column_row[column]] += delta
+                    column_potential[column] -= delta
+                else:
+                    min_slack[column] -= delta
+
+            current_column = next_column
+            if column_row[current_column] == 0:
+                break
+
+        while current_column:
+            previous_column = way[current_column]
+            column_row[current_column] = column_row[previous_column]
+            current_column = previous_column
+
+    pairs = sorted((column_row[column] - 1, column - 1) for column in range(1, columns_count + 1) if column_row[column])
+    return [row for row, _ in pairs], [column for _, column in pairs]
+
+
+def allowed_components(allowed: np.ndarray) -> list[tuple[np.ndarray, np.ndarray]]:
+    """
+    Split boxes into groups connected by allowed pairs.
+
+    Assignment of every group does not depend on other groups,
+    so groups are solved separately and much faster than the whole frame.
+
+    Parameters
+    ----------
+    allowed: np.ndarray
+        (N, M) bool matrix of pairs that can be matched.
+
+    Returns
+    -------
+    list[tuple[np.ndarray, np.ndarray]]
+        Sorted row and column indices of every group with at least one allowed pair.
+
+    """
+
+    rows_count = allowed.shape[0]
+    parents = list(range(rows_count + allowed.shape[1]))
+
+    def find(node: int) -> int:
+        while parents[node] != node:
+            parents[node] = parents[parents[node]]
+            node = parents[node]
+        return node
+
+    pair_rows, pair_columns = np.nonzero(allowed)
+    for row, column in zip(pair_rows.tolist(), pair_columns.tolist()):
+        row_root = find(row)
+        column_root = find(rows_count + column)
+        if row_root != column_root:
+            parents[max(row_root, column_root)] = min(row_root, column_root)
+
+    groups = {}
+    for node in sorted(set(pair_rows.tolist()) | {rows_count + column for column in pair_columns.tolist()}):
+        groups.setdefault(find(node), []).append(node)
+
+    components = []
+    for nodes in groups.values():
+        nodes = np.array(nodes)
+        components.append((nodes[nodes < rows_count], nodes[nodes >= rows_count] - rows_count))
+
+    return components
+
+
+def match_boxes_optimal(
+    initial_boxes: np.ndarray,
+    final_boxes: np.ndarray,
+    box_change_low_threshold: float,
+    box_change_high_threshold: float,
+) -> FrameMatch:
+    """
+    Match boxes of one frame with optimal one-to-one assignment.
+
+    Unlike greedy matchers the result does not depend on the order of boxes.
+    A pair can be matched if no change is higher than high threshold,
+    horizontal shift included. Assignment first maximizes number of matched
+    pairs and then minimizes sum of width, height and center changes.
+    Matched pair is unchanged by the same rule as in is_box_unchanged,
+    otherwise changed. Initial boxes without pair are deleted, final boxes
+    without pair are new. Boxes that divide by zero are never matched.
+
+    Parameters
+    ----------
+    initial_boxes: np.ndarray
+        (N, 5) array of initial boxes.
+    final_boxes: np.ndarray
+        (M, 5) array of final boxes.
+    box_change_low_threshold: float
+        If change is lower than this threshold, box counted as unchanged.
+    box_change_high_threshold: float
+        If change is higher than this threshold, pair can not be matched.
+
+    Returns
+    -------
+    FrameMatch
+        Frame counts.
+
+    """
+
+    return _match_boxes_optimal(
+        initial_boxes, final_boxes, box_change_low_threshold, box_change_high_threshold, linear_assignment
+    )
+
+
+def match_boxes_optimal_small(
+    initial_boxes: np.ndarray,
+    final_boxes: np.ndarray,
+    box_change_low_threshold: float,
+    box_change_high_threshold: float,
+) -> FrameMatch:
+    """
+    Match boxes of small frame, the result is the same as of match_boxes_optimal.
+
+    Groups of boxes are solved by linear_assignment_small, which is faster
+    than numpy version for a few boxes and slower for large groups.
+
+    Parameters
+    ----------
+    initial_boxes: np.ndarray
+        (N, 5) array of initial boxes.
+    final_boxes: np.ndarray
+        (M, 5) array of final boxes.
+    box_change_low_threshold: float
+        If change is lower than this threshold, box counted as unchanged.
+    box_change_high_threshold: float
+        If change is higher than this threshold, pair can not be matched.
+
+    Returns
+    -------
+    FrameMatch
+        Frame counts.
+
+    """
+
+    def solve(cost: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        rows, columns = linear_assignment_small(cost.tolist())
+        return np.array(rows, dtype=np.int64), np.array(columns, dtype=np.int64)
+
+    return _match_boxes_optimal(initial_boxes, final_boxes, box_change_low_threshold, box_change_high_threshold, solve)
+
+
+def _match_boxes_optimal(
+    initial_boxes: np.ndarray,
+    final_boxes: np.ndarray,
+    box_change_low_threshold: float,
+    box_change_high_threshold: float,
+    solve: Callable[[np.ndarray], tuple[np.ndarray, np.ndarray]],
+) -> FrameMatch:
+    """Match boxes with optimal assignment, every group of boxes is solved by solve."""
+
+    frame_match = FrameMatch()
+    initial_count = len(initial_boxes)
+    final_count = len(final_boxes)
+
+    if initial_count == 0 or final_count == 0:
+        frame_match.count_deleted_box = initial_count
+        frame_match.count_new_boxes = final_count
+        return frame_match
+
+    low = box_change_low_threshold
+    high = box_change_high_threshold
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        width_diff = _percentage_diff_matrix(initial_boxes[:, WIDTH], final_boxes[:, WIDTH])
+        height_diff = _percentage_diff_matrix(initial_boxes[:, HEIGHT], final_boxes[:, HEIGHT])
+        x_center_diff = _percentage_diff_matrix(initial_boxes[:, X_CENTER], final_boxes[:, X_CENTER])
+        y_center_diff = _percentage_diff_matrix(initial_boxes[:, Y_CENTER], final_boxes[:, Y_CENTER])
+
+        x_shift = np.abs(initial_boxes[:, X_CENTER][:, None] - final_boxes[:, X_CENTER][None, :]) / initial_boxes[:, WIDTH][:, None]
+        y_shift = np.abs(initial_boxes[:, Y_CENTER][:, None] - final_boxes[:, Y_CENTER][None, :]) / initial_boxes[:, HEIGHT][:, None]
+
+        change = width_diff + height_diff + x_shift + y_shift
+
+    allowed = (
+        np.isfinite(change)
+        & np.isfinite(x_center_diff)
+        & np.isfinite(y_center_diff)
+        & (width_diff <= high)
+        & (height_diff <= high)
+        & (x_shift <= high)
+        & (y_shift <= high)
+    )
+    unchanged = (width_diff < low) & (height_diff < low) & (x_center_diff < low) & (y_center_diff < low)
+
+    rows = []
+    columns = []
+    for component_rows, component_columns in allowed_components(allowed):
+        component_allowed = allowed[np.ix_(component_rows, component_columns)]
+        # cost of allowed pair is at most 4 * high, forbidden pair costs more than all allowed pairs together,
+        # so number of matched pairs is maximized first
+        forbidden_cost = 4 * high * min(len(component_rows), len(component_columns)) + 1
+        cost = np.where(component_allowed, change[np.ix_(component_rows, component_columns)], forbidden_cost)
+
+        assigned_rows, assigned_columns = solve(cost)
+        matched = component_allowed[assigned_rows, assigned_columns]
+        rows.append(component_rows[assigned_rows[matched]])
+        columns.append(component_columns[assigned_columns[matched]])
+
+    rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+    columns = np.concatenate(columns) if columns else np.empty(0, dtype=np.int64)
+
+    pair_unchanged = unchanged[rows, columns]
+    class_differs = initial_boxes[rows, CLASS] != final_boxes[columns, CLASS]
+
+    frame_match.count_only_class_dif = int((pair_unchanged & class_differs).sum())
+    frame_match.count_changed_boxes = int((~pair_unchanged).sum())
+    frame_match.count_deleted_box = initial_count - len(rows)
+    frame_match.count_new_boxes = final_count - len(rows)
+
+    return frame_match
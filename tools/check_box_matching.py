@@ -0,0 +1,178 @@
+"""Check that box matchers give the same salary on synthetic labels."""
+
+import contextlib
+import io
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from jsonargparse import CLI
+
+from salary_for_annotation import GREEDY_MATCHERS, BoxCostsConfig, CostsParamsConfig, count_salary
+
+
+def _random_box(rng: random.Random) -> list[float]:
+    return [
+        rng.randint(0, 3),
+        rng.uniform(0.05, 0.95),
+        rng.uniform(0.05, 0.95),
+        rng.uniform(0.01, 0.2),
+        rng.uniform(0.01, 0.2),
+    ]
+
+
+def _format_box(box: list[float]) -> str:
+    return f"{int(box[0])} {box[1]:.6f} {box[2]:.6f} {box[3]:.6f} {box[4]:.6f}\n"
+
+
+def make_synthetic_corpus(root: Path, frames: int, max_boxes: int, seed: int) -> tuple[Path, Path]:
+    """
+    Write initial and final YOLO labels with random edits.
+
+    Final boxes are copied, re-classed, moved a bit, moved far or removed,
+    and some new boxes are added.
+
+    Parameters
+    ----------
+    root: Path
+        Directory for corpus
+    frames: int
+        Number of frames
+    max_boxes: int
+        Max number of initial boxes per frame
+    seed: int
+        Random seed
+
+    Returns
+    -------
+    tuple[Path, Path]
+        Directories with initial and final labels
+    """
+
+    rng = random.Random(seed)
+    initial_dir = root / "initial"
+    final_dir = root / "final"
+    initial_dir.mkdir(parents=True, exist_ok=True)
+    final_dir.mkdir(parents=True, exist_ok=True)
+
+    for frame_num in range(frames):
+        initial_boxes = [_random_box(rng) for _ in range(rng.randint(0, max_boxes))]
+        final_boxes = []
+
+        for box in initial_boxes:
+            edit = rng.random()
+            if edit < 0.3:
+                final_boxes.append(box[:])
+            elif edit < 0.4:
+                final_boxes.append([(box[0] + 1) % 4] + box[1:])
+            elif edit < 0.7:
+                final_boxes.append([box[0]] + [value * (1 + rng.uniform(-0.4, 0.4)) for value in box[1:]])
+            elif edit < 0.85:
+                continue
+            else:
+                final_boxes.append([box[0]] + [value * (1 + rng.uniform(-1.5, 1.5)) for value in box[1:]])
+
+        final_boxes.extend(_random_box(rng) for _ in range(rng.randint(0, 5)))
+        rng.shuffle(final_boxes)
+
+        frame_name = f"frame_{frame_num:06d}"
+        (initial_dir / f"{frame_name}.jpg").touch()
+        (initial_dir / f"{frame_name}.txt").write_text("".join(_format_box(box) for box in initial_boxes))
+        (final_dir / f"{frame_name}.txt").write_text("".join(_format_box(box) for box in final_boxes))
+
+    return initial_dir, final_dir
+
+
+def run_matcher(
+    initial_dir: Path,
+    final_dir: Path,
+    matcher: str,
+    num_workers: int = 1,
+    optimal_min_boxes: int = 0
+) -> tuple[tuple, float]:
+    """Run count_salary with given matcher, return its result and time in seconds."""
+
+    costs_params_cfg = CostsParamsConfig(
+        initial_labels_path=initial_dir,
+        final_labels_path=final_dir,
+        box_costs_cfg=BoxCostsConfig(),
+        increased_cost_frame_from=0,
+        increased_cost_frame_to=10,
+        matcher=matcher,
+        num_workers=num_workers,
+        optimal_min_boxes=optimal_min_boxes,
+    )
+
+    start_time = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        result = count_salary(costs_params_cfg)
+
+    return result, time.perf_counter() - start_time
+
+
+def main(
+    frames: int = 200,
+    max_boxes: int = 60,
+    seed: int = 0,
+    matchers: list[str] | None = None,
+    reference: str = "loop",
+    num_workers: int = 4,
+    check_optimal: bool = True,
+):
+    """
+    Compare matchers with reference matcher on synthetic corpus.
+
+    Parameters
+    ----------
+    frames: int
+        Number of frames in corpus
+    max_boxes: int
+        Max number of boxes per frame
+    seed: int
+        Random seed
+    matchers: list[str] | None
+        Matchers to check, all greedy matchers by default
+    reference: str
+        Matcher with expected results
+    num_workers: int
+        Number of processes for parallel run of every matcher, 1 to skip parallel runs
+    check_optimal: bool
+        Check that optimal matcher gives the same result with all frames
+        solved by fast path (optimal_min_boxes above max_boxes) and without it
+    """
+
+    matchers = matchers or [name for name in GREEDY_MATCHERS if name != reference]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        initial_dir, final_dir = make_synthetic_corpus(Path(tmp_dir), frames, max_boxes, seed)
+
+        expected, reference_time = run_matcher(initial_dir, final_dir, reference)
+        print(f"{reference}: {reference_time:.3f}s {expected}")
+
+        runs = [(matcher, 1) for matcher in matchers]
+        if num_workers > 1:
+            runs += [(matcher, num_workers) for matcher in [reference, *matchers]]
+
+        is_ok = True
+        for matcher, workers in runs:
+            result, matcher_time = run_matcher(initial_dir, final_dir, matcher, workers)
+            status = "✅ same" if result == expected else "❌ differs"
+            is_ok = is_ok and result == expected
+            print(f"{matcher} ({workers} workers): {matcher_time:.3f}s {result} {status}")
+
+        if check_optimal:
+            optimal_expected, optimal_time = run_matcher(initial_dir, final_dir, "optimal")
+            print(f"optimal: {optimal_time:.3f}s {optimal_expected}")
+
+            result, matcher_time = run_matcher(initial_dir, final_dir, "optimal", optimal_min_boxes=max_boxes + 1)
+            status = "✅ same" if result == optimal_expected else "❌ differs"
+            is_ok = is_ok and result == optimal_expected
+            print(f"optimal (optimal_min_boxes={max_boxes + 1}): {matcher_time:.3f}s {result} {status}")
+
+    if not is_ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    CLI(main, as_positional=False)
@@ -0,0 +1,154 @@
+"""Check sharded transfer on local file tree, optionally round trip through real server."""
+
+import filecmp
+import random
+import shlex
+import tempfile
+from pathlib import Path
+
+from jsonargparse import CLI
+
+from src.cascade.tools.data_transfer import DataTransfer, list_local_files, run_sharded_transfer
+
+
+def make_tree(root: Path, small_files: int, large_files: int, seed: int) -> Path:
+    """
+    Write tree like exported dataset: many small labels and fewer large images.
+
+    Parameters
+    ----------
+    root: Path
+        Directory for tree
+    small_files: int
+        Number of label files of 50-500 bytes
+    large_files: int
+        Number of image files of 50-500 KB
+    seed: int
+        Random seed
+
+    Returns
+    -------
+    Path
+        Root of tree
+    """
+
+    rng = random.Random(seed)
+    tree_root = root / "dataset"
+
+    for file_num in range(small_files):
+        path = tree_root / "labels" / f"part_{file_num % 4}" / f"frame_{file_num:06d}.txt"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(rng.randbytes(rng.randint(50, 500)))
+
+    for file_num in range(large_files):
+        path = tree_root / "images" / f"frame {file_num:06d}.jpg"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(rng.randbytes(rng.randint(50, 500) * 1024))
+
+    return tree_root
+
+
+def is_same_tree(expected_root: Path, actual_root: Path) -> bool:
+    """Check that both trees have the same files with the same content."""
+
+    expected_files = [file.relative_path for file in list_local_files(expected_root)]
+    actual_files = [file.relative_path for file in list_local_files(actual_root)]
+    if expected_files != actual_files:
+        return False
+
+    _, mismatch, errors = filecmp.cmpfiles(expected_root, actual_root, expected_files, shallow=False)
+    return not mismatch and not errors
+
+
+def main(
+    workers: list[int] | None = None,
+    small_files: int = 2000,
+    large_files: int = 40,
+    latency: float = 0.05,
+    file_latency: float = 0.002,
+    seed: int = 0,
+    server_conf: str = "configs/servers.json",
+    server_name: str | None = None,
+    username: str | None = None,
+    remote_path: str | None = None,
+):
+    """
+    Copy synthetic tree with different number of streams and compare result with source.
+
+    Local stand-in runs cp after sleep of latency seconds plus file_latency for every
+    file, like scp connection setup and acknowledgement of every file on distant link.
+    If server_name is set, tree is also copied to remote_path by DataTransfer
+    and downloaded back.
+
+    Parameters
+    ----------
+    workers: list[int] | None
+        Numbers of streams to check, by default 1, 2, 4, 8
+    small_files: int
+        Number of small files
+    large_files: int
+        Number of large files
+    latency: float
+        Seconds of delay before every local copy command
+    file_latency: float
+        Seconds of delay for every file of local copy command
+    seed: int
+        Random seed
+    server_conf: str
+        Servers configuration for round trip
+    server_name: str | None
+        Server for round trip, by default only local check is done
+    username: str | None
+        User on server
+    remote_path: str | None
+        Existing directory on server for round trip
+    """
+
+    workers = workers or [1, 2, 4, 8]
+
+    is_ok = True
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_dir = Path(tmp_dir)
+        source_root = make_tree(tmp_dir / "source", small_files, large_files, seed)
+        files = list_local_files(source_root)
+
+        for workers_count in workers:
+            target_root = tmp_dir / f"target_{workers_count}"
+
+            def make_command(directory: str, paths: list[str]) -> list[str]:
+                target_dir = shlex.quote(str(target_root / directory))
+                sources = " ".join(shlex.quote(str(source_root / path)) for path in paths)
+                delay = latency + file_latency * len(paths)
+                return ["sh", "-c", f"sleep {delay:.4f}; mkdir -p {target_dir} && cp {sources} {target_dir}/"]
+
+            print(f"Local stand-in, {workers_count} workers:")
+            result = run_sharded_transfer(files, make_command, workers_count)
+            is_same = result.ok and is_same_tree(source_root, target_root)
+            is_ok = is_ok and is_same
+            print(
+                f"✅ same tree, {result.elapsed:.2f}s" if is_same else f"❌ tree differs {result.errors[:3]}"
+            )
+
+        if server_name is not None:
+            download_dir = tmp_dir / "download"
+            download_dir.mkdir()
+
+            with DataTransfer(server_conf) as data_transfer:
+                for workers_count in workers:
+                    print(f"Round trip through {server_name}, {workers_count} workers:")
+                    upload = data_transfer.transfer_data(
+                        source_root, remote_path, server_name, username, "copy", workers_count
+                    )
+                    download = data_transfer.transfer_data(
+                        download_dir, f"{remote_path}/{source_root.name}", server_name, username, "download", workers_count
+                    )
+                    is_same = upload.ok and download.ok and is_same_tree(source_root, download_dir / source_root.name)
+                    is_ok = is_ok and is_same
+                    print("✅ same tree" if is_same else f"❌ tree differs {(upload.errors + download.errors)[:3]}")
+
+    if not is_ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    CLI(main, as_positional=False)
@@ -46,10 +46,16 @@ def process_of_download(
         table_url: str | None = None,
         sheet_id: int | None = None,
         table_credentials_path: str | None = None,
-        column_names: list[str] | None = None        
+        column_names: list[str] | None = None,
+        export_workers: int = 1,
+        resume: bool = False,
+        export_cache_dir: str | None = None,
+        export_cache_max_size_gb: float = 20.0
     ):    
     cvat_downloader = CvatDownloader(
-        cvat_credentials_path
+        cvat_credentials_path,
+        cache_dir=export_cache_dir,
+        cache_max_size_gb=export_cache_max_size_gb
     )
     tasks_ids = get_tasks_ids(path_to_tasks_ids)
     cvat_downloader.export_tasks(
@@ -57,8 +63,11 @@ def process_of_download(
         export_format=export_format,
         task_ids=tasks_ids,
         output_dir=output_dir,
-        include_images=include_images
+        include_images=include_images,
+        max_workers=export_workers,
+        resume=resume
     )
+    cvat_downloader.close()
 
 
 def main(args_path: str | Path):
@@ -79,6 +88,10 @@ def main(args_path: str | Path):
     sheet_id = args["sheet_id"]
     table_credentials_path = args["table_credentials_path"]
     column_names = args["column_names"]
+    export_workers = args.get("export_workers", 1)
+    resume = args.get("resume", False)
+    export_cache_dir = args.get("export_cache_dir")
+    export_cache_max_size_gb = args.get("export_cache_max_size_gb", 20.0)
 
     process_of_download(
         cvat_credentials_path=cvat_credentials_path,
@@ -89,7 +102,11 @@ def main(args_path: str | Path):
         table_url=table_url,
         sheet_id=sheet_id,
         table_credentials_path=table_credentials_path,
-        column_names=column_names
+        column_names=column_names,
+        export_workers=export_workers,
+        resume=resume,
+        export_cache_dir=export_cache_dir,
+        export_cache_max_size_gb=export_cache_max_size_gb
     )
 
 if __name__ == "__main__":
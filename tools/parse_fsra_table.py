@@ -1,10 +1,12 @@
 from pathlib import Path
+from typing import Optional
 import yaml
 import os
 
 from jsonargparse import CLI
 import pandas as pd
 
+from src.cascade.tables.sheet_cache import SheetCache
 from src.cascade.tables.table import TableEditor
 
 NAME_OF_DATE_COLUMN = "Целевая дата выплаты"
@@ -28,16 +30,22 @@ def get_archive_names_for_numbers(archive_number_in_names: list[str], path_to_ar
     return archive_names
 
 
-def get_archive_numbers(table_url: str, credentials_file: str) -> list[str]:
-    table_editor = TableEditor(table_url, credentials_file)
-    df = table_editor.get_named_table()
+def get_archive_numbers(
+    table_url: str,
+    credentials_file: str,
+    cache_dir: Optional[str] = None,
+    cache_ttl_hours: float = 24.0
+) -> list[str]:
+    cache = SheetCache(cache_dir, ttl_seconds=cache_ttl_hours * 3600) if cache_dir else None
+    table_editor = TableEditor(table_url, credentials_file, cache=cache)
+    df = table_editor.get_named_table(schema={'Подходит с разметкой боксов': "int"})
     
     required_columns = ['Подходит с разметкой боксов', 'Номер папки']
     missing_columns = [col for col in required_columns if col not in df.columns]
     if missing_columns:
         raise ValueError(f"В таблице отсутствуют необходимые столбцы: {missing_columns}")
     
-    filtered_df = df[df['Подходит с разметкой боксов'] == '1']
+    filtered_df = df[(df['Подходит с разметкой боксов'] == 1).fillna(False)]
     archive_number_in_names = filtered_df['Номер папки'].astype(str).tolist()
     
     return archive_number_in_names
\ No newline at end of file
@@ -1,18 +1,36 @@
+import asyncio
 from pathlib import Path
 import os
+import time
 import yaml
 import re
-from typing import Optional
+from typing import Any, Callable, Optional
 from dataclasses import dataclass
 
 from jsonargparse import CLI
+import numpy as np
 import pandas as pd
 
-from src.cascade.tables.table import TableEditor
+from src.cascade.tables.sheet_cache import SheetCache
+from src.cascade.tables.table import DATE_FORMAT, BufferedRowWriter, TableEditor
 from src.cascade.cvat.cvat_core import CvatDownloader
+from src.cascade.tools.share_index import ShareIndex
 from salary_for_annotation import BoxCostsConfig, CostsParamsConfig, count_salary
 
 NAME_OF_DATE_COLUMN = "Целевая дата выплаты"
+TASK_ID_PATTERN = r'/tasks/(\d+)'
+INTEGER_PATTERN = r'[+-]?\d+'
+
+# Types of annotation table columns applied at load time.
+# Frames count is kept as strings: it is parsed with validation by
+# _process_table_sheet, and invalid values are shown in row errors as is
+ANNOTATION_TABLE_SCHEMA = {
+    NAME_OF_DATE_COLUMN: "date",
+    'ID проекта': "category",
+    "Исполнитель": "category",
+    "Кол-во картинок": "category",
+    'Есть предразметка': "category",
+}
 
 
 @dataclass
@@ -29,6 +47,13 @@ class TaskData:
     have_preannotated: bool = True
 
 
+@dataclass
+class RowError:
+    sheet_id: int
+    row: int  # number of row in spreadsheet
+    message: str
+
+
 PROJECT_NAMES = {
     35: 'fsra_35',
     29: 'drone_detection_29', 
@@ -39,7 +64,7 @@ PROJECT_NAMES = {
 
 def extract_task_id_from_url(job_url: str) -> int:
     """Extract task ID from CVAT job URL."""
-    match = re.search(r'/tasks/(\d+)', job_url)
+    match = re.search(TASK_ID_PATTERN, job_url)
     if match:
         return int(match.group(1))
     raise ValueError(f"Cannot extract task ID from URL: {job_url}")
@@ -50,66 +75,134 @@ def get_project_name(project_id: int) -> Optional[str]:
     return PROJECT_NAMES.get(project_id)
 
 
-def write_in_salary_table(table_url: str, table_credentials_path: str, data: list[str]):
+def _column(df: pd.DataFrame, column_name: str, default=None) -> pd.Series:
+    """Get column or series filled with default if there is no such column."""
+    if column_name in df.columns:
+        return df[column_name]
+    return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+
+def _to_int(values: pd.Series) -> pd.Series:
+    """Convert strings with integer numbers as int() does, other values become NaN."""
+    if pd.api.types.is_integer_dtype(values):
+        return values
+    stripped = values.astype(str).str.strip()
+    return pd.to_numeric(stripped.where(stripped.str.fullmatch(INTEGER_PATTERN)), errors="coerce")
+
+
+def _process_table_sheet(
+    df: pd.DataFrame,
+    sheet_id: int,
+    date: str,
+    errors: Optional[list[RowError]] = None
+) -> list[TaskData]:
     """
-    Write data to salary table.
-    
+    Process a single sheet table and extract TaskData.
+
+    Columns are converted at once, rows with invalid URL, project ID or
+    frames count are skipped.
+
     Parameters
     ----------
-    table_url : str
-        URL of the Google Sheets table
-    table_credentials_path : str
-        Path to Google Sheets credentials
-    data : list[str]
-        List of values to write
-    """
-    table_editor = TableEditor(table_url, table_credentials_path)    
-    table_editor.append_to_end([data])
+    df : pd.DataFrame
+        Table of sheet
+    sheet_id : int
+        Sheet id for messages
+    date : str
+        Target payment date
+    errors : Optional[list[RowError]]
+        Skipped rows and ignored invalid values are added to this list
 
+    Returns
+    -------
+    list[TaskData]
+        Tasks in order of rows
+    """
+    errors = errors if errors is not None else []
 
-def _process_table_sheet(table_editor: TableEditor, sheet_id: int, date: str) -> list[TaskData]:
-    """Process a single sheet and extract TaskData."""
     try:
-        df = table_editor.get_named_table(sheet_id)
-        
         if NAME_OF_DATE_COLUMN not in df.columns:
             print(f"Sheet {sheet_id}: no date column, skipping")
             return []
             
-        filtered_df = df[df[NAME_OF_DATE_COLUMN] == date]
+        dates = df[NAME_OF_DATE_COLUMN]
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            filtered_df = df[dates == pd.to_datetime(date, format=DATE_FORMAT)]
+        else:
+            filtered_df = df[dates == date]
         
         if filtered_df.empty:
             print(f"Sheet {sheet_id}: no tasks for date {date}")
             return []
-        
-        tasks = []
-        for _, row in filtered_df.iterrows():
-            try:
-                increase_price_frames = row.get('Картинки по повышенной цене')
-                if increase_price_frames not in [None, '']:
-                    try:
-                        increase_price_frames = int(float(increase_price_frames)) if increase_price_frames else None
-                    except (ValueError, TypeError):
-                        increase_price_frames = None
-                        print(f"⚠️  Invalid increase_price_frames value in sheet {sheet_id}")
-
-                task_data = TaskData(
-                    url=str(row['Ссылка на джобу']),
-                    task_id=extract_task_id_from_url(str(row['Ссылка на джобу'])),
-                    task_name="",
-                    project_id=int(row['ID проекта']),
-                    frames_count=int(row.get("Кол-во картинок", 0)),
-                    assigner=row.get("Исполнитель", ""),
-                    frames=row.get('Кадры'),
-                    increase_price_frames=increase_price_frames,
-                    have_preannotated=row.get('Есть предразметка') != 'нет'
-                )
-                tasks.append(task_data)
-            except (ValueError, KeyError) as e:
-                print(f"Error processing row: {e}")
-                continue
-                
-        return tasks
+
+        urls = _column(filtered_df, 'Ссылка на джобу').astype(str)
+        task_ids = pd.to_numeric(urls.str.extract(TASK_ID_PATTERN, expand=False), errors="coerce")
+        project_ids = _to_int(_column(filtered_df, 'ID проекта'))
+        frames_counts = _to_int(_column(filtered_df, "Кол-во картинок", "0"))
+
+        # Errors in order of checks of the row parser, the first one is reported
+        row_errors = np.select(
+            [
+                np.full(len(filtered_df), 'Ссылка на джобу' not in filtered_df.columns),
+                task_ids.isna().to_numpy(),
+                project_ids.isna().to_numpy(),
+                frames_counts.isna().to_numpy(),
+            ],
+            [
+                "no column 'Ссылка на джобу'",
+                "Cannot extract task ID from URL: " + urls,
+                urls + ": invalid project ID " + _column(filtered_df, 'ID проекта').astype(str),
+                urls + ": invalid frames count " + _column(filtered_df, "Кол-во картинок").astype(str),
+            ],
+            default="",
+        )
+
+        # Filled values are parsed as int(float(value)), invalid ones are replaced by None
+        increase_price_frames = _column(filtered_df, 'Картинки по повышенной цене')
+        is_increase_filled = (increase_price_frames.notna() & (increase_price_frames != '')).to_numpy()
+        increase_price_numbers = pd.to_numeric(
+            increase_price_frames.astype(str).str.strip().where(is_increase_filled), errors="coerce"
+        ).to_numpy(dtype=np.float64)
+        is_invalid_increase = is_increase_filled & ~np.isfinite(increase_price_numbers)
+
+        for row, message, is_invalid_increase_row in zip(filtered_df.index, row_errors, is_invalid_increase):
+            if message:
+                errors.append(RowError(sheet_id, row, message))
+            elif is_invalid_increase_row:
+                errors.append(RowError(sheet_id, row, f"{urls[row]}: invalid increase_price_frames value, it is ignored"))
+
+        is_valid = row_errors == ""
+        have_preannotated = _column(filtered_df, 'Есть предразметка') != 'нет'
+
+        return [
+            TaskData(
+                url=url,
+                task_id=int(task_id),
+                task_name="",
+                project_id=int(project_id),
+                frames_count=int(frames_count),
+                assigner=assigner,
+                frames=frames,
+                increase_price_frames=(None if is_invalid else int(number)) if is_filled else increase,
+                have_preannotated=bool(preannotated)
+            )
+            for (
+                url, task_id, project_id, frames_count, assigner, frames,
+                increase, is_filled, number, is_invalid, preannotated
+            ) in zip(
+                urls[is_valid],
+                task_ids[is_valid],
+                project_ids[is_valid],
+                frames_counts[is_valid],
+                _column(filtered_df, "Исполнитель", "")[is_valid],
+                _column(filtered_df, 'Кадры')[is_valid],
+                increase_price_frames[is_valid],
+                is_increase_filled[is_valid],
+                increase_price_numbers[is_valid],
+                is_invalid_increase[is_valid],
+                have_preannotated[is_valid],
+            )
+        ]
         
     except Exception as e:
         print(f"Error processing sheet {sheet_id}: {e}")
@@ -119,33 +212,43 @@ def _process_table_sheet(table_editor: TableEditor, sheet_id: int, date: str) ->
 def parse_annotations_table(
     table_url: str, 
     table_credentials_path: str, 
-    date: str
+    date: str,
+    cache_dir: Optional[str] = None,
+    cache_ttl_hours: float = 24.0
 ) -> list[TaskData]:
-    """Parse table and return list of TaskData objects."""
-    table_editor = TableEditor(table_url, table_credentials_path)
+    """Parse table and return list of TaskData objects, unchanged sheets are read from local cache if it is set."""
+    cache = SheetCache(cache_dir, ttl_seconds=cache_ttl_hours * 3600) if cache_dir else None
+    table_editor = TableEditor(table_url, table_credentials_path, cache=cache)
     all_tasks = []
+    errors = []
     
     try:
-        num_sheets = table_editor.get_sheet_count()
-        print(f"📊 Found {num_sheets} sheets to process")
+        tables = table_editor.get_named_tables(schema=ANNOTATION_TABLE_SCHEMA)
+        print(f"📊 Found {len(tables)} sheets to process")
         
-        for sheet_id in range(num_sheets):
-            sheet_tasks = _process_table_sheet(table_editor, sheet_id, date)
+        for sheet_id, df in tables.items():
+            sheet_tasks = _process_table_sheet(df, sheet_id, date, errors)
             all_tasks.extend(sheet_tasks)
             
     except Exception as e:
-        print(f"❌ Error getting sheet count: {e}")
+        print(f"❌ Error reading sheets by one request: {e}")
         print("🔄 Using iterative approach as fallback")
         sheet_id = 0
         max_sheets = 10
         
         while sheet_id < max_sheets:
-            sheet_tasks = _process_table_sheet(table_editor, sheet_id, date)
+            df = table_editor.get_named_table(sheet_id, schema=ANNOTATION_TABLE_SCHEMA)
+            sheet_tasks = _process_table_sheet(df, sheet_id, date, errors)
             if not sheet_tasks and sheet_id > 10:
                 break
             all_tasks.extend(sheet_tasks)
             sheet_id += 1
     
+    if errors:
+        print(f"⚠️  {len(errors)} rows with errors:")
+        for error in errors:
+            print(f"   Sheet {error.sheet_id}, row {error.row}: {error.message}")
+
     print(f"✅ Processed sheets, found {len(all_tasks)} tasks total")
     return all_tasks
 
@@ -155,10 +258,19 @@ def process_of_download(
     task_data_list: list[TaskData],
     output_dir: str = "./exports",
     export_format: str = "YOLO 1.1",
-    include_images: bool = False
+    include_images: bool = False,
+    export_workers: int = 1,
+    resume: bool = False,
+    export_cache_dir: Optional[str] = None,
+    export_cache_max_size_gb: float = 20.0,
+    on_success: Optional[Callable[[int, dict[str, Any]], None]] = None
 ) -> dict[int, tuple[str, str]]:
-    """Download tasks and return mapping with task names and paths."""
-    cvat_downloader = CvatDownloader(cvat_credentials_path)
+    """Download tasks and return mapping with task names and paths, on_success is called for every downloaded task."""
+    cvat_downloader = CvatDownloader(
+        cvat_credentials_path,
+        cache_dir=export_cache_dir,
+        cache_max_size_gb=export_cache_max_size_gb
+    )
     
     task_ids = [task.task_id for task in task_data_list]
     
@@ -167,8 +279,13 @@ def process_of_download(
         export_format=export_format,
         task_ids=task_ids,
         output_dir=output_dir,
-        include_images=include_images
+        include_images=include_images,
+        max_workers=export_workers,
+        labels_only=not include_images,
+        resume=resume,
+        on_success=on_success
     )
+    cvat_downloader.close()
     
     return {
         task_id: (result["task_name"], result["local_path"])
@@ -243,10 +360,20 @@ def process_of_count_salary(
     cost_new_box_increased: int,
     box_change_low_threshold: int,
     box_change_high_threshold: int,
-    have_preannotated: bool
+    have_preannotated: bool,
+    matcher: str = "loop",
+    salary_workers: int = 1,
+    optimal_min_boxes: int = 0,
+    share_index: Optional[ShareIndex] = None
 ):
-    """Calculate salary for annotation work."""
-    initial_labels_path = get_valid_path_to_labels(initial_labels_path)
+    """Calculate salary for annotation work, initial labels are found by share index if it is set."""
+    initial_img_files, initial_labels_files = None, None
+    if share_index is not None:
+        label_directory = share_index.get_label_directory(initial_labels_path)
+        initial_labels_path = str(label_directory.path)
+        initial_img_files, initial_labels_files = label_directory.images, label_directory.labels
+    else:
+        initial_labels_path = get_valid_path_to_labels(initial_labels_path)
     final_labels_path = get_valid_path_to_labels(final_labels_path)
 
     increased_cost_frame_from = frames_from if increase_price_frames else -1
@@ -269,22 +396,26 @@ def process_of_count_salary(
         increased_cost_frame_to=increased_cost_frame_to,
         frames_from=frames_from,
         frames_to=frames_to,
-        have_preannotated=have_preannotated
+        have_preannotated=have_preannotated,
+        matcher=matcher,
+        num_workers=salary_workers,
+        optimal_min_boxes=optimal_min_boxes,
+        initial_img_files=initial_img_files,
+        initial_labels_files=initial_labels_files
     )
 
     return count_salary(costs_params_cfg=costs_params_cfg)
 
 
-def _process_single_task(
+def _count_task_salary(
     task_data: TaskData,
     project_name: str,
     cost_config: dict,
-    salary_table_url: str,
-    table_credentials_path: str
-):
-    """Process a single task and calculate salary."""
+    share_index: Optional[ShareIndex] = None
+) -> Optional[list[str]]:
+    """Calculate salary of downloaded task and return its row for salary table, None if it failed."""
     if not task_data.local_path:
-        return
+        return None
 
     task_name = task_data.task_name
     initial_labels_path = f"/mnt/cvat_share/{project_name}/{task_name}"
@@ -303,7 +434,8 @@ def _process_single_task(
             frames_to=frames_to,
             increase_price_frames=increase_price_frames,
             **cost_config,
-            have_preannotated=task_data.have_preannotated
+            have_preannotated=task_data.have_preannotated,
+            share_index=share_index
         )
         
         salary, new_boxes, deleted_boxes, diff_class_boxes, diff_boxes = salary_data
@@ -325,10 +457,11 @@ def _process_single_task(
             ""
         ]
 
-        write_in_salary_table(salary_table_url, table_credentials_path, data_for_salary_table)
+        return data_for_salary_table
 
     except Exception as e:
         print(f"❌ Salary calculation failed for {task_data.task_name}: {e}")
+        return None
 
 
 def _group_tasks_by_project(task_data_list: list[TaskData]) -> dict[int, list[TaskData]]:
@@ -341,6 +474,143 @@ def _group_tasks_by_project(task_data_list: list[TaskData]) -> dict[int, list[Ta
     return tasks_by_project
 
 
+async def _export_stage(
+    tasks_by_project: dict[int, list[TaskData]],
+    config: dict,
+    salary_queue: asyncio.Queue,
+    salary_workers_count: int
+):
+    """
+    Download projects one by one and put every task into salary queue as soon as it is downloaded.
+
+    Export thread waits while salary queue is full. At the end one stop mark
+    is put for every salary worker.
+    """
+    loop = asyncio.get_running_loop()
+
+    try:
+        for project_id, project_tasks in tasks_by_project.items():
+            project_name = get_project_name(project_id)
+            print(f"\nProcessing project {project_name} with {len(project_tasks)} tasks...")
+
+            tasks_by_id = {}
+            for task_data in project_tasks:
+                tasks_by_id.setdefault(task_data.task_id, []).append(task_data)
+
+            def on_success(task_id: int, result: dict, project_name=project_name, tasks_by_id=tasks_by_id):
+                for task_data in tasks_by_id.get(task_id, []):
+                    task_data.task_name = result["task_name"]
+                    task_data.local_path = result["local_path"]
+                    asyncio.run_coroutine_threadsafe(salary_queue.put((task_data, project_name)), loop).result()
+
+            try:
+                await asyncio.to_thread(
+                    process_of_download,
+                    cvat_credentials_path=config['cvat_credentials_path'],
+                    project_id=project_id,
+                    task_data_list=project_tasks,
+                    output_dir=f"{config['output_dir']}/{project_id}",
+                    export_format=config['export_format'],
+                    include_images=config['include_images'],
+                    export_workers=config['export_workers'],
+                    resume=config['resume'],
+                    export_cache_dir=config['export_cache_dir'],
+                    export_cache_max_size_gb=config['export_cache_max_size_gb'],
+                    on_success=on_success
+                )
+            except Exception as e:
+                print(f"❌ Export of project {project_name} failed: {e}")
+    finally:
+        for _ in range(salary_workers_count):
+            await salary_queue.put(None)
+
+
+async def _salary_stage(
+    salary_queue: asyncio.Queue,
+    row_queue: asyncio.Queue,
+    cost_config: dict,
+    share_index: Optional[ShareIndex] = None
+):
+    """Calculate salary of downloaded tasks until stop mark and put rows into row queue."""
+    while (item := await salary_queue.get()) is not None:
+        task_data, project_name = item
+        try:
+            row = await asyncio.to_thread(_count_task_salary, task_data, project_name, cost_config, share_index)
+        except Exception as e:
+            print(f"❌ Salary calculation failed for {task_data.task_name}: {e}")
+            continue
+        if row is not None:
+            await row_queue.put(row)
+
+
+async def _write_stage(row_queue: asyncio.Queue, salary_writer: BufferedRowWriter, start_time: float) -> int:
+    """Add rows to salary table buffer until stop mark, return number of rows."""
+    rows_count = 0
+    while (row := await row_queue.get()) is not None:
+        try:
+            await asyncio.to_thread(salary_writer.add, row)
+        except Exception as e:
+            print(f"❌ Salary row for {row[0]} is not written: {e}")
+            continue
+        rows_count += 1
+        if rows_count == 1:
+            print(f"📝 First salary row is ready after {time.perf_counter() - start_time:.1f}s")
+    return rows_count
+
+
+async def run_salary_pipeline(
+    tasks_by_project: dict[int, list[TaskData]],
+    config: dict,
+    cost_config: dict,
+    salary_writer: BufferedRowWriter,
+    share_index: Optional[ShareIndex] = None
+) -> int:
+    """
+    Download tasks, calculate salary and write rows as concurrent stages.
+
+    Stages are connected by queues of pipeline_queue_size items: export
+    puts every downloaded task, salary_task_workers workers calculate salary
+    of tasks, one writer adds rows to the table buffer. Blocking calls run in
+    threads, so salary of the first tasks is calculated while other tasks are
+    exported. Rows are written in order of calculation, not in order of table.
+
+    Parameters
+    ----------
+    tasks_by_project : dict[int, list[TaskData]]
+        Tasks of annotation table grouped by project ID
+    config : dict
+        Export and pipeline configuration
+    cost_config : dict
+        Salary calculation parameters
+    salary_writer : BufferedRowWriter
+        Buffer of salary table
+    share_index : Optional[ShareIndex], optional
+        Index of task directories on share, by default share is walked for every task
+
+    Returns
+    -------
+    int
+        Number of written rows
+    """
+    start_time = time.perf_counter()
+    salary_workers_count = max(1, config['salary_task_workers'])
+    salary_queue = asyncio.Queue(maxsize=config['pipeline_queue_size'])
+    row_queue = asyncio.Queue(maxsize=config['pipeline_queue_size'])
+
+    write_task = asyncio.create_task(_write_stage(row_queue, salary_writer, start_time))
+    try:
+        await asyncio.gather(
+            _export_stage(tasks_by_project, config, salary_queue, salary_workers_count),
+            *(_salary_stage(salary_queue, row_queue, cost_config, share_index) for _ in range(salary_workers_count))
+        )
+    finally:
+        await row_queue.put(None)
+        rows_count = await write_task
+
+    print(f"✅ {rows_count} salary rows in {time.perf_counter() - start_time:.1f}s")
+    return rows_count
+
+
 def main(args_path: str | Path):
     """Main function."""
     with open(args_path, "r", encoding="utf-8") as file:
@@ -355,7 +625,17 @@ def main(args_path: str | Path):
         'cvat_credentials_path': args["cvat_credentials_path"],
         'export_format': args["export_format"],
         'include_images': args["include_images"],
-        'salary_table_url': args["salary_table_url"]
+        'salary_table_url': args["salary_table_url"],
+        'export_workers': args.get("export_workers", 1),
+        'resume': args.get("resume", False),
+        'export_cache_dir': args.get("export_cache_dir"),
+        'export_cache_max_size_gb': args.get("export_cache_max_size_gb", 20.0),
+        'table_flush_size': args.get("table_flush_size", 100),
+        'table_cache_dir': args.get("table_cache_dir"),
+        'table_cache_ttl_hours': args.get("table_cache_ttl_hours", 24.0),
+        'salary_task_workers': args.get("salary_task_workers", 1),
+        'pipeline_queue_size': args.get("pipeline_queue_size", 8),
+        'share_index_path': args.get("share_index_path")
     }
     
     cost_config = {
@@ -364,14 +644,28 @@ def main(args_path: str | Path):
         'cost_new_box': args["cost_new_box"],
         'cost_new_box_increased': args["cost_new_box_increased"],
         'box_change_low_threshold': args["box_change_low_threshold"],
-        'box_change_high_threshold': args["box_change_high_threshold"]
+        'box_change_high_threshold': args["box_change_high_threshold"],
+        'matcher': args.get("matcher", "loop"),
+        'salary_workers': args.get("salary_workers", 1),
+        'optimal_min_boxes': args.get("optimal_min_boxes", 0)
     }
     
+    # Every salary task worker starts its own pool of salary_workers matching processes
+    max_salary_workers = max(1, (os.cpu_count() or 1) // max(1, config['salary_task_workers']))
+    if cost_config['salary_workers'] > max_salary_workers:
+        print(
+            f"⚠ salary_workers is reduced to {max_salary_workers}: {config['salary_task_workers']} tasks "
+            f"× {cost_config['salary_workers']} processes is more than {os.cpu_count()} CPUs"
+        )
+        cost_config['salary_workers'] = max_salary_workers
+
     # Parse tasks
     task_data_list = parse_annotations_table(
         table_url=config['table_url'],
         table_credentials_path=config['table_credentials_path'],
-        date=config['date']
+        date=config['date'],
+        cache_dir=config['table_cache_dir'],
+        cache_ttl_hours=config['table_cache_ttl_hours']
     )
     
     if not task_data_list:
@@ -380,41 +674,22 @@ def main(args_path: str | Path):
     
     print(f"✅ Found {len(task_data_list)} tasks for date {config['date']}")
     
+    # One editor for the whole run, salary rows are sent in batches
+    salary_table_editor = TableEditor(config['salary_table_url'], config['table_credentials_path'])
+    salary_writer = salary_table_editor.buffered_writer(flush_size=config['table_flush_size'])
+
     # Process by project
     tasks_by_project = _group_tasks_by_project(task_data_list)
-    
-    for project_id, project_tasks in tasks_by_project.items():
-        project_name = get_project_name(project_id)
-        print(f"\nProcessing project {project_name} with {len(project_tasks)} tasks...")
-        
-        project_output_dir = f"{config['output_dir']}/{project_id}"
-        
-        # Download tasks
-        task_mapping = process_of_download(
-            cvat_credentials_path=config['cvat_credentials_path'],
-            project_id=project_id,
-            task_data_list=project_tasks,
-            output_dir=project_output_dir,
-            export_format=config['export_format'],
-            include_images=config['include_images']
-        )
-        
-        # Update task data with download results
-        for task_data in project_tasks:
-            if task_data.task_id in task_mapping:
-                task_name, local_path = task_mapping[task_data.task_id]
-                task_data.task_name = task_name
-                task_data.local_path = local_path
-        
-        # Process each task
-        for task_data in project_tasks:
-            _process_single_task(
-                task_data=task_data,
-                project_name=project_name,
-                cost_config=cost_config,
-                salary_table_url=config['salary_table_url'],
-                table_credentials_path=config['table_credentials_path']
-            )
+
+    share_index = ShareIndex(config['share_index_path']) if config['share_index_path'] else None
+
+    try:
+        with salary_writer:
+            asyncio.run(run_salary_pipeline(tasks_by_project, config, cost_config, salary_writer, share_index))
+    finally:
+        if share_index is not None:
+            share_index.save()
+            print(f"📂 Share index: {share_index.hits} task directories from index, {share_index.misses} scanned")
 
 
 if __name__ == "__main__":
@@ -1,12 +1,24 @@
 """Count salary for annotations with increased costs."""
 
-from dataclasses import dataclass
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from itertools import repeat
 from pathlib import Path
 
 import yaml
 from jsonargparse import CLI
 from tqdm import tqdm
 
+from box_matching import (
+    FrameMatch,
+    match_boxes_grid,
+    match_boxes_optimal,
+    match_boxes_optimal_small,
+    match_boxes_vectorized,
+)
+from yolo_labels import FrameBoxes
+
 
 @dataclass
 class BoxCostsConfig:
@@ -32,6 +44,20 @@ class CostsParamsConfig:
     frames_from: int = 0
     frames_to: int = -1
     have_preannotated: bool = True
+    matcher: str = "loop"
+    num_workers: int = 1
+    optimal_min_boxes: int = 0
+    # Sorted .jpg and .txt files of initial_labels_path if they are known (e.g. from share index)
+    initial_img_files: list[Path] | None = None
+    initial_labels_files: list[Path] | None = None
+
+
+# Shards per worker, more shards give better balance for frames of different density
+SHARDS_PER_WORKER = 4
+
+# Matching pool can be started from a thread of salary_count pipeline while other threads
+# are in network calls, fork of multi-threaded process can deadlock, so workers are not forked from it
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
 
 
 @dataclass
@@ -94,10 +120,26 @@ def parse_annotations_to_boxes(
 
     """
 
-    boxes = [BBox(*[float(w) for w in annotation_line[:-2].split()]) for annotation_line in annotation_lines]
-    boxes = sorted(boxes, key=lambda bbox: (bbox.x_center, bbox.y_center))
+    return frame_boxes_to_bboxes(FrameBoxes.from_lines(annotation_lines))
+
 
-    return boxes
+def frame_boxes_to_bboxes(frame_boxes: FrameBoxes) -> list[BBox]:
+    """
+    Convert compact frame boxes to list of BBox.
+
+    Parameters
+    ----------
+    frame_boxes: FrameBoxes
+        Sorted boxes of one frame.
+
+    Returns
+    -------
+    list[BBox]
+        Boxes in the same order.
+
+    """
+
+    return [BBox(*values) for values in frame_boxes]
 
 
 def is_box_unchanged(
@@ -216,6 +258,389 @@ def is_deleted_box(
     return box_deleted
 
 
+def match_boxes(
+    initial_boxes: list[BBox],
+    final_boxes: list[BBox],
+    box_change_low_threshold: float,
+    box_change_high_threshold: float,
+) -> FrameMatch:
+    """
+    Match boxes of one frame one by one (reference matcher).
+
+    Every initial box takes the first remaining final box that is unchanged,
+    changed or deleted. If no final boxes remain, all initial boxes of the frame
+    are counted as deleted.
+
+    Parameters
+    ----------
+    initial_boxes: list[BBox]
+        Sorted boxes from initial labels.
+    final_boxes: list[BBox]
+        Sorted boxes from final labels, matched boxes are removed from the list.
+    box_change_low_threshold: float
+        If change is lower than this threshold, box counted as unchanged.
+    box_change_high_threshold: float
+        If change is higher than this threshold, box counted as deleted.
+
+    Returns
+    -------
+    FrameMatch
+        Counts of boxes of the frame.
+
+    """
+
+    frame_match = FrameMatch()
+
+    for initial_box in initial_boxes:
+        if len(final_boxes) == 0:
+            frame_match.count_all_deleted = len(initial_boxes)
+            break
+
+        for final_box in final_boxes:
+            if is_box_unchanged(
+                initial_box=initial_box,
+                final_box=final_box,
+                box_change_low_threshold=box_change_low_threshold,
+            ):
+                if initial_box.obj_class != final_box.obj_class:
+                    frame_match.count_only_class_dif += 1
+
+                final_boxes.remove(final_box)
+                break
+
+            if is_box_changed(
+                initial_box=initial_box,
+                final_box=final_box,
+                box_change_low_threshold=box_change_low_threshold,
+                box_change_high_threshold=box_change_high_threshold,
+            ):
+                frame_match.count_changed_boxes += 1
+                final_boxes.remove(final_box)
+                break
+
+            if is_deleted_box(
+                initial_box=initial_box,
+                final_box=final_box,
+                box_change_high_threshold=box_change_high_threshold,
+            ):
+                frame_match.count_deleted_box += 1
+                break
+
+    frame_match.count_new_boxes = len(final_boxes)
+
+    return frame_match
+
+
+def match_frames_loop(
+    initial_boxes: FrameBoxes,
+    final_boxes: FrameBoxes,
+    box_change_low_threshold: float,
+    box_change_high_threshold: float,
+) -> FrameMatch:
+    """Convert frame boxes to BBox lists and match them with match_boxes."""
+
+    return match_boxes(
+        frame_boxes_to_bboxes(initial_boxes),
+        frame_boxes_to_bboxes(final_boxes),
+        box_change_low_threshold,
+        box_change_high_threshold,
+    )
+
+
+def match_frames_vectorized(
+    initial_boxes: FrameBoxes,
+    final_boxes: FrameBoxes,
+    box_change_low_threshold: float,
+    box_change_high_threshold: float,
+) -> FrameMatch:
+    """Match frame boxes with match_boxes_vectorized, fall back to match_boxes if needed."""
+
+    frame_match = match_boxes_vectorized(
+        initial_boxes.boxes,
+        final_boxes.boxes,
+        box_change_low_threshold,
+        box_change_high_threshold,
+    )
+
+    if frame_match is None:
+        return match_frames_loop(initial_boxes, final_boxes, box_change_low_threshold, box_change_high_threshold)
+
+    return frame_match
+
+
+def match_frames_grid(
+    initial_boxes: FrameBoxes,
+    final_boxes: FrameBoxes,
+    box_change_low_threshold: float,
+    box_change_high_threshold: float,
+) -> FrameMatch:
+    """Match frame boxes with match_boxes_grid, fall back to match_boxes if needed."""
+
+    frame_match = match_boxes_grid(
+        initial_boxes.boxes,
+        final_boxes.boxes,
+        box_change_low_threshold,
+        box_change_high_threshold,
+    )
+
+    if frame_match is None:
+        return match_frames_loop(initial_boxes, final_boxes, box_change_low_threshold, box_change_high_threshold)
+
+    return frame_match
+
+
+def match_frames_optimal(
+    initial_boxes: FrameBoxes,
+    final_boxes: FrameBoxes,
+    box_change_low_threshold: float,
+    box_change_high_threshold: float,
+) -> FrameMatch:
+    """Match frame boxes with optimal assignment of match_boxes_optimal."""
+
+    return match_boxes_optimal(
+        initial_boxes.boxes,
+        final_boxes.boxes,
+        box_change_low_threshold,
+        box_change_high_threshold,
+    )
+
+
+def match_frames_optimal_small(
+    initial_boxes: FrameBoxes,
+    final_boxes: FrameBoxes,
+    box_change_low_threshold: float,
+    box_change_high_threshold: float,
+) -> FrameMatch:
+    """Match boxes of small frame with match_boxes_optimal_small, results are the same as of optimal matcher."""
+
+    return match_boxes_optimal_small(
+        initial_boxes.boxes,
+        final_boxes.boxes,
+        box_change_low_threshold,
+        box_change_high_threshold,
+    )
+
+
+MATCHERS = {
+    "loop": match_frames_loop,
+    "vectorized": match_frames_vectorized,
+    "grid": match_frames_grid,
+    "optimal": match_frames_optimal,
+}
+
+# Matchers that give the same results as the reference loop
+GREEDY_MATCHERS = ("loop", "vectorized", "grid")
+
+# Matcher for frames smaller than optimal_min_boxes in optimal mode, it solves the same assignment
+OPTIMAL_FAST_MATCHER = match_frames_optimal_small
+
+
+def get_frame_files(costs_params_cfg: CostsParamsConfig) -> list[tuple[int, Path | None, Path]]:
+    """
+    Get label files of frames to analyze.
+
+    Parameters
+    ----------
+    costs_params_cfg: CostsParamsConfig
+        Config with paths and frames range
+
+    Returns
+    -------
+    list[tuple[int, Path | None, Path]]
+        Frame number, initial labels file (None if there are no preannotations)
+        and final labels file
+    """
+
+    initial_img_files = costs_params_cfg.initial_img_files
+    if initial_img_files is None:
+        initial_img_files = sorted(list(costs_params_cfg.initial_labels_path.glob("*.jpg")))
+
+    if not costs_params_cfg.have_preannotated or len(initial_img_files) == 0:
+        labels_files = sorted(list(costs_params_cfg.final_labels_path.glob("*.txt")))
+    elif costs_params_cfg.initial_labels_files is not None:
+        labels_files = list(costs_params_cfg.initial_labels_files)
+    else:
+        labels_files = sorted(list(costs_params_cfg.initial_labels_path.glob("*.txt")))
+
+    if costs_params_cfg.frames_to == -1:
+        labels_files = labels_files[costs_params_cfg.frames_from:]
+    else:
+        labels_files = labels_files[costs_params_cfg.frames_from : costs_params_cfg.frames_to]
+
+    if not costs_params_cfg.have_preannotated or len(initial_img_files) == 0:
+        return [(file_num, None, final_labels_file) for file_num, final_labels_file in enumerate(labels_files)]
+
+    return [
+        (file_num, initial_labels_file, costs_params_cfg.final_labels_path / initial_labels_file.name)
+        for file_num, initial_labels_file in enumerate(labels_files)
+    ]
+
+
+def match_frame_files(
+    initial_labels_file: Path | None,
+    final_labels_file: Path,
+    costs_params_cfg: CostsParamsConfig,
+) -> FrameMatch | None:
+    """
+    Read label files of one frame and match their boxes.
+
+    Parameters
+    ----------
+    initial_labels_file: Path | None
+        File with initial labels, None if all final boxes are new
+    final_labels_file: Path
+        File with final labels
+    costs_params_cfg: CostsParamsConfig
+        Config with thresholds and matcher name
+
+    Returns
+    -------
+    FrameMatch | None
+        Counts of boxes, None if frame is skipped
+    """
+
+    if initial_labels_file is None:
+        return FrameMatch(count_new_boxes=len(FrameBoxes.read(final_labels_file)))
+
+    initial_boxes = FrameBoxes.read(initial_labels_file)
+
+    if not final_labels_file.exists():
+        return None
+    final_boxes = FrameBoxes.read(final_labels_file)
+
+    match_frames = MATCHERS[costs_params_cfg.matcher]
+    if (
+        costs_params_cfg.matcher == "optimal"
+        and max(len(initial_boxes), len(final_boxes)) < costs_params_cfg.optimal_min_boxes
+    ):
+        match_frames = OPTIMAL_FAST_MATCHER
+
+    return match_frames(
+        initial_boxes,
+        final_boxes,
+        costs_params_cfg.box_change_low_threshold,
+        costs_params_cfg.box_change_high_threshold,
+    )
+
+
+def add_frame_salary(
+    salary: float,
+    box_counts: BoxCounts,
+    frame_match: FrameMatch,
+    is_frame_increased: bool,
+    box_costs_cfg: BoxCostsConfig,
+) -> float:
+    """
+    Add frame counts to totals.
+
+    Costs are added one by one in the same order as boxes are matched,
+    so float sum does not depend on matcher.
+
+    Parameters
+    ----------
+    salary: float
+        Salary before frame
+    box_counts: BoxCounts
+        Total counts, updated in place
+    frame_match: FrameMatch
+        Counts of the frame
+    is_frame_increased: bool
+        Whether frame has increased costs
+    box_costs_cfg: BoxCostsConfig
+        Costs of boxes
+
+    Returns
+    -------
+    float
+        Salary after frame
+    """
+
+    cost_diff_box = box_costs_cfg.cost_diff_box_increased if is_frame_increased else box_costs_cfg.cost_diff_box
+    cost_new_box = box_costs_cfg.cost_new_box_increased if is_frame_increased else box_costs_cfg.cost_new_box
+
+    for _ in range(frame_match.count_only_class_dif + frame_match.count_changed_boxes + frame_match.count_deleted_box):
+        salary += cost_diff_box
+
+    if frame_match.count_all_deleted:
+        salary += cost_diff_box * frame_match.count_all_deleted
+
+    salary += frame_match.count_new_boxes * cost_new_box
+
+    box_counts.count_only_class_dif += frame_match.count_only_class_dif
+    box_counts.count_diff_boxes += frame_match.count_changed_boxes
+    box_counts.count_deleted_box += frame_match.count_deleted_box + frame_match.count_all_deleted
+    box_counts.count_new_boxes += frame_match.count_new_boxes
+
+    return salary
+
+
+def match_frames_shard(
+    frame_files: list[tuple[int, Path | None, Path]],
+    costs_params_cfg: CostsParamsConfig,
+) -> list[FrameMatch | None]:
+    """
+    Match boxes of consecutive frames, runs in worker process.
+
+    Parameters
+    ----------
+    frame_files: list[tuple[int, Path | None, Path]]
+        Frames from get_frame_files
+    costs_params_cfg: CostsParamsConfig
+        Config with thresholds and matcher name
+
+    Returns
+    -------
+    list[FrameMatch | None]
+        Counts of every frame in the same order, None for skipped frames
+    """
+
+    return [
+        match_frame_files(initial_labels_file, final_labels_file, costs_params_cfg)
+        for _, initial_labels_file, final_labels_file in frame_files
+    ]
+
+
+def iter_frame_matches(frame_files: list[tuple[int, Path | None, Path]], costs_params_cfg: CostsParamsConfig):
+    """
+    Match boxes of all frames and yield results in file order.
+
+    With num_workers > 1 sorted frames are split into contiguous shards that are
+    matched by process pool, results are still yielded in file order.
+
+    Parameters
+    ----------
+    frame_files: list[tuple[int, Path | None, Path]]
+        Frames from get_frame_files
+    costs_params_cfg: CostsParamsConfig
+        Config with thresholds, matcher name and number of workers
+
+    Yields
+    ------
+    tuple[int, FrameMatch | None]
+        Frame number and its counts, None for skipped frames
+    """
+
+    if costs_params_cfg.num_workers <= 1 or len(frame_files) < 2:
+        for file_num, initial_labels_file, final_labels_file in tqdm(frame_files, desc="Analyze files..."):
+            yield file_num, match_frame_files(initial_labels_file, final_labels_file, costs_params_cfg)
+        return
+
+    shards_count = min(len(frame_files), costs_params_cfg.num_workers * SHARDS_PER_WORKER)
+    shard_size = -(-len(frame_files) // shards_count)
+    shards = [frame_files[start : start + shard_size] for start in range(0, len(frame_files), shard_size)]
+
+    with ProcessPoolExecutor(
+        max_workers=costs_params_cfg.num_workers, mp_context=multiprocessing.get_context(POOL_START_METHOD)
+    ) as executor, tqdm(
+        total=len(frame_files), desc=f"Analyze files ({costs_params_cfg.num_workers} workers)..."
+    ) as progress_bar:
+        # map returns shards in submission order, so reduction does not depend on workers timing
+        for shard, shard_matches in zip(shards, executor.map(match_frames_shard, shards, repeat(costs_params_cfg))):
+            for (file_num, _, _), frame_match in zip(shard, shard_matches):
+                yield file_num, frame_match
+            progress_bar.update(len(shard))
+
+
 def count_salary(costs_params_cfg: CostsParamsConfig) -> tuple:
     """
     Calculates the amount earned for the changed/added boxes.
@@ -231,122 +656,27 @@ def count_salary(costs_params_cfg: CostsParamsConfig) -> tuple:
         Tuple with data for salary table
     """
 
+    if costs_params_cfg.matcher not in MATCHERS:
+        raise ValueError(f"Unknown matcher '{costs_params_cfg.matcher}', expected one of {list(MATCHERS)}")
+
     salary = 0
     box_counts = BoxCounts()
-    initial_img_files = sorted(list(costs_params_cfg.initial_labels_path.glob("*.jpg")))
 
-    if not costs_params_cfg.have_preannotated or len(initial_img_files) == 0:
-        final_labels_files = sorted(list(costs_params_cfg.final_labels_path.glob("*.txt")))
-        
-        if costs_params_cfg.frames_to == -1:
-            final_labels_files = final_labels_files[costs_params_cfg.frames_from:]
-        else:
-            final_labels_files = final_labels_files[costs_params_cfg.frames_from : costs_params_cfg.frames_to]
-        
-        for file_num, final_labels_file in tqdm(enumerate(final_labels_files), desc="Analyze files..."):
-            is_frame_increased = (
-                costs_params_cfg.increased_cost_frame_from <= file_num <= costs_params_cfg.increased_cost_frame_to
-            )
-
-            with open(final_labels_file, "r", encoding="utf-8") as file:
-                final_boxes_str = file.readlines()
-
-            final_boxes = parse_annotations_to_boxes(final_boxes_str)
-            
-            salary += (
-                len(final_boxes) * costs_params_cfg.box_costs_cfg.cost_new_box_increased
-                if is_frame_increased
-                else len(final_boxes) * costs_params_cfg.box_costs_cfg.cost_new_box
-            )
-            box_counts.count_new_boxes += len(final_boxes)
-    else:
-        initial_labels_files = sorted(list(costs_params_cfg.initial_labels_path.glob("*.txt")))
-
-        if costs_params_cfg.frames_to == -1:
-            initial_labels_files = initial_labels_files[costs_params_cfg.frames_from:]
-        else:
-            initial_labels_files = initial_labels_files[costs_params_cfg.frames_from : costs_params_cfg.frames_to]
-        
-        for file_num, initial_labels_file in tqdm(enumerate(initial_labels_files), desc="Analyze files..."):
-            is_frame_increased = (
-                costs_params_cfg.increased_cost_frame_from <= file_num <= costs_params_cfg.increased_cost_frame_to
-            )
-
-            with open(initial_labels_file, "r", encoding="utf-8") as file:
-                initial_boxes_str = file.readlines()
-
-            final_labels_file = costs_params_cfg.final_labels_path / str(initial_labels_file).rsplit("/", maxsplit=1)[-1]
-            if not final_labels_file.exists():
-                continue
-            with open(final_labels_file, "r", encoding="utf-8") as file:
-                final_boxes_str = file.readlines()
-
-            initial_boxes = parse_annotations_to_boxes(initial_boxes_str)
-            final_boxes = parse_annotations_to_boxes(final_boxes_str)
-
-            for initial_box in initial_boxes:
-                if len(final_boxes) == 0:
-                    salary += (
-                        costs_params_cfg.box_costs_cfg.cost_diff_box_increased * len(initial_boxes)
-                        if is_frame_increased
-                        else costs_params_cfg.box_costs_cfg.cost_diff_box * len(initial_boxes)
-                    )
-
-                    box_counts.count_deleted_box += len(initial_boxes)
-                    break
-
-                for final_box in final_boxes:
-                    if is_box_unchanged(
-                        initial_box=initial_box,
-                        final_box=final_box,
-                        box_change_low_threshold=costs_params_cfg.box_change_low_threshold,
-                    ):
-                        if initial_box.obj_class != final_box.obj_class:
-
-                            salary += (
-                                costs_params_cfg.box_costs_cfg.cost_diff_box_increased
-                                if is_frame_increased
-                                else costs_params_cfg.box_costs_cfg.cost_diff_box
-                            )
-                            box_counts.count_only_class_dif += 1
-
-                        final_boxes.remove(final_box)
-                        break
-
-                    if is_box_changed(
-                        initial_box=initial_box,
-                        final_box=final_box,
-                        box_change_low_threshold=costs_params_cfg.box_change_low_threshold,
-                        box_change_high_threshold=costs_params_cfg.box_change_high_threshold,
-                    ):
-                        salary += (
-                            costs_params_cfg.box_costs_cfg.cost_diff_box_increased
-                            if is_frame_increased
-                            else costs_params_cfg.box_costs_cfg.cost_diff_box
-                        )
-                        box_counts.count_diff_boxes += 1
-                        final_boxes.remove(final_box)
-                        break
-
-                    if is_deleted_box(
-                        initial_box=initial_box,
-                        final_box=final_box,
-                        box_change_high_threshold=costs_params_cfg.box_change_high_threshold,
-                    ):
-                        salary += (
-                            costs_params_cfg.box_costs_cfg.cost_diff_box_increased
-                            if is_frame_increased
-                            else costs_params_cfg.box_costs_cfg.cost_diff_box
-                        )
-                        box_counts.count_deleted_box += 1
-                        break
-
-            salary += (
-                len(final_boxes) * costs_params_cfg.box_costs_cfg.cost_new_box_increased
-                if is_frame_increased
-                else len(final_boxes) * costs_params_cfg.box_costs_cfg.cost_new_box
-            )
-            box_counts.count_new_boxes += len(final_boxes)
+    frame_files = get_frame_files(costs_params_cfg)
+    # File lists are not needed by matching workers, so they are not sent with every shard
+    costs_params_cfg = replace(costs_params_cfg, initial_img_files=None, initial_labels_files=None)
+
+    for file_num, frame_match in iter_frame_matches(frame_files, costs_params_cfg):
+        if frame_match is None:
+            continue
+
+        is_frame_increased = (
+            costs_params_cfg.increased_cost_frame_from <= file_num <= costs_params_cfg.increased_cost_frame_to
+        )
+
+        salary = add_frame_salary(
+            salary, box_counts, frame_match, is_frame_increased, costs_params_cfg.box_costs_cfg
+        )
 
     print("salary: ", salary)
     print("count new boxes: ", box_counts.count_new_boxes)
@@ -393,6 +723,9 @@ def main(args_path: Path | str):
         box_change_high_threshold=args["box_change_high_threshold"],
         increased_cost_frame_from=increased_cost_frame_from,
         increased_cost_frame_to=increased_cost_frame_to,
+        matcher=args.get("matcher", "loop"),
+        num_workers=args.get("num_workers", 1),
+        optimal_min_boxes=args.get("optimal_min_boxes", 0),
     )
 
     count_salary(costs_params_cfg=costs_params_cfg)
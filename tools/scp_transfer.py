@@ -4,12 +4,26 @@ from omegaconf import DictConfig
 
 from src.cascade.config.parser import get_parser
 from src.cascade.config.config_loader import load_config
-from src.cascade.tools.data_transfer import DataTransfer
+from src.cascade.tools.data_transfer import DEFAULT_MANIFEST_DIR, DataTransfer
 
 
 def transfer(opts: DictConfig):
-    transfer = DataTransfer(opts.server_conf)
-    transfer.transfer_data(opts.local_path, opts.remote_path, opts.server_name, opts.mode, opts.username)
+    with DataTransfer(
+        opts.server_conf,
+        control_persist=opts.get("control_persist", 600),
+        manifest_dir=opts.get("manifest_dir", DEFAULT_MANIFEST_DIR)
+    ) as transfer:
+        transfer.transfer_data(
+            opts.local_path,
+            opts.remote_path,
+            opts.server_name,
+            username=opts.username,
+            mode=opts.mode,
+            workers=opts.get("workers", 1),
+            checksum=opts.get("checksum", False),
+            method=opts.get("method", "scp"),
+            compression=opts.get("compression")
+        )
 
 if __name__ == "__main__":
     parser = get_parser()
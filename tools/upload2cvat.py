@@ -37,7 +37,10 @@ def process_of_upload(
         table_url: str | None = None,
         sheet_id: int | None = None,
         table_credentials_path: str | None = None,
-        column_names: list[str] | None = None        
+        column_names: list[str] | None = None,
+        max_in_flight: int = 4,
+        journal_path: str | None = None,
+        table_flush_size: int = 100
     ):
     """Upload data to CVAT.
 
@@ -59,6 +62,12 @@ def process_of_upload(
         Path to privat data for table
     column_names: list[str] | None
         Target columns names
+    max_in_flight: int
+        Max number of tasks loading data at the same time
+    journal_path: str | None
+        Path to SQLite journal for resuming interrupted uploads
+    table_flush_size: int
+        Number of table rows sent by one request
     """
     
     cvat_uploader = CvatUploader(
@@ -72,8 +81,12 @@ def process_of_upload(
         project_id=project_id, 
         share_path=share_path,
         column_names=column_names,
-        sheet_id=sheet_id
+        sheet_id=sheet_id,
+        max_in_flight=max_in_flight,
+        journal_path=journal_path,
+        table_flush_size=table_flush_size
     )
+    cvat_uploader.close()
 
 
 def main(args_path: str | Path):
@@ -92,6 +105,9 @@ def main(args_path: str | Path):
     sheet_id = args["sheet_id"]
     table_credentials_path = args["table_credentials_path"]
     column_names = args["column_names"]
+    max_in_flight = args.get("max_in_flight", 4)
+    journal_path = args.get("journal_path")
+    table_flush_size = args.get("table_flush_size", 100)
 
     process_of_upload(
         cvat_credentials_path=cvat_credentials_path,
@@ -101,7 +117,10 @@ def main(args_path: str | Path):
         table_url=table_url,
         sheet_id=sheet_id,
         table_credentials_path=table_credentials_path,
-        column_names=column_names
+        column_names=column_names,
+        max_in_flight=max_in_flight,
+        journal_path=journal_path,
+        table_flush_size=table_flush_size
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,97 @@
+"""Compact array-backed boxes of YOLO label files."""
+
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+# Columns of box array, same order as in YOLO label line
+CLASS, X_CENTER, Y_CENTER, WIDTH, HEIGHT = range(5)
+
+
+def parse_annotations_to_array(annotation_lines: list[str]) -> np.ndarray:
+    """
+    Parse annotation strings to (N, 5) array sorted by coordinates of centers.
+
+    All lines are converted by one numpy call. The last two characters of every
+    line are dropped as in the original BBox parser, ties are kept in file order.
+
+    Parameters
+    ----------
+    annotation_lines: list[str]
+        Lines from annotation file.
+
+    Returns
+    -------
+    np.ndarray
+        Float array with columns class, x_center, y_center, width, height.
+
+    """
+
+    if not annotation_lines:
+        return np.empty((0, 5), dtype=np.float64)
+
+    boxes = np.loadtxt(
+        [annotation_line[:-2] for annotation_line in annotation_lines], dtype=np.float64, comments=None, ndmin=2
+    )
+    if boxes.shape != (len(annotation_lines), 5):
+        raise ValueError(f"Expected 5 values in every annotation line, got shape {boxes.shape}")
+
+    order = np.lexsort((boxes[:, Y_CENTER], boxes[:, X_CENTER]))
+
+    return boxes[order]
+
+
+class FrameBoxes:
+    """Boxes of one frame in one contiguous (N, 5) float array sorted by centers."""
+
+    __slots__ = ("boxes",)
+
+    def __init__(self, boxes: np.ndarray):
+        """
+        Parameters
+        ----------
+        boxes: np.ndarray
+            (N, 5) array with columns class, x_center, y_center, width, height.
+        """
+
+        self.boxes = np.ascontiguousarray(boxes, dtype=np.float64).reshape(-1, 5)
+
+    @classmethod
+    def from_lines(cls, annotation_lines: list[str]) -> "FrameBoxes":
+        """Parse lines of YOLO label file."""
+
+        return cls(parse_annotations_to_array(annotation_lines))
+
+    @classmethod
+    def read(cls, labels_file: Path | str) -> "FrameBoxes":
+        """Read and parse whole YOLO label file."""
+
+        with open(labels_file, "r", encoding="utf-8") as file:
+            return cls.from_lines(file.readlines())
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def __iter__(self) -> Iterator[tuple[float, float, float, float, float]]:
+        return map(tuple, self.boxes.tolist())
+
+    @property
+    def obj_class(self) -> np.ndarray:
+        return self.boxes[:, CLASS]
+
+    @property
+    def x_center(self) -> np.ndarray:
+        return self.boxes[:, X_CENTER]
+
+    @property
+    def y_center(self) -> np.ndarray:
+        return self.boxes[:, Y_CENTER]
+
+    @property
+    def width(self) -> np.ndarray:
+        return self.boxes[:, WIDTH]
+
+    @property
+    def height(self) -> np.ndarray:
+        return self.boxes[:, HEIGHT]